@@ -0,0 +1,146 @@
+"""
+识别器池与有序任务队列
+多个识别器并发解码，结果按提交顺序交付；不依赖 Qt 与模型，可单独测试
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class RecognizerPool:
+    """
+    多个 OfflineRecognizer 实例组成的池，取代全局单锁串行解码
+    lease() 借出一个空闲识别器，可指定优先实例；全部繁忙时阻塞等待
+    """
+    def __init__(self, recognizers: list):
+        self.recognizers = list(recognizers)
+        self._free = list(range(len(self.recognizers)))
+        self._cond = threading.Condition()
+
+    def __len__(self):
+        return len(self.recognizers)
+
+    def _acquire(self) -> int:
+        with self._cond:
+            while not self._free:
+                self._cond.wait()
+            return self._free.pop()
+
+    def _release(self, idx: int):
+        with self._cond:
+            self._free.append(idx)
+            self._cond.notify()
+
+    def lease(self):
+        pool = self
+
+        class _Lease:
+            def __enter__(self):
+                self.idx = pool._acquire()
+                return pool.recognizers[self.idx]
+
+            def __exit__(self, *exc):
+                pool._release(self.idx)
+                return False
+
+        return _Lease()
+
+
+class ASRJob:
+    """解码任务：seq 为提交序号，kind 为 final/segment/partial，utterance 为所属语句编号"""
+    __slots__ = ("seq", "kind", "utterance", "fn", "on_result", "started", "cancelled", "done", "result")
+
+    def __init__(self, seq, kind, utterance, fn, on_result):
+        self.seq = seq
+        self.kind = kind
+        self.utterance = utterance
+        self.fn = fn
+        self.on_result = on_result
+        self.started = False
+        self.cancelled = False
+        self.done = False
+        self.result = None
+
+
+class OrderedJobQueue:
+    """
+    有序、可取消的解码任务队列
+    - 任务由线程池并发执行 (并发数 = 识别器数量)
+    - 结果按提交顺序交付 (重排缓冲)，先说的话一定先上屏
+    - 尚未开始的任务可以取消，取消的任务在交付时按序跳过
+    """
+    def __init__(self, max_workers: int):
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="asr-decode")
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._next_deliver = 1
+        self._jobs = {} # seq -> ASRJob，交付后移除
+        self._delivering = False
+
+    def submit(self, fn, on_result, kind="final", utterance=0) -> int:
+        with self._lock:
+            self._seq += 1
+            job = ASRJob(self._seq, kind, utterance, fn, on_result)
+            self._jobs[job.seq] = job
+        self._executor.submit(self._run, job)
+        return job.seq
+
+    def is_pending(self, seq: int) -> bool:
+        """任务已提交、未取消且尚未执行完"""
+        with self._lock:
+            job = self._jobs.get(seq)
+            return job is not None and not job.cancelled and not job.done
+
+    def cancel(self, seq: int) -> bool:
+        return self.cancel_where(lambda job: job.seq == seq) > 0
+
+    def cancel_where(self, predicate) -> int:
+        """取消所有满足条件且尚未开始的任务，返回取消数量"""
+        count = 0
+        with self._lock:
+            for job in self._jobs.values():
+                if not job.started and not job.cancelled and predicate(job):
+                    job.cancelled = True
+                    count += 1
+        return count
+
+    def _run(self, job: ASRJob):
+        with self._lock:
+            run = not job.cancelled
+            job.started = run
+        if run:
+            try:
+                job.result = job.fn()
+            except Exception as e:
+                print(f"[ASR-Queue] 任务 {job.seq} 失败: {e}")
+        with self._lock:
+            job.done = True
+        self._drain()
+
+    def _drain(self):
+        """按序交付已完成的任务；同一时刻只有一个线程负责交付，保证回调顺序"""
+        with self._lock:
+            if self._delivering: return
+            self._delivering = True
+        try:
+            while True:
+                with self._lock:
+                    job = self._jobs.get(self._next_deliver)
+                    if job is None or not job.done:
+                        self._delivering = False
+                        return
+                    del self._jobs[self._next_deliver]
+                    self._next_deliver += 1
+                if not job.cancelled and job.on_result:
+                    try:
+                        job.on_result(job.result)
+                    except Exception as e:
+                        print(f"[ASR-Queue] 结果回调失败: {e}")
+        except BaseException:
+            with self._lock:
+                self._delivering = False
+            raise
+
+    def shutdown(self):
+        self.cancel_where(lambda job: True)
+        self._executor.shutdown(wait=False)
@@ -6,22 +6,25 @@ ASR管理模块 - 专注于 Sherpa-ONNX 引擎的极简驱动
 """
 
 import os
-import re
 import gc
 import sys
 import numpy as np
 import multiprocessing
 import traceback
 import threading
+import time
 from abc import ABC, abstractmethod
 from typing import Optional, List
 from PyQt6.QtCore import QObject, pyqtSignal, QThread, pyqtSlot
 
 from model_config import (
     get_model_config, 
-    ASREngineType, 
-    ASROutputMode
+    ASREngineType
 )
+from audio_vad import find_split_points
+from asr_jobs import RecognizerPool, OrderedJobQueue
+from text_postprocess import get_post_processor, merge_overlap_text
+from vocab_corrector import get_vocab_corrector
 
 # 设置环境变量，解决可能的OpenMP库冲突
 os.environ["KMP_DUPLICATE_LIB_OK"] = "TRUE"
@@ -31,162 +34,41 @@ def clean_asr_output(text: str, mode: str = "raw", is_insertion: bool = False) -
     清理ASR输出文本
     mode: "raw" 仅基础清理标签; "cleaned" 额外执行正则净化
     is_insertion: 如果为 True，则剥离末尾句号；如果为 False，则保留。
+    具体规则见 text_postprocess.ASRPostProcessor (预编译，配置快照)
     """
-    if not text:
-        return ""
-        
-    # [Fix] 1. 预处理：去除首尾空白
-    text = text.strip()
-    if not text:
-        return ""
-        
-    # [Fix] 2. 内容效验：必须包含至少一个有效字符 (中文、日文、韩文、字母、数字)
-    # 防止 Sherpa-ONNX 幻觉输出纯标点 (如 "。" 或 "..." 或 "?")
-    has_content = re.search(r'[\u4e00-\u9fa5\u3040-\u30ff\u31f0-\u31ff\uac00-\ud7af\w]', text)
-    if not has_content:
-        return ""
-        
-    # 3. 基础清理：移除所有模型内置标签 <|xxx|> 和 [xxx]
-    text = re.sub(r'<\|.*?\|>', '', text)
-    text = re.sub(r'\[.*?\]', '', text)
-    
-    # 2. 基础标点优化 (无论什么模式都执行)
-    # A. 智能标点处理 (Smart Punctuation)
-    # [Removed] 废弃“所以/但是”等后缀不加句号的逻辑
-    incomplete_markers = r'$^' # 永远不匹配
-
-    # 逻辑 1: 处理多句逻辑 - “留逗去句”
-    # 如果检测到内部句号，将其替换为逗号 (用户反馈：两句话之间的逗号还是需要)
-    if text:
-        # A. 查找所有句号，如果后面还有文字，则将其替换为逗号
-        text = re.sub(r'。(?!$)', '，', text)
-        
-        # B. 处理末尾句号
-        # B. 处理末尾句号
-        if is_insertion:
-            # 插入模式：彻底剥离末尾句号 (包括全角和半角)
-            text = text.rstrip('。！？.?!')
-        else:
-            # 非插入模式 (新起一段 或 追加)：
-            # 如果识别结果本来没有句号，强制补全
-            # 必须检查全角和半角标点，防止 "test." 变成 "test.。"
-            if text and not (text.endswith(('。', '！', '？', '.', '!', '?'))):
-                # 只有当它不像是一个未完成的句子时才加
-                if not re.search(incomplete_markers, text):
-                    text += "。"
-
-    # 逻辑 2: 处理显式的“未完成”标识词 (无论是否插入都去掉标点)
-    if re.search(incomplete_markers, text):
-        text = text.rstrip('。！？')
-        
-    # 逻辑 3: 短文本片段深度保护 (如果是插入模式且短语，更倾向于去掉所有结尾标点)
-    if is_insertion:
-        core_text = text.rstrip('。！？')
-        if core_text and len(core_text) <= 5:
-            sentence_particles = r'.*[了吗吧呢啊呀哇嘛哒喔喽哩]$|.*[。，！？]$|.*[0-9a-zA-Z]$'
-            if not re.match(sentence_particles, core_text):
-                text = core_text
-
-    # 强制移除连续重复标点 (例如 "。。" -> "。" 或 ".。" -> "。")
-    text = re.sub(r'([。，！？.?!])\1+', r'\1', text)
-
-    # 2. 如果是"正则表达 (Cleaned)"模式，执行更激进的净化
-    if mode == ASROutputMode.CLEANED.value:
-        # C. (已移除) 强制中日英文混排空格优化 - 响应用户反馈移除
-        # text = re.sub(r'([\u4e00-\u9fa5])([a-zA-Z0-9])', r'\1 \2', text)
-        # text = re.sub(r'([a-zA-Z0-9])([\u4e00-\u9fa5])', r'\1 \2', text)
-        
-        # D. 移除句首句尾的空白字符
-        text = text.strip()
-    
-    # E. Emoji 模式
-    try:
-        from model_config import EmojiMode, get_model_config
-        # 重新获取配置以确保最新
-        cfg = get_model_config()
-        mode = cfg.emoji_mode
-        
-        if mode == EmojiMode.TRIGGER.value:
-            # 语音触发模式：检测句末关键词并替换
-            triggers = {
-                "笑哭": "😂", "哈哈": "😄", "开心": "😊", 
-                "点赞": "👍", "星星": "🌟", "爱心": "❤️", 
-                "疑问": "❓", "生气": "😠", "流泪": "😭",
-                "鼓掌": "👏", "庆祝": "🎉", "合十": "🙏",
-                "加油": "💪", "滑稽": "🤪", "思考": "🤔"
-            }
-            # 检查句末 (忽略最后的标点)
-            # 先剥离标点
-            content = text
-            suffix = ""
-            if content and content[-1] in "。，！？":
-                suffix = content[-1]
-                content = content[:-1]
-                
-            for k, v in triggers.items():
-                if content.endswith(k):
-                    # 移除关键词
-                    prefix = content[:-len(k)]
-                    # 移除关键词前面的标点 (如 "有道理，" -> "有道理")
-                    if prefix.endswith(("，", "。")):
-                        prefix = prefix[:-1]
-                    
-                    content = prefix + v
-                    # 触发模式下，Emoji 视作句末，不再追加原有的句尾标点
-                    text = content 
-                    break
+    return get_post_processor().process(text, mode, is_insertion)
 
-        elif mode == EmojiMode.AUTO.value:
-            # 自动模式：根据语气词添加，默认笑哭
-            # 情感关键词映射（简化的关键词列表）
-            sentiment_map = {
-                "😄": ["哈哈", "嘿嘿", "开心", "高兴", "快乐", "好笑"],
-                "😊": ["你好", "谢谢", "收到", "好的", "没问题", "喜欢"],
-                "👍": ["不错", "厉害", "牛", "赞", "支持", "顺利"],
-                "😭": ["难过", "伤心", "呜呜", "惨", "痛苦"],
-                "😠": ["讨厌", "烦", "滚", "气死"],
-                "🙏": ["拜托", "麻烦", "感谢", "辛苦"],
-                "🤔": ["觉得", "想", "可能", "是否", "为什么"],
-                "😂": [] # Default fallback
-            }
-            
-            found_emoji = None
-            for emoji, keywords in sentiment_map.items():
-                for kw in keywords:
-                    if kw in text:
-                        found_emoji = emoji
-                        break
-                if found_emoji: break
-            
-            if not found_emoji:
-                found_emoji = "😂"
-            
-            # 如果原文以句号或逗号结尾，先移除，再加 Emoji
-            if text.endswith(("。", "，")):
-                text = text[:-1]
-            text += found_emoji
-            
-    except Exception as e:
-        print(f"[ASRManager] Emoji error: {e}")
-
-    # [Task] 语言敏感型空格处理
-    # 如果包含中文或日文字符，则强制移除所有内部空格（中日文分词残留）
-    # 如果是纯英文/西文，则保留单空格（保护英文单词间距）
-    has_cjk = re.search(r'[\u4e00-\u9fa5\u3040-\u30ff\u31f0-\u31ff]', text)
-    if has_cjk:
-        text = re.sub(r'\s+', '', text)
-    else:
-        # 纯英文模式：仅将多重空格压缩为单空格
-        text = re.sub(r'\s+', ' ', text)
-        
-    return text.strip()
+def as_float32_audio(audio_data) -> np.ndarray:
+    """
+    统一音频数据为连续 float32 一维数组
+    录音器交出的已是 float32 视图，此时不产生任何拷贝；仅在类型或内存布局不符时才转换
+    """
+    return np.ascontiguousarray(audio_data, dtype=np.float32).reshape(-1)
 
 # ===== 核心引擎代理 (重构为进程内线程安全模式) =====
 class OnnxASREngine:
     def __init__(self):
         self.is_loaded = False
         self.recognizer = None
+        self.pool = None
         self._lock = threading.Lock()
+        
+        # [Perf] 长录音分块并行解码参数
+        cfg = get_model_config()
+        self.chunk_threshold_sec = cfg.asr_chunk_threshold_sec
+        self.chunk_sec = cfg.asr_chunk_sec
+        self.chunk_overlap_sec = cfg.asr_chunk_overlap_sec
+        self.pool_size = cfg.asr_pool_size
+        self.warmup_seconds = cfg.asr_warmup_seconds
+        self.load_ms = 0.0   # 模型构建耗时
+        self.warmup_ms = 0.0 # 预热耗时
+    
+    @staticmethod
+    def resolve_pool_size(configured: int):
+        """返回 (识别器数量, 每个识别器的线程数)；configured <= 0 时按 CPU 核数自动决定"""
+        cores = os.cpu_count() or 4
+        size = configured if configured > 0 else max(1, min(2, cores // 4))
+        return size, max(1, min(4, cores // size))
     
     def load(self, model_path: str) -> bool:
         """
@@ -214,17 +96,34 @@ class OnnxASREngine:
                 print(f"[ASR-Engine] 核心文件缺失: {model_file} 或 {tokens_file}")
                 return False
 
-            # 初始化识别器
-            self.recognizer = sherpa_onnx.OfflineRecognizer.from_sense_voice(
-                model=model_file,
-                tokens=tokens_file,
-                use_itn=True,
-                language="auto",
-                num_threads=4
-            )
+            # 初始化识别器池
+            t0 = time.perf_counter()
+            size, threads = self.resolve_pool_size(self.pool_size)
+            recognizers = [
+                sherpa_onnx.OfflineRecognizer.from_sense_voice(
+                    model=model_file,
+                    tokens=tokens_file,
+                    use_itn=True,
+                    language="auto",
+                    num_threads=threads
+                )
+                for _ in range(size)
+            ]
+            
+            self.load_ms = (time.perf_counter() - t0) * 1000
             
-            self.is_loaded = True
-            print(f"[ASR-Engine] 模型加载成功")
+            # 预热：在就绪前跑完 ONNX Runtime 的算子选择与内存池增长，首句延迟与稳态一致
+            t1 = time.perf_counter()
+            for recognizer in recognizers:
+                self._warm_up(recognizer)
+            self.warmup_ms = (time.perf_counter() - t1) * 1000
+            
+            with self._lock:
+                self.pool = RecognizerPool(recognizers)
+                self.recognizer = recognizers[0]
+                self.is_loaded = True
+            print(f"[ASR-Engine] 模型加载成功 (识别器 x{size}, 每个 {threads} 线程) "
+                  f"加载 {self.load_ms:.0f}ms, 预热 {self.warmup_ms:.0f}ms")
             return True
                 
         except Exception as e:
@@ -233,33 +132,78 @@ class OnnxASREngine:
             traceback.print_exc()
             return False
     
+    def _warm_up(self, recognizer):
+        """用不同长度的合成音频 (低幅噪声) 各解码一次"""
+        rng = np.random.default_rng(0)
+        for seconds in self.warmup_seconds:
+            audio = (rng.standard_normal(int(16000 * seconds)) * 0.01).astype(np.float32)
+            try:
+                stream = recognizer.create_stream()
+                stream.accept_waveform(16000, audio)
+                recognizer.decode_stream(stream)
+            except Exception as e:
+                print(f"[ASR-Engine] 预热失败 ({seconds}s): {e}")
+                return
+    
     def transcribe(self, audio_data) -> str:
-        if not self.is_loaded or not self.recognizer:
+        pool = self.pool
+        if not self.is_loaded or not pool:
             return ""
         try:
-            # 转换数据为数组
-            import numpy as np
-            audio_array = np.array(audio_data, dtype=np.float32)
+            # 零拷贝：已是连续 float32 数组时直接使用，不再复制
+            audio_array = as_float32_audio(audio_data)
+            if len(audio_array) > self.chunk_threshold_sec * 16000:
+                return self._transcribe_chunked(pool, audio_array)
             
-            with self._lock:
-                stream = self.recognizer.create_stream()
+            with pool.lease() as recognizer:
+                stream = recognizer.create_stream()
                 stream.accept_waveform(16000, audio_array)
-                self.recognizer.decode_stream(stream)
+                recognizer.decode_stream(stream)
                 text = stream.result.text
             return text
         except Exception as e:
             print(f"[ASR-Engine] 转写失败: {e}")
             return ""
 
+    def _transcribe_chunked(self, pool, audio_array) -> str:
+        """
+        长录音：在低能量处切成带重叠的分块，一次 decode_streams 批量并行解码，
+        再按顺序拼接并去除重叠部分的重复文字
+        """
+        rate = 16000
+        overlap = int(self.chunk_overlap_sec * rate)
+        cuts = [0] + find_split_points(audio_array, rate, self.chunk_sec) + [len(audio_array)]
+        
+        with pool.lease() as recognizer:
+            streams = []
+            for start, end in zip(cuts[:-1], cuts[1:]):
+                stream = recognizer.create_stream()
+                stream.accept_waveform(rate, audio_array[max(0, start - overlap):end])
+                streams.append(stream)
+            recognizer.decode_streams(streams)
+            texts = [st.result.text for st in streams]
+        
+        print(f"[ASR-Engine] 长录音分块解码: {len(audio_array) / rate:.1f}s -> {len(streams)} 块")
+        text = ""
+        for part in texts:
+            text = merge_overlap_text(text, part)
+        return text
+
     def unload(self):
         with self._lock:
+            self.pool = None
             self.recognizer = None
             self.is_loaded = False
 
 # ===== ASR Worker & Manager =====
 class ASRWorker(QObject):
+    """
+    控制线程：接收录音事件并向有序任务队列提交解码任务
+    解码在队列的线程池中并发进行，结果按提交顺序回调
+    """
     model_ready = pyqtSignal()
     result_ready = pyqtSignal(str)
+    partial_result = pyqtSignal(str)
     error_occurred = pyqtSignal(str)
     status_changed = pyqtSignal(str)
     
@@ -267,6 +211,13 @@ class ASRWorker(QObject):
         super().__init__()
         self.config = get_model_config()
         self.engine = OnnxASREngine()
+        self.jobs = OrderedJobQueue(self.engine.resolve_pool_size(self.engine.pool_size)[0])
+        self._utterance = 0 # 当前语句编号
+        self._utterances = {} # 语句编号 -> 已识别分段文本 (增量模式)
+        self._state_lock = threading.Lock()
+        self._latest_partial = None # 最新的预览音频 (主线程经 set_latest_partial 写入，只保留最新一份)
+        self._partial_seq = None # 最近一次提交的预览任务
+        self._partial_due = (0, 0.0) # (语句编号, 该语句下一次允许预览的时间)
     
     @pyqtSlot()
     def load_model(self):
@@ -285,6 +236,7 @@ class ASRWorker(QObject):
         print(f"[ASRWorker] 解析的模型路径: {model_path}")
         
         if self.engine.load(model_path):
+            print(f"[ASRWorker] 加载耗时 {self.engine.load_ms:.0f}ms, 预热耗时 {self.engine.warmup_ms:.0f}ms")
             self.status_changed.emit("语音引擎已就绪")
             self.model_ready.emit()
         else:
@@ -293,14 +245,118 @@ class ASRWorker(QObject):
     @pyqtSlot(object, bool)
     def transcribe(self, audio_data, is_insertion=False):
         if not self.engine.is_loaded: return
-        try:
-            raw_text = self.engine.transcribe(audio_data)
-            if raw_text:
-                mode = self.config.asr_output_mode
-                cleaned_text = clean_asr_output(raw_text, mode=mode, is_insertion=is_insertion)
-                self.result_ready.emit(cleaned_text)
-        except:
-            pass
+        self._utterance += 1
+        self._drop_stale()
+        self.jobs.submit(
+            lambda: self.engine.transcribe(audio_data),
+            lambda raw_text: self._emit_result(raw_text, is_insertion),
+            kind="final", utterance=self._utterance
+        )
+
+    def _emit_result(self, raw_text, is_insertion):
+        if raw_text:
+            # 自定义词表纠错 (在标点清理之前，拼接后整体替换，跨段的词也能命中)
+            raw_text = get_vocab_corrector().correct(raw_text)
+            mode = self.config.asr_output_mode
+            cleaned_text = clean_asr_output(raw_text, mode=mode, is_insertion=is_insertion)
+            self.result_ready.emit(cleaned_text)
+
+    def _drop_stale(self):
+        """新语句开始时，预览任务一律作废；latest_only 策略下旧语句尚未开始的任务也一并取消"""
+        current = self._utterance
+        if self.config.asr_stale_policy == "latest_only":
+            self.jobs.cancel_where(lambda job: job.utterance < current)
+        else:
+            self.jobs.cancel_where(lambda job: job.kind == "partial" and job.utterance < current)
+
+    # ----- 增量识别：按住期间逐段解码，松开时只剩最后一段 -----
+    @pyqtSlot()
+    def begin_utterance(self):
+        self._utterance += 1
+        with self._state_lock:
+            self._utterances[self._utterance] = []
+        self._drop_stale()
+
+    def _append_segment(self, utterance, text):
+        with self._state_lock:
+            texts = self._utterances.get(utterance)
+            if texts is not None and text:
+                texts.append(text)
+
+    @pyqtSlot(object)
+    def feed_segment(self, segment):
+        utterance = self._utterance
+        if utterance not in self._utterances or not self.engine.is_loaded: return
+        self.jobs.submit(
+            lambda: self.engine.transcribe(segment),
+            lambda text: self._append_segment(utterance, text),
+            kind="segment", utterance=utterance
+        )
+
+    def set_latest_partial(self, audio):
+        """由主线程直接调用 (不经信号)：替换待解码的预览音频，解码线程只取最新一份"""
+        with self._state_lock:
+            self._latest_partial = audio
+
+    @pyqtSlot()
+    def decode_partial(self):
+        """
+        实时预览：重新解码当前未切段的语音，连同已识别分段一起发出
+        解码间隔按实测耗时自适应放宽，保证预览占用的算力不超过设定比例
+        新的预览提交时，队列中尚未开始的旧预览直接取消
+        """
+        with self._state_lock:
+            audio, self._latest_partial = self._latest_partial, None
+        utterance = self._utterance
+        if audio is None or utterance not in self._utterances or not self.engine.is_loaded: return
+        if len(audio) < 16000 * 0.3: return
+        # 上一个预览还在排队或解码中 (被取消的不算)，不重复提交
+        if self._partial_seq is not None and self.jobs.is_pending(self._partial_seq): return
+        due_utterance, due_at = self._partial_due
+        if due_utterance == utterance and time.perf_counter() < due_at: return
+
+        def run():
+            start = time.perf_counter()
+            text = self.engine.transcribe(audio)
+            elapsed = time.perf_counter() - start
+            interval = max(self.config.asr_partial_interval_ms / 1000.0, elapsed * self.config.asr_partial_load_factor)
+            # 间隔只对本语句生效，上一句迟到的预览不会推迟下一句的首个预览
+            self._partial_due = (utterance, time.perf_counter() + interval)
+            return text
+
+        def deliver(text):
+            with self._state_lock:
+                texts = self._utterances.get(utterance)
+                partial = "".join(texts + [text or ""]).strip() if texts is not None else ""
+            if partial:
+                self.partial_result.emit(get_vocab_corrector().correct(partial))
+
+        self.jobs.cancel_where(lambda job: job.kind == "partial")
+        self._partial_seq = self.jobs.submit(run, deliver, kind="partial", utterance=utterance)
+
+    def _finish(self, utterance, is_insertion):
+        with self._state_lock:
+            texts = self._utterances.pop(utterance, None)
+        if texts:
+            self._emit_result("".join(texts), is_insertion)
+
+    @pyqtSlot(bool)
+    def finish_utterance(self, is_insertion=False):
+        utterance = self._utterance
+        if utterance not in self._utterances: return
+        # 尚未开始的预览没有意义了
+        self.jobs.cancel_where(lambda job: job.kind == "partial" and job.utterance == utterance)
+        # 结束标记本身不解码，按序交付保证排在本句所有分段之后
+        self.jobs.submit(lambda: None, lambda _: self._finish(utterance, is_insertion),
+                         kind="final", utterance=utterance)
+
+    @pyqtSlot()
+    def abort_utterance(self):
+        utterance = self._utterance
+        with self._state_lock:
+            self._utterances.pop(utterance, None)
+            self._latest_partial = None
+        self.jobs.cancel_where(lambda job: job.utterance == utterance)
 
 class ASRManager(QObject):
     _instance = None
@@ -308,11 +364,17 @@ class ASRManager(QObject):
     
     model_ready = pyqtSignal()
     result_ready = pyqtSignal(str)
+    partial_result = pyqtSignal(str)
     error = pyqtSignal(str)
     status_changed = pyqtSignal(str)
     
     _sig_load_model = pyqtSignal()
     _sig_transcribe = pyqtSignal(object, bool)
+    _sig_begin_utterance = pyqtSignal()
+    _sig_feed_segment = pyqtSignal(object)
+    _sig_finish_utterance = pyqtSignal(bool)
+    _sig_abort_utterance = pyqtSignal()
+    _sig_decode_partial = pyqtSignal()
     
     def __new__(cls, *args, **kwargs):
         if not cls._instance:
@@ -329,20 +391,38 @@ class ASRManager(QObject):
             
             self.worker.model_ready.connect(self.model_ready.emit)
             self.worker.result_ready.connect(self.result_ready.emit)
+            self.worker.partial_result.connect(self.partial_result.emit)
             self.worker.error_occurred.connect(self.error.emit)
             self.worker.status_changed.connect(self.status_changed.emit)
             self._sig_load_model.connect(self.worker.load_model)
             self._sig_transcribe.connect(self.worker.transcribe)
+            self._sig_begin_utterance.connect(self.worker.begin_utterance)
+            self._sig_feed_segment.connect(self.worker.feed_segment)
+            self._sig_finish_utterance.connect(self.worker.finish_utterance)
+            self._sig_abort_utterance.connect(self.worker.abort_utterance)
+            self._sig_decode_partial.connect(self.worker.decode_partial)
             self.thread.start()
 
     def start(self): self._sig_load_model.emit()
     
     def transcribe_async(self, audio_data, is_insertion=False):
-        data = audio_data.tolist() if isinstance(audio_data, np.ndarray) else audio_data
-        self._sig_transcribe.emit(data, is_insertion)
+        # 以 object 类型直接跨线程传递数组引用，不再 tolist() 展开成 Python 浮点列表
+        self._sig_transcribe.emit(as_float32_audio(audio_data), is_insertion)
+
+    # 增量识别接口：信号按发送顺序在工作线程中执行
+    def begin_utterance(self): self._sig_begin_utterance.emit()
+    def feed_segment(self, segment): self._sig_feed_segment.emit(segment)
+    def finish_utterance(self, is_insertion=False): self._sig_finish_utterance.emit(is_insertion)
+    def abort_utterance(self): self._sig_abort_utterance.emit()
+
+    def request_partial(self, audio_data):
+        """提交实时预览音频；工作线程忙时只保留最新一份，旧请求自然作废"""
+        self.worker.set_latest_partial(audio_data)
+        self._sig_decode_partial.emit()
     
     def cleanup(self):
         if self.thread.isRunning():
             self.thread.quit()
             self.thread.wait()
+        self.worker.jobs.shutdown()
         if self.worker.engine: self.worker.engine.unload()
@@ -386,11 +386,20 @@ class ASRModeWindow(QWidget):
             self.container.setMinimumHeight(target_h)
             self.container.setMaximumHeight(target_h)
 
-    def update_segment(self, text, animate=True):
+    def update_segment(self, text, animate=True, is_partial=False):
         # 如果正在进行淡入淡出，且来了新文字，立即停止并恢复不透明度
         self.fade_anim.stop()
         self.content_opacity.setOpacity(1.0)
 
+        if is_partial:
+            # 录音中的实时预览：与波形并排显示，不启动自动清空/轮播计时
+            self.slot_label.setVisible(False)
+            self.display.setVisible(True)
+            self.display.setPlainText(text)
+            self._update_display_style()
+            self._update_size()
+            return
+
         # [Fix] 预处理：如果是旧的占位符且不在新列表里，直接映射到当前选中的新文案
         # 这样可以避免后续逻辑因为不匹配而停止定时器
         stripped_text = (text or "").strip()
@@ -0,0 +1,109 @@
+"""
+录音缓冲区模块
+录音回调线程使用的纯 numpy 缓冲区，不依赖音频设备与 Qt
+"""
+
+import numpy as np
+
+
+class AudioCaptureBuffer:
+    """
+    预分配的 float32 采集缓冲区
+    - 回调线程原地写入，int16 -> float32 归一化一步完成，不再逐块 copy + concatenate
+    - 容量不足时按倍数扩容 (摊销 O(1))
+    - detach() 交出零拷贝视图，并让下一次录音使用新的缓冲区，避免覆盖已交出的数据
+    """
+    SCALE = 1.0 / 32768.0
+
+    def __init__(self, capacity: int):
+        self.capacity = max(1, int(capacity))
+        self._buf = np.empty(self.capacity, dtype=np.float32)
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def reset(self):
+        self._size = 0
+
+    def write(self, block: np.ndarray):
+        """写入一块 int16 单声道数据"""
+        n = len(block)
+        end = self._size + n
+        if end > len(self._buf):
+            self._grow(end)
+        np.multiply(block, self.SCALE, out=self._buf[self._size:end], casting='unsafe')
+        self._size = end
+
+    def write_float(self, samples: np.ndarray):
+        """写入已归一化的 float32 数据 (用于拼接预录缓冲)"""
+        n = len(samples)
+        end = self._size + n
+        if end > len(self._buf):
+            self._grow(end)
+        self._buf[self._size:end] = samples
+        self._size = end
+
+    def _grow(self, required: int):
+        new_cap = len(self._buf) * 2
+        while new_cap < required:
+            new_cap *= 2
+        new_buf = np.empty(new_cap, dtype=np.float32)
+        new_buf[:self._size] = self._buf[:self._size]
+        self._buf = new_buf
+
+    def view(self) -> np.ndarray:
+        return self._buf[:self._size]
+
+    def tail(self, n: int) -> np.ndarray:
+        return self._buf[max(0, self._size - n):self._size]
+
+    def detach(self) -> np.ndarray:
+        """交出当前录音 (零拷贝)，内部切换到新缓冲区"""
+        data = self._buf[:self._size]
+        self._buf = np.empty(self.capacity, dtype=np.float32)
+        self._size = 0
+        return data
+
+
+class PrerollRing:
+    """
+    固定容量的环形预录缓冲区 (float32)
+    常驻输入流在未录音时持续写入，按下热键时把最近一段音频拼到录音开头
+    """
+    def __init__(self, capacity: int):
+        self.capacity = max(1, int(capacity))
+        self._buf = np.zeros(self.capacity, dtype=np.float32)
+        self._pos = 0
+        self._filled = 0
+
+    def clear(self):
+        self._pos = 0
+        self._filled = 0
+
+    def write(self, block: np.ndarray):
+        """写入一块 int16 单声道数据，满了覆盖最旧的数据"""
+        n = len(block)
+        if n >= self.capacity:
+            block = block[-self.capacity:]
+            np.multiply(block, AudioCaptureBuffer.SCALE, out=self._buf, casting='unsafe')
+            self._pos = 0
+            self._filled = self.capacity
+            return
+        first = min(n, self.capacity - self._pos)
+        np.multiply(block[:first], AudioCaptureBuffer.SCALE, out=self._buf[self._pos:self._pos + first], casting='unsafe')
+        if first < n:
+            np.multiply(block[first:], AudioCaptureBuffer.SCALE, out=self._buf[:n - first], casting='unsafe')
+        self._pos = (self._pos + n) % self.capacity
+        self._filled = min(self.capacity, self._filled + n)
+
+    def drain_into(self, capture: AudioCaptureBuffer):
+        """按时间顺序写入采集缓冲区并清空"""
+        if self._filled:
+            start = (self._pos - self._filled) % self.capacity
+            if start + self._filled <= self.capacity:
+                capture.write_float(self._buf[start:start + self._filled])
+            else:
+                capture.write_float(self._buf[start:])
+                capture.write_float(self._buf[:self._pos])
+        self.clear()
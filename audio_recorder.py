@@ -4,10 +4,18 @@ import io
 import threading
 from PyQt6.QtCore import QObject, pyqtSignal, QTimer
 
+from model_config import get_model_config
+from audio_vad import EnergyVAD
+from audio_buffer import AudioCaptureBuffer, PrerollRing
+
+
 class AudioRecorder(QObject):
     started = pyqtSignal()
     stopped = pyqtSignal()
     audio_ready = pyqtSignal(np.ndarray)
+    no_speech = pyqtSignal() # 本次按键没有可识别的语音 (VAD 未检出、录音为空或录音启动失败)，不再送识别
+    segment_ready = pyqtSignal(np.ndarray) # 增量模式：按住期间按停顿切出的语音段
+    partial_audio = pyqtSignal(np.ndarray) # 实时预览：当前尚未切段的语音 (零拷贝视图)
     level_updated = pyqtSignal(float)
 
     def __init__(self, rate=16000, chunk=1024):
@@ -18,16 +26,52 @@ class AudioRecorder(QObject):
         self.frames = []
         self._lock = threading.Lock()
         
+        # [Perf] 预分配缓冲区采集模式 (可在 config.json 中关闭以回退到列表模式)
+        cfg = get_model_config()
+        self.use_ring_buffer = cfg.audio_ring_buffer
+        self._capture = AudioCaptureBuffer(int(cfg.audio_buffer_seconds * rate)) if self.use_ring_buffer else None
+        
+        # [Perf] 常驻输入流 + 预录缓冲 (依赖预分配缓冲区模式)
+        # 开启后按键不再反复打开/关闭设备，录音从按下前约 300ms 开始，空闲一段时间后释放设备
+        self.warm_mode = self.use_ring_buffer and cfg.audio_warm_stream
+        self._preroll = PrerollRing(int(cfg.audio_preroll_ms * rate / 1000)) if self.warm_mode else None
+        self.stream = None
+        self.idle_timer = QTimer()
+        self.idle_timer.setSingleShot(True)
+        self.idle_timer.setInterval(int(cfg.audio_warm_idle_sec * 1000))
+        self.idle_timer.timeout.connect(self._release_warm_stream)
+        
+        # [Perf] VAD：录音时标记语音区间，只把语音段送给识别器
+        self._vad = EnergyVAD(rate=rate, min_rms=cfg.vad_min_rms, pad_ms=cfg.vad_pad_ms) if cfg.vad_enabled else None
+        
+        # [Perf] 增量识别：按住期间在停顿处切段并立即送去识别，松开时只剩最后一段
+        self.incremental = cfg.asr_incremental and self._vad is not None and self._capture is not None
+        self._seg_pause = int(cfg.asr_segment_pause_ms * rate / 1000)
+        self._seg_min = int(cfg.asr_segment_min_sec * rate)
+        self._seg_start = -1 # 当前未送出段的起点，-1 表示等待下一段语音
+        self._seg_cut = 0    # 上一次切分位置
+        self.live_partial = self.incremental and cfg.asr_live_partial
+        
         # Level monitoring timer
         self.timer = QTimer()
         self.timer.timeout.connect(self._check_level)
+        self.timer.timeout.connect(self._pump_segments)
         self.last_chunk = np.zeros(chunk, dtype=np.int16)
 
     def start_recording(self):
         if self.is_recording: return
         
+        if self.warm_mode:
+            self._start_warm_recording()
+            return
+        
         with self._lock:
             self.frames = []
+            if self._capture is not None:
+                self._capture.reset()
+            if self._vad is not None:
+                self._vad.reset()
+            self._seg_start, self._seg_cut = -1, 0
             self.is_recording = True
             
         try:
@@ -47,6 +91,7 @@ class AudioRecorder(QObject):
         except Exception as e:
             self.is_recording = False
             print(f"[AudioRecorder] Failed to start: {e}")
+            self.no_speech.emit() # 按下时已开始的增量语句随之结束
 
     def stop_recording(self):
         if not self.is_recording: return
@@ -56,6 +101,13 @@ class AudioRecorder(QObject):
         
         self.timer.stop()
         
+        if self.warm_mode:
+            # 常驻模式：保留输入流，重新开始空闲计时
+            self.idle_timer.start()
+            self.stopped.emit()
+            self._emit_captured()
+            return
+        
         if hasattr(self, 'stream') and self.stream:
             try:
                 self.stream.stop()
@@ -71,24 +123,172 @@ class AudioRecorder(QObject):
         self.stopped.emit()
         print("[AudioRecorder] sd.InputStream stopped and released.")
         
-        if self.frames:
+        if self._capture is not None:
+            self._emit_captured()
+        elif self.frames:
             audio_data = np.concatenate(self.frames, axis=0)
             # Normalization to float32 for FunASR/SenseVoice
             audio_float = audio_data.flatten().astype(np.float32) / 32768.0
-            self.audio_ready.emit(audio_float)
+            if self._vad is not None:
+                self._vad.process(audio_float)
+            self._emit_audio(audio_float)
+        else:
+            self.no_speech.emit()
+
+    def _emit_captured(self):
+        with self._lock:
+            final_segment = self._take_segment(final=True) if self.incremental else None
+            audio_float = self._capture.detach()
+        if final_segment is not None:
+            self.segment_ready.emit(final_segment)
+        if len(audio_float):
+            self._emit_audio(audio_float)
+        else:
+            self.no_speech.emit() # 没录到任何数据：结束按下时开始的增量语句
+
+    def _take_segment(self, final=False):
+        """
+        按 VAD 停顿切出一段 (零拷贝切片)，需持有 self._lock
+        切点为停顿开始后 pad 处；下一段从停顿后的首个语音起点 (减 pad) 开始，不携带长静音
+        """
+        vad = self._vad
+        if self._seg_start < 0:
+            onset = vad.onset_after(self._seg_cut)
+            if onset < 0:
+                return None
+            self._seg_start = max(self._seg_cut, onset - vad.pad)
+        
+        if final:
+            end = min(len(self._capture), vad.last_speech + vad.pad)
+        else:
+            silence = vad.processed - vad.last_speech
+            if silence < self._seg_pause or vad.last_speech - self._seg_start < self._seg_min:
+                return None
+            end = min(vad.processed, vad.last_speech + vad.pad)
+        if end <= self._seg_start:
+            return None
+        
+        segment = self._capture.view()[self._seg_start:end]
+        self._seg_start, self._seg_cut = -1, end
+        return segment
+
+    def _pump_segments(self):
+        if not self.incremental: return
+        partial = None
+        with self._lock:
+            if not self.is_recording: return
+            segment = self._take_segment()
+            if self.live_partial:
+                partial = self._open_segment()
+        if segment is not None:
+            self.segment_ready.emit(segment)
+        if partial is not None:
+            self.partial_audio.emit(partial)
+
+    def _open_segment(self):
+        """当前仍在进行中的语音段 (未切出部分)，需持有 self._lock"""
+        start = self._seg_start
+        if start < 0:
+            onset = self._vad.onset_after(self._seg_cut)
+            if onset < 0:
+                return None
+            start = max(self._seg_cut, onset - self._vad.pad)
+        end = self._vad.processed
+        if end <= start:
+            return None
+        return self._capture.view()[start:end]
+
+    def _emit_audio(self, audio_float):
+        """按 VAD 结果裁剪首尾静音 (零拷贝切片)；无语音时跳过识别"""
+        if self._vad is not None:
+            span = self._vad.speech_span(len(audio_float))
+            if span is None:
+                print("[AudioRecorder] VAD: no speech detected, skip recognition.")
+                self.no_speech.emit()
+                return
+            start, end = span
+            audio_float = audio_float[start:end]
+        self.audio_ready.emit(audio_float)
+
+    def _open_stream(self):
+        self.stream = sd.InputStream(
+            samplerate=self.rate,
+            channels=1,
+            dtype='int16',
+            blocksize=self.chunk,
+            callback=self._callback
+        )
+        self.stream.start()
+
+    def _start_warm_recording(self):
+        self.idle_timer.stop()
+        with self._lock:
+            self._capture.reset()
+            # 从预录缓冲开始，首个音节不再被截断
+            self._preroll.drain_into(self._capture)
+            if self._vad is not None:
+                self._vad.reset()
+                self._vad.process(self._capture.view())
+            self._seg_start, self._seg_cut = -1, 0
+            self.is_recording = True
+        
+        if not self.stream:
+            try:
+                self._open_stream()
+                print("[AudioRecorder] Warm sd.InputStream opened.")
+            except Exception as e:
+                self.is_recording = False
+                print(f"[AudioRecorder] Failed to start: {e}")
+                self.no_speech.emit()
+                return
+        
+        self.started.emit()
+        self.timer.start(100)
+
+    def _release_warm_stream(self):
+        """空闲超时后释放输入设备"""
+        if self.is_recording or not self.stream: return
+        try:
+            self.stream.stop()
+            self.stream.close()
+        except: pass
+        self.stream = None
+        with self._lock:
+            self._preroll.clear()
+        
+        import gc
+        gc.collect()
+        print("[AudioRecorder] Warm sd.InputStream released after idle.")
 
     def _callback(self, indata, frames, time, status):
         if status:
             print(f"[AudioRecorder] Stream status: {status}")
         with self._lock:
-            if self.is_recording:
+            if not self.is_recording:
+                if self._preroll is not None:
+                    self._preroll.write(indata[:, 0])
+                return
+            if self._capture is not None:
+                # 原地写入预分配缓冲区，电平由缓冲区尾部计算，无需额外拷贝
+                self._capture.write(indata[:, 0])
+                if self._vad is not None:
+                    self._vad.process(self._capture.tail(frames))
+            else:
                 self.frames.append(indata.copy())
                 self.last_chunk = indata.flatten()
 
     def _check_level(self):
         # Calculate RMS level for UI
+        if self._capture is not None:
+            with self._lock:
+                tail = self._capture.tail(self.chunk)
+                rms = float(np.sqrt(np.mean(np.square(tail, dtype=np.float64)))) * 32768.0 if len(tail) else 0.0
+            self.level_updated.emit(rms)
+            return
         rms = np.sqrt(np.mean(self.last_chunk.astype(np.float64)**2))
         self.level_updated.emit(float(rms))
 
     def cleanup(self):
-        pass # sounddevice handles itself well
+        if self.warm_mode:
+            self.idle_timer.stop()
+            self._release_warm_stream()
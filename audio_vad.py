@@ -0,0 +1,131 @@
+"""
+语音活动检测 (VAD) 模块
+基于短时能量 + 过零率的向量化检测器，在录音回调中逐块标记语音区间
+不依赖额外模型文件，开销为每块一次 reshape + 两次均值运算
+"""
+
+import bisect
+
+import numpy as np
+
+
+class EnergyVAD:
+    """
+    能量/过零率 VAD
+    - 帧能量超过自适应阈值判为语音 (浊音)
+    - 能量略低但过零率处于清音区间的帧也判为语音 (擦音/送气音)
+    - 噪声底噪在非语音帧上做指数平滑，阈值 = max(最小阈值, 底噪 * 倍率)
+    输入为已归一化到 [-1, 1] 的 float32 单声道数据
+    """
+
+    def __init__(self, rate: int = 16000, frame_ms: int = 16, min_rms: float = 0.005,
+                 noise_ratio: float = 3.0, min_speech_ms: int = 120, pad_ms: int = 200):
+        self.rate = rate
+        self.frame_len = max(1, int(rate * frame_ms / 1000))
+        self.min_rms = min_rms
+        self.noise_ratio = noise_ratio
+        self.min_speech_frames = max(1, int(min_speech_ms / frame_ms))
+        self.pad = int(rate * pad_ms / 1000)
+        self.reset()
+
+    def reset(self):
+        self._noise = None
+        self._pending = np.zeros(0, dtype=np.float32) # 不足一帧的尾巴
+        self._offset = 0       # 已处理 (成帧) 的样本数
+        self.speech_frames = 0
+        self.first_speech = -1 # 首个语音帧起点 (样本)
+        self.last_speech = -1  # 最后语音帧终点 (样本)
+        self.onsets = []       # 每段语音的起点 (样本)，用于按停顿切分
+        self._prev_speech = False
+
+    @property
+    def processed(self) -> int:
+        return self._offset
+
+    @property
+    def has_speech(self) -> bool:
+        return self.speech_frames >= self.min_speech_frames
+
+    def _classify(self, frames: np.ndarray) -> np.ndarray:
+        rms = np.sqrt(np.mean(np.square(frames, dtype=np.float32), axis=1))
+        signs = np.signbit(frames)
+        zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / frames.shape[1]
+
+        if self._noise is None:
+            # 以首批帧的最小能量作为初始底噪，并设上限防止一开口就说话时阈值过高
+            self._noise = min(float(np.min(rms)), 0.02)
+        threshold = max(self.min_rms, self._noise * self.noise_ratio)
+
+        voiced = rms >= threshold
+        unvoiced = (rms >= threshold * 0.5) & (zcr >= 0.25) & (zcr <= 0.6)
+        speech = voiced | unvoiced
+
+        quiet = rms[~speech]
+        if len(quiet):
+            self._noise = 0.9 * self._noise + 0.1 * float(np.mean(quiet))
+        return speech
+
+    def process(self, samples: np.ndarray):
+        """处理一段连续音频 (可多次调用，按时间顺序)"""
+        if len(self._pending):
+            samples = np.concatenate((self._pending, samples))
+        n_frames = len(samples) // self.frame_len
+        used = n_frames * self.frame_len
+        self._pending = samples[used:].copy()
+        if not n_frames:
+            return
+
+        speech = self._classify(samples[:used].reshape(n_frames, self.frame_len))
+        prev = np.concatenate(([self._prev_speech], speech[:-1]))
+        for i in np.flatnonzero(speech & ~prev):
+            self.onsets.append(self._offset + int(i) * self.frame_len)
+        self._prev_speech = bool(speech[-1])
+        idx = np.flatnonzero(speech)
+        if len(idx):
+            if self.first_speech < 0:
+                self.first_speech = self._offset + int(idx[0]) * self.frame_len
+            self.last_speech = self._offset + (int(idx[-1]) + 1) * self.frame_len
+            self.speech_frames += len(idx)
+        self._offset += used
+
+    def onset_after(self, sample: int) -> int:
+        """返回 sample 之后第一段语音的起点，没有则返回 -1"""
+        i = bisect.bisect_left(self.onsets, sample)
+        return self.onsets[i] if i < len(self.onsets) else -1
+
+    def speech_span(self, total: int):
+        """返回带前后缓冲的语音区间 (start, end)，无语音时返回 None"""
+        if not self.has_speech:
+            return None
+        start = max(0, self.first_speech - self.pad)
+        end = min(total, self.last_speech + self.pad)
+        return start, end
+
+
+def find_split_points(audio: np.ndarray, rate: int, chunk_sec: float, search_sec: float = 2.0,
+                      frame_ms: int = 20) -> list:
+    """
+    为长音频寻找切分点：在每个目标位置 (chunk_sec 的整数倍) 前后 search_sec 范围内
+    选取能量最低的帧，尽量在停顿处切开，避免把一个字切成两半
+    返回升序的样本下标列表 (不含 0 与结尾)
+    """
+    frame_len = max(1, int(rate * frame_ms / 1000))
+    n_frames = len(audio) // frame_len
+    if n_frames == 0:
+        return []
+    frames = audio[:n_frames * frame_len].reshape(n_frames, frame_len)
+    energy = np.mean(np.square(frames, dtype=np.float32), axis=1)
+
+    step = max(1, int(chunk_sec * rate / frame_len))
+    window = max(1, int(search_sec * rate / frame_len))
+    points = []
+    last = 0
+    target = step
+    while target < n_frames - window:
+        lo = max(last + 1, target - window)
+        hi = min(n_frames, target + window)
+        best = lo + int(np.argmin(energy[lo:hi]))
+        points.append(best * frame_len)
+        last = best
+        target = best + step
+    return points
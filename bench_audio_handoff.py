@@ -0,0 +1,64 @@
+"""
+录音 -> ASR 引擎 音频交接开销基准
+对比旧路径 (tolist() 跨线程 + np.array 重建) 与新路径 (连续 float32 数组直接传递)
+"""
+import time
+import queue
+import threading
+import numpy as np
+
+from asr_manager import as_float32_audio
+
+RATE = 16000
+
+
+def legacy_handoff(audio):
+    """旧实现：ASRManager.transcribe_async 中 tolist()，OnnxASREngine.transcribe 中 np.array()"""
+    data = audio.tolist()
+    return data, (lambda d: np.array(d, dtype=np.float32))
+
+
+def zero_copy_handoff(audio):
+    """新实现：直接传递数组引用"""
+    return as_float32_audio(audio), as_float32_audio
+
+
+def run_across_threads(handoff, audio, repeat):
+    """模拟主线程发出、工作线程接收的完整交接过程"""
+    q = queue.Queue()
+    done = queue.Queue()
+
+    def worker():
+        for _ in range(repeat):
+            data, rebuild = q.get()
+            arr = rebuild(data)
+            done.put(len(arr))
+
+    t = threading.Thread(target=worker, daemon=True)
+    t.start()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        q.put(handoff(audio))
+        done.get()
+    elapsed = time.perf_counter() - start
+    t.join()
+    return elapsed / repeat
+
+
+def bench():
+    print("=== 音频交接开销基准 ===")
+    for seconds in (5, 30, 60):
+        # 模拟录音器交出的缓冲区视图 (预分配缓冲区的前 n 个样本)
+        buf = np.random.uniform(-0.5, 0.5, RATE * (seconds + 10)).astype(np.float32)
+        audio = buf[:RATE * seconds]
+        repeat = 5 if seconds >= 30 else 20
+
+        legacy = run_across_threads(legacy_handoff, audio, repeat)
+        fast = run_across_threads(zero_copy_handoff, audio, repeat)
+        shared = np.shares_memory(as_float32_audio(audio), audio)
+        print(f"{seconds:>3}s 音频: 旧路径 {legacy * 1000:8.2f} ms | 新路径 {fast * 1000:8.4f} ms | "
+              f"加速 {legacy / max(fast, 1e-9):8.0f}x | 零拷贝: {shared}")
+
+
+if __name__ == "__main__":
+    bench()
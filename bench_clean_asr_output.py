@@ -0,0 +1,70 @@
+"""
+clean_asr_output 单次调用开销基准
+对比重构前实现 (每次调用编译正则 + 读取配置 + 线性扫描词表) 与预编译流水线
+旧实现从 git 基线版本中提取；不在 git 仓库中运行时只测新实现
+"""
+import re
+import sys
+import timeit
+import subprocess
+
+import model_config
+from text_postprocess import ASRPostProcessor
+
+BASELINE_REV = "0095752"
+
+SAMPLES = [
+    "<|zh|><|NEUTRAL|><|Speech|><|woitn|>今天天气不错。我们一起去公园散步吧",
+    "[noise]你好[laugh]",
+    "hello   world  again",
+    "有道理，哈哈",
+    "我觉得可以",
+    "好的！！",
+]
+
+
+class _StubConfig:
+    emoji_mode = "off"
+
+
+def load_legacy(cfg):
+    try:
+        src = subprocess.run(["git", "show", f"{BASELINE_REV}:asr_manager.py"],
+                             capture_output=True, text=True, encoding="utf-8", check=True).stdout
+    except Exception as e:
+        print(f"无法读取基线实现: {e}")
+        return None
+    start = src.index("def clean_asr_output(")
+    end = src.index("\nclass ", start)
+    # 旧实现在函数内部 import get_model_config，这里替换为替身
+    model_config.get_model_config = lambda: cfg
+    ns = {"re": re, "ASROutputMode": model_config.ASROutputMode}
+    exec(src[start:end], ns)
+    return ns["clean_asr_output"]
+
+
+def bench(label, fn, number):
+    t = timeit.timeit(lambda: [fn(s, "raw", False) for s in SAMPLES], number=number)
+    per_call = t / (number * len(SAMPLES)) * 1e6
+    print(f"  {label:<10} {per_call:8.2f} us/call")
+    return per_call
+
+
+def main():
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    cfg = _StubConfig()
+    legacy = load_legacy(cfg)
+    processor = ASRPostProcessor(cfg)
+
+    for emoji_mode in ("off", "trigger", "auto"):
+        cfg.emoji_mode = emoji_mode
+        processor.refresh()
+        print(f"emoji_mode={emoji_mode}")
+        new = bench("compiled", processor.process, number)
+        if legacy:
+            old = bench("legacy", legacy, number)
+            print(f"  speedup    {old / new:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
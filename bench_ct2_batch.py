@@ -0,0 +1,76 @@
+"""
+本地 CT2 翻译批处理基准
+对比旧实现 (逐行 translate_batch，每批 1 条) 与新实现 (全部行按长度排序后一次 translate_batch)
+用法: python bench_ct2_batch.py [模型目录] [重复次数]
+未指定模型目录时使用配置中的本地翻译模型
+"""
+import sys
+import time
+
+from model_config import get_model_config
+from translator_engine import CT2TranslatorEngine
+
+PARAGRAPHS = [
+    "今天早上我六点就起床了，先去公园跑了三公里，然后回家做了早饭。",
+    "下午开会讨论了下个季度的产品计划，大家对新功能的优先级有不同的看法。",
+    "晚上和朋友一起去吃了火锅，聊了很多以前上学时候的事情。",
+    "",
+    "这个周末打算去北海道旅游，听说那边的海鲜特别新鲜。",
+    "如果天气好的话，我们还想去看看薰衣草田。",
+    "你有什么推荐的地方吗？",
+    "",
+    "最近在学习日语，感觉语法比想象中难很多，尤其是敬语的用法。",
+    "不过坚持每天练习，应该会慢慢进步的。",
+]
+
+
+def legacy_translate(engine: CT2TranslatorEngine, text: str) -> str:
+    """重构前的逐行实现"""
+    results = []
+    for line in text.split('\n'):
+        if not line.strip():
+            results.append("")
+            continue
+        tokens = engine.sp.encode(line, out_type=str)
+        output = engine.translator.translate_batch(
+            [[engine.src_prefix] + tokens + ["</s>"]],
+            target_prefix=[[engine.tgt_prefix_token]],
+            beam_size=4,
+            max_decoding_length=256,
+            replace_unknowns=True
+        )
+        results.append(engine.sp.decode(engine._strip_lang_token(output[0].hypotheses[0])))
+    return '\n'.join(results)
+
+
+def main():
+    cfg = get_model_config()
+    model_path = sys.argv[1] if len(sys.argv) > 1 else cfg.get_translator_model_path()
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    if not model_path:
+        print("未找到本地翻译模型，请指定模型目录")
+        return
+
+    engine = CT2TranslatorEngine()
+    if not engine.load(model_path):
+        print("模型加载失败")
+        return
+
+    text = '\n'.join(PARAGRAPHS)
+    n_lines = sum(1 for p in PARAGRAPHS if p.strip())
+
+    for label, fn in (("per-line", lambda: legacy_translate(engine, text)),
+                      ("batched", lambda: engine.translate(text))):
+        fn() # 预热
+        start = time.perf_counter()
+        for _ in range(repeat):
+            out = fn()
+        elapsed = (time.perf_counter() - start) / repeat
+        print(f"{label:<10} {elapsed * 1000:8.1f} ms/doc  {n_lines / elapsed:6.1f} lines/s")
+    assert out.count('\n') == text.count('\n'), "空行位置未保留"
+
+    engine.unload()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+熔断器模块
+远端服务不可用时，每个请求都要等满超时才失败。熔断器在连续失败 (或连续超慢响应) 后"断开"，
+断开期间请求立即失败，不再访问网络；由后台线程定期试探 (半开状态)，试探成功才恢复
+"""
+
+import time
+import threading
+from typing import Callable, Optional
+
+CLOSED = "closed"         # 正常放行
+OPEN = "open"             # 熔断中，请求立即失败
+HALF_OPEN = "half_open"   # 后台试探中，请求仍然立即失败
+
+
+class CircuitOpenError(Exception):
+    """熔断期间被拒绝的请求"""
+
+
+class CircuitBreaker:
+    def __init__(self,
+                 probe: Optional[Callable[[], None]] = None,
+                 failure_threshold: int = 3,
+                 slow_threshold_sec: float = 2.5,
+                 open_sec: float = 5.0,
+                 max_open_sec: float = 60.0,
+                 name: str = "breaker"):
+        """
+        probe: 后台试探函数，抛出异常表示服务仍不可用；为 None 时断开期满后直接放行一次真实请求作为试探
+        slow_threshold_sec: 成功但耗时超过此值的请求也计为一次失败
+        open_sec: 首次断开的时长，试探失败后翻倍，最长 max_open_sec
+        """
+        self.probe = probe
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.slow_threshold_sec = slow_threshold_sec
+        self.open_sec = open_sec
+        self.max_open_sec = max_open_sec
+        self.name = name
+
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._backoff = open_sec
+        self._reopen_at = 0.0     # 无 probe 时，断开期满的时间点
+        self._timer = None
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    def allow(self) -> bool:
+        """请求前调用：是否放行"""
+        if self._state == CLOSED:
+            return True
+        if self.probe is not None:
+            return False
+        # 没有后台试探函数：断开期满后放行一个真实请求作为半开试探
+        with self._lock:
+            if self._state == OPEN and time.monotonic() >= self._reopen_at:
+                self._state = HALF_OPEN
+                return True
+            return False
+
+    def record_success(self, latency: float = 0.0):
+        if latency > self.slow_threshold_sec:
+            self.record_failure()
+            return
+        with self._lock:
+            self._failures = 0
+            if self._state != CLOSED:
+                self._close()
+
+    def record_failure(self):
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._open()
+                return
+            self._failures += 1
+            if self._state == CLOSED and self._failures >= self.failure_threshold:
+                self._open()
+
+    def call(self, func: Callable, *args, **kwargs):
+        """经熔断器调用 func；熔断期间抛出 CircuitOpenError"""
+        if not self.allow():
+            raise CircuitOpenError(self.name)
+        start = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        except Exception:
+            self.record_failure()
+            raise
+        self.record_success(time.perf_counter() - start)
+        return result
+
+    # ===== 状态切换 (调用方持有 _lock) =====
+    def _open(self):
+        if self._state == HALF_OPEN:
+            self._backoff = min(self._backoff * 2, self.max_open_sec)
+        self._state = OPEN
+        self._reopen_at = time.monotonic() + self._backoff
+        print(f"[{self.name}] Circuit open for {self._backoff:.1f}s")
+        if self.probe is not None:
+            self._timer = threading.Timer(self._backoff, self._run_probe)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _close(self):
+        self._state = CLOSED
+        self._backoff = self.open_sec
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        print(f"[{self.name}] Circuit closed")
+
+    def _run_probe(self):
+        with self._lock:
+            if self._state != OPEN:
+                return
+            self._state = HALF_OPEN
+        start = time.perf_counter()
+        try:
+            self.probe()
+        except Exception:
+            self.record_failure()
+            return
+        self.record_success(time.perf_counter() - start)
+
+    def close(self):
+        """退出时取消挂起的试探"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
@@ -0,0 +1,86 @@
+"""
+共享 HTTP 客户端模块
+翻译、更新检查、模型下载共用一个带连接池的 requests.Session：
+- 长连接复用，稳定状态下每次翻译只剩一次请求往返，不再重复 TCP/TLS 握手
+- 连接池大小、连接/读取超时由配置决定
+- prewarm() 在后台提前建立连接，第一次翻译也不用等握手
+"""
+
+import threading
+from typing import Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+
+class HttpClient:
+    def __init__(self, pool_size: int = 8, connect_timeout: float = 3.0, read_timeout: float = 10.0):
+        self.pool_size = max(1, int(pool_size))
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.timeout = (connect_timeout, read_timeout)
+        self._session = None
+        self._lock = threading.Lock()
+
+    @property
+    def session(self) -> requests.Session:
+        """首次使用时才创建 Session"""
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.pool_size)
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    session.headers["User-Agent"] = USER_AGENT
+                    self._session = session
+        return self._session
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """与 requests.get 参数一致；未指定 timeout 时使用默认超时。流式下载用完后需 close() 归还连接"""
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.get(url, **kwargs)
+
+    def prewarm(self, url: str, background: bool = True):
+        """向目标主机发一个 HEAD 请求，让连接提前进入连接池"""
+        parts = urlsplit(url)
+        origin = f"{parts.scheme}://{parts.netloc}/"
+
+        def run():
+            try:
+                self.session.head(origin, timeout=self.timeout, allow_redirects=False).close()
+            except Exception as e:
+                print(f"[HttpClient] Prewarm {origin} failed: {e}")
+
+        if background:
+            threading.Thread(target=run, daemon=True).start()
+        else:
+            run()
+
+    def close(self):
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+
+# ===== 全局单例 =====
+_client_instance: Optional[HttpClient] = None
+_client_lock = threading.Lock()
+
+def get_http_client() -> HttpClient:
+    global _client_instance
+    if _client_instance is None:
+        with _client_lock:
+            if _client_instance is None:
+                from model_config import get_model_config
+                cfg = get_model_config()
+                _client_instance = HttpClient(
+                    pool_size=cfg.http_pool_size,
+                    connect_timeout=cfg.http_connect_timeout_sec,
+                    read_timeout=cfg.http_read_timeout_sec
+                )
+    return _client_instance
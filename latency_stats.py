@@ -0,0 +1,92 @@
+"""
+延迟统计模块
+每个翻译引擎一个对数分桶直方图：记录 O(1)、内存固定，不保存原始样本
+用于估计 p95 等分位数，作为对冲请求 (hedged request) 的等待预算
+"""
+
+import math
+import threading
+from typing import Dict, Optional
+
+
+class LatencyHistogram:
+    """
+    对数分桶直方图，桶边界按 GROWTH 倍递增 (相对误差约 10%)
+    为了跟随网络状况变化，样本数达到 DECAY_EVERY 时所有桶计数减半，旧样本的权重逐步衰减
+    """
+    MIN_SEC = 0.001
+    GROWTH = 1.2
+    BUCKETS = 64      # 覆盖 1ms ~ 约 117 分钟，更大的值落在最后一个桶
+    DECAY_EVERY = 512
+
+    def __init__(self):
+        self._counts = [0] * self.BUCKETS
+        self._total = 0
+        self._lock = threading.Lock()
+
+    def _bucket(self, seconds: float) -> int:
+        if seconds <= self.MIN_SEC:
+            return 0
+        index = int(math.log(seconds / self.MIN_SEC, self.GROWTH)) + 1
+        return min(index, self.BUCKETS - 1)
+
+    def _upper_bound(self, index: int) -> float:
+        return self.MIN_SEC * self.GROWTH ** index
+
+    def record(self, seconds: float):
+        with self._lock:
+            self._counts[self._bucket(seconds)] += 1
+            self._total += 1
+            if self._total >= self.DECAY_EVERY:
+                self._counts = [c // 2 for c in self._counts]
+                self._total = sum(self._counts)
+
+    @property
+    def count(self) -> int:
+        return self._total
+
+    def percentile(self, p: float) -> Optional[float]:
+        """返回第 p 百分位 (0~100) 所在桶的上界 (秒)；没有样本时返回 None"""
+        with self._lock:
+            if not self._total:
+                return None
+            rank = max(1, math.ceil(self._total * p / 100.0))
+            seen = 0
+            for index, count in enumerate(self._counts):
+                seen += count
+                if seen >= rank:
+                    return self._upper_bound(index)
+            return self._upper_bound(self.BUCKETS - 1)
+
+
+class LatencyTracker:
+    """按引擎 ID 管理直方图"""
+
+    def __init__(self):
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, engine_id: str) -> LatencyHistogram:
+        with self._lock:
+            hist = self._histograms.get(engine_id)
+            if hist is None:
+                hist = self._histograms[engine_id] = LatencyHistogram()
+            return hist
+
+    def record(self, engine_id: str, seconds: float):
+        self.histogram(engine_id).record(seconds)
+
+    def percentile(self, engine_id: str, p: float, min_samples: int = 1) -> Optional[float]:
+        """样本数不足 min_samples 时返回 None，由调用方使用默认值"""
+        hist = self.histogram(engine_id)
+        if hist.count < min_samples:
+            return None
+        return hist.percentile(p)
+
+    def summary(self) -> dict:
+        with self._lock:
+            items = list(self._histograms.items())
+        return {
+            engine_id: {"count": hist.count, "p50": hist.percentile(50), "p95": hist.percentile(95)}
+            for engine_id, hist in items
+        }
@@ -0,0 +1,156 @@
+"""
+学习规则持久化模块
+学习事件来自全局键盘钩子路径，不能每次都重写整个 JSON：
+- 每个事件只向日志文件 (learned_rules.journal) 追加一行
+- 日志累积到一定条数后在后台线程压缩进快照 (learned_rules.json)，写临时文件后 os.replace 原子替换
+- 启动时读取快照并重放日志；快照记录已合并的最大序号，崩溃后重放不会重复计数
+"""
+
+import os
+import json
+import threading
+from typing import Dict
+
+NO_PERIOD = "no_period"
+FORCE_PERIOD = "force_period"
+
+
+class LearnedRulesStore:
+    COMPACT_EVERY = 200 # 日志累积多少条后触发后台压缩
+
+    def __init__(self, snapshot_path: str):
+        self.snapshot_path = snapshot_path
+        self.journal_path = os.path.splitext(snapshot_path)[0] + ".journal"
+        self._compacting_path = self.journal_path + ".compacting"
+
+        self.no_period: Dict[str, int] = {}
+        self.force_period: Dict[str, int] = {}
+
+        self._lock = threading.Lock()
+        self._seq = 0          # 最后一个事件的序号
+        self._pending = 0      # 上次压缩后追加的条数
+        self._journal = None
+        self._compact_thread = None
+
+        self._load()
+
+    # ===== 读取 =====
+    def _load(self):
+        snapshot_seq = 0
+        try:
+            if os.path.exists(self.snapshot_path):
+                with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                self.no_period.update(data.get(NO_PERIOD, {}))
+                self.force_period.update(data.get(FORCE_PERIOD, {}))
+                snapshot_seq = int(data.get("seq", 0))
+        except Exception as e:
+            print(f"[Learning] Snapshot load error: {e}")
+
+        self._seq = snapshot_seq
+        # 先重放上次未完成压缩的日志，再重放当前日志
+        for path in (self._compacting_path, self.journal_path):
+            self._replay(path, snapshot_seq)
+
+    def _replay(self, path: str, snapshot_seq: int):
+        if not os.path.exists(path):
+            return
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        seq = int(entry["s"])
+                    except Exception:
+                        continue # 崩溃时写了一半的行
+                    if seq <= snapshot_seq:
+                        continue
+                    self._apply(entry["k"], entry["w"])
+                    self._seq = max(self._seq, seq)
+                    self._pending += 1
+        except Exception as e:
+            print(f"[Learning] Journal replay error: {e}")
+
+    def _apply(self, kind: str, word: str):
+        if kind == NO_PERIOD:
+            self.no_period[word] = self.no_period.get(word, 0) + 1
+        elif kind == FORCE_PERIOD:
+            # 与 ModelConfig.learn_force_period_rule 一致：先从"不加句号"名单移除
+            self.no_period.pop(word, None)
+            self.force_period[word] = self.force_period.get(word, 0) + 1
+
+    # ===== 写入 =====
+    def record(self, kind: str, word: str):
+        """记录一次学习事件：更新内存中的规则，并向日志追加一行"""
+        with self._lock:
+            self._apply(kind, word)
+            self._seq += 1
+            self._pending += 1
+            try:
+                if self._journal is None:
+                    self._journal = open(self.journal_path, 'a', encoding='utf-8')
+                self._journal.write(json.dumps({"s": self._seq, "k": kind, "w": word}, ensure_ascii=False) + "\n")
+                self._journal.flush()
+            except Exception as e:
+                print(f"[Learning] Journal append error: {e}")
+            need_compact = self._pending >= self.COMPACT_EVERY
+
+        if need_compact:
+            self.compact_async()
+
+    def compact_async(self):
+        if self._compact_thread and self._compact_thread.is_alive():
+            return
+        self._compact_thread = threading.Thread(target=self.compact, daemon=True)
+        self._compact_thread.start()
+
+    def compact(self):
+        """把日志合并进快照。锁内只做内存拷贝和日志轮换，文件写入在锁外完成"""
+        with self._lock:
+            if self._pending == 0 and not os.path.exists(self._compacting_path):
+                return
+            data = {
+                "seq": self._seq,
+                NO_PERIOD: dict(self.no_period),
+                FORCE_PERIOD: dict(self.force_period),
+            }
+            try:
+                if self._journal is not None:
+                    self._journal.close()
+                    self._journal = None
+                if os.path.exists(self.journal_path):
+                    if os.path.exists(self._compacting_path):
+                        # 上次压缩未完成：接到遗留日志后面，快照写成功之前两者都不能丢
+                        with open(self.journal_path, 'r', encoding='utf-8') as src, \
+                             open(self._compacting_path, 'a', encoding='utf-8') as dst:
+                            dst.write(src.read())
+                        os.remove(self.journal_path)
+                    else:
+                        os.replace(self.journal_path, self._compacting_path)
+            except Exception as e:
+                print(f"[Learning] Journal rotate error: {e}")
+                return
+            self._pending = 0
+
+        tmp_path = self.snapshot_path + ".tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.snapshot_path)
+            if os.path.exists(self._compacting_path):
+                os.remove(self._compacting_path)
+            print(f"[Learning] Rules compacted (seq={data['seq']}).")
+        except Exception as e:
+            print(f"[Learning] Compact error: {e}")
+
+    def close(self):
+        """退出时调用：等待后台压缩结束，再同步压缩一次"""
+        if self._compact_thread and self._compact_thread.is_alive():
+            self._compact_thread.join(timeout=5)
+        self.compact()
+        with self._lock:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
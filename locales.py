@@ -393,12 +393,18 @@ class LocaleManager:
         if cls._instance is None:
             cls._instance = super(LocaleManager, cls).__new__(cls)
             cls._instance.config = get_model_config()
+            # 缓存当前语言，切换语言时由订阅更新
+            cls._instance._lang = getattr(cls._instance.config, 'language', 'zh') or 'zh'
+            cls._instance.config.subscribe("language", cls._instance._on_language_changed)
         return cls._instance
 
+    def _on_language_changed(self, value):
+        self._lang = value or 'zh'
+
     @property
     def lang(self):
         # 默认 zh
-        return getattr(self.config, 'language', 'zh')
+        return self._lang
 
     def get(self, key, default=None):
         if key not in TRANSLATIONS:
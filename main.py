@@ -22,8 +22,9 @@ except ImportError:
     tts_worker = None
 
 class AppController(QObject):
-    sig_do_translate = pyqtSignal(str)
+    sig_do_translate = pyqtSignal(int, str) # (generation, text)
     sig_change_engine = pyqtSignal(str)
+    sig_commit_translation = pyqtSignal(str) # 用户确认使用的译文原文，写入磁盘缓存
 
     def __init__(self, app_instance):
         super().__init__()
@@ -36,6 +37,7 @@ class AppController(QObject):
         # 1. Models & Managers
         self.asr_manager = ASRManager()
         self.tr_engine = TranslatorEngine()
+        self.tr_worker = None # 在 _deferred_init 中创建
         self.audio_recorder = AudioRecorder()
         self.sys_handler = SystemHandler()
         
@@ -107,7 +109,9 @@ class AppController(QObject):
         self.tr_worker.moveToThread(self.tr_thread)
         self.sig_do_translate.connect(self.tr_worker.on_translate_requested)
         self.sig_change_engine.connect(self.tr_worker.on_engine_change_requested)
+        self.sig_commit_translation.connect(self.tr_worker.on_commit_requested)
         self.tr_worker.result_ready.connect(self.on_translation_finished)
+        self.tr_worker.partial_ready.connect(self.on_translation_partial)
         self.tr_worker.status_changed.connect(self.on_worker_status_changed)
         self.tr_thread.start()
         
@@ -128,10 +132,18 @@ class AppController(QObject):
         self.audio_recorder.started.connect(self.on_recording_state_changed)
         self.audio_recorder.stopped.connect(self.on_recording_state_changed)
         self.audio_recorder.audio_ready.connect(self._handle_audio_ready)
+        self.audio_recorder.segment_ready.connect(self.asr_manager.feed_segment)
+        self.audio_recorder.no_speech.connect(self.asr_manager.abort_utterance)
+        self.audio_recorder.partial_audio.connect(self.asr_manager.request_partial)
         self.audio_recorder.level_updated.connect(self.handle_audio_level)
+        self.app.aboutToQuit.connect(self.audio_recorder.cleanup) # 释放常驻输入流
+        self.app.aboutToQuit.connect(self.m_cfg.flush) # 写入延迟保存的配置与学习规则
+        self.app.aboutToQuit.connect(lambda: self.tr_worker.stop()) # 结束翻译工作线程 (直接在主线程调用)
+        self.app.aboutToQuit.connect(self.tr_engine.cleanup) # 关闭翻译缓存
         
         self.asr_manager.model_ready.connect(lambda: self.on_worker_status_changed("idle"))
         self.asr_manager.result_ready.connect(self.handle_asr_result)
+        self.asr_manager.partial_result.connect(self.handle_asr_partial)
         self.asr_manager.error.connect(lambda e: print(f"ASR Error: {e}"))
 
         # 6. Trigger engine loads after a short buffer
@@ -252,6 +264,8 @@ class AppController(QObject):
         self.sys_handler.trigger_insertion_check()
         
         self.window.update_recording_status(True)
+        if self.audio_recorder.incremental and not self.audio_recorder.is_recording:
+            self.asr_manager.begin_utterance()
         self.audio_recorder.start_recording()
         
         # 如果当前是 ASR 模式且界面是隐藏的，显示悬浮指示器
@@ -300,7 +314,11 @@ class AppController(QObject):
         # [Async] 使用按下时已经开启探测并缓存的结果
         # 此时探测线程应该早已完成
         is_ins = self.sys_handler.get_cached_insertion()
-        self.asr_manager.transcribe_async(audio_data, is_insertion=is_ins)
+        if self.audio_recorder.incremental:
+            # 语音段已在按住期间送出，这里只需结束本句
+            self.asr_manager.finish_utterance(is_insertion=is_ins)
+        else:
+            self.asr_manager.transcribe_async(audio_data, is_insertion=is_ins)
 
     def handle_asr_result(self, result):
         print(f"[Main] Received ASR result: '{result}'")
@@ -317,6 +335,11 @@ class AppController(QObject):
              # 为了极致速度，我们这里直接调用，但需要在 UI 侧处理好防止重复提交
              self.handle_translation_request(result)
 
+    def handle_asr_partial(self, text):
+        """录音期间的实时预览，只更新显示，不粘贴也不触发翻译"""
+        if not text or not self.audio_recorder.is_recording: return
+        self.window.update_segment(text, is_partial=True)
+
     def on_translation_started(self):
         """当用户开始在中日双显模式输入时调用"""
         self._is_translating = True
@@ -326,10 +349,22 @@ class AppController(QObject):
         if hasattr(self, '_last_tts_text') and self._last_tts_text != text:
             self._last_tts_text = None
         
-        self._is_translating = True # 标记正在翻译
-        self.sig_do_translate.emit(text)
+        if not self.tr_worker: return
+        self._is_translating = True # 标记正在翻译 (直到最新一次请求的结果返回)
+        self._last_translation_source = text # 只接受最新请求的结果，所以它总是对应当前显示的译文
+        generation, coalesced = self.tr_worker.claim_generation(text)
+        if not coalesced:
+            self.sig_do_translate.emit(generation, text)
+
+    def on_translation_partial(self, generation, text):
+        # 流式预览只刷新显示；复制、粘贴、朗读都等最终结果
+        if not self.tr_worker.is_current(generation) or not text: return
+        if self.app_mode == "translation":
+            self.tr_window.on_translation_partial(text)
 
-    def on_translation_finished(self, text):
+    def on_translation_finished(self, generation, text):
+        # 只接受最新请求的结果，过期结果直接丢弃
+        if not self.tr_worker.is_current(generation): return
         self._is_translating = False # 翻译结束
         if not text: return
         
@@ -342,6 +377,7 @@ class AppController(QObject):
             if getattr(self, '_is_asr_triggered_translation', False):
                 self._is_asr_triggered_translation = False
                 self.sys_handler.paste_text(text, should_send=False)
+                self.sig_commit_translation.emit(self._last_translation_source)
         # elif self.app_mode == "asr_jp":
         #    self.asr_jp_window.update_segment(text)
         #    self.handle_send_request(text)
@@ -393,6 +429,8 @@ class AppController(QObject):
             if self._is_translating:
                 print("[Main] 正在翻译中，忽略发送请求")
                 return
+            if getattr(self, '_last_translation_source', None):
+                self.sig_commit_translation.emit(self._last_translation_source)
             # 中日双显模式特有逻辑
             # 只清空中文输入，保留日文显示
             if hasattr(self.window, "clear_input"):
@@ -683,6 +721,8 @@ class AppController(QObject):
         return None
 
     def restart_app(self):
+        # execl 不会触发 aboutToQuit，先写入延迟保存的配置并压缩学习规则日志
+        self.m_cfg.flush()
         os.execl(sys.executable, sys.executable, *sys.argv)
 
     def on_recording_state_changed(self):
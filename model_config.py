@@ -9,9 +9,13 @@ import os
 import sys
 import zipfile
 import json
+import time
+import threading
 from dataclasses import dataclass
 from enum import Enum
-from typing import Optional, Dict, List
+from typing import Any, Callable, Optional, Dict, List
+
+from learned_rules_store import LearnedRulesStore
 
 
 class ASREngineType(Enum):
@@ -39,6 +43,33 @@ class TranslatorEngineType(Enum):
     GOOGLE = "online"                   # Google 在线翻译
 
 
+class TranslationProfile(Enum):
+    """本地翻译的延迟/质量档位"""
+    FAST = "fast"
+    BALANCED = "balanced"
+    QUALITY = "quality"
+    ADAPTIVE = "adaptive"   # 流式预览用 fast，最终结果用 quality
+
+
+@dataclass(frozen=True)
+class DecodingProfile:
+    """CTranslate2 解码参数"""
+    beam_size: int
+    length_penalty: float   # 束搜索按 长度^length_penalty 归一化得分，越大越偏向长译文 (贪心解码时不起作用)
+    max_length_ratio: float # 最大解码长度 = 原文 token 数 × 比例 + max_length_extra (上限 256)
+    max_length_extra: int
+    intra_threads: int      # 单次解码使用的线程数，0 表示由 CTranslate2 自动决定
+    inter_threads: int      # 可并行处理的批次数
+
+
+DECODING_PROFILES = {
+    TranslationProfile.FAST.value: DecodingProfile(1, 1.0, 1.5, 8, 4, 1),
+    # 束越宽越容易选出过短的译文 (句尾被截断)，相应加大长度惩罚的指数来抵消
+    TranslationProfile.BALANCED.value: DecodingProfile(2, 1.1, 2.0, 16, 4, 1),
+    TranslationProfile.QUALITY.value: DecodingProfile(4, 1.2, 3.0, 32, 0, 1),
+}
+
+
 @dataclass
 class ModelInfo:
     """模型信息数据类"""
@@ -171,6 +202,9 @@ class ModelConfig:
         self.BUNDLED_MODELS_DIR = get_bundled_models_dir()
         self.MODELS_DIR = os.path.join(self.DATA_DIR, "models")
         self.CONFIG_PATH = os.path.join(self.DATA_DIR, "config.json")
+        self.learned_rules_path = os.path.join(self.DATA_DIR, "learned_rules.json")
+        self.custom_vocab_path = os.path.join(self.DATA_DIR, "custom_vocab.json") # 识别纠错词典 {"错误": "正确"}
+        self.translation_cache_path = os.path.join(self.DATA_DIR, "translation_cache.db")
         self.PROMPTS_PATH = get_prompts_path()
         
         # 确保目录存在
@@ -226,7 +260,55 @@ class ModelConfig:
         self._window_y = -1
         self._language = "zh" # [New] Language support
         self._custom_idle_texts = [] # [New] User custom idle texts
+        self._audio_ring_buffer = True # [Perf] 预分配缓冲区采集
+        self._audio_buffer_seconds = 30 # 缓冲区初始容量 (秒)，超出后自动扩容
+        self._audio_warm_stream = False # [Perf] 常驻输入流 + 预录缓冲
+        self._audio_preroll_ms = 300
+        self._audio_warm_idle_sec = 60 # 空闲多久后释放录音设备
+        self._vad_enabled = True # [Perf] 裁剪首尾静音，无语音时跳过识别
+        self._vad_min_rms = 0.005 # 语音能量下限 (归一化 RMS)
+        self._vad_pad_ms = 200 # 语音段前后保留的缓冲
+        self._asr_incremental = True # [Perf] 按住期间按停顿分段识别
+        self._asr_segment_pause_ms = 500 # 触发切段的停顿时长
+        self._asr_segment_min_sec = 2.0 # 每段最短时长，短句不切分
+        self._asr_live_partial = True # 录音期间实时显示识别预览
+        self._asr_partial_interval_ms = 300 # 预览最小刷新间隔
+        self._asr_partial_load_factor = 2.0 # 预览间隔 >= 解码耗时 * 该系数
+        self._asr_chunk_threshold_sec = 30 # [Perf] 超过该时长的录音分块并行解码
+        self._asr_chunk_sec = 15 # 目标分块长度
+        self._asr_chunk_overlap_sec = 0.5 # 相邻分块重叠
+        self._asr_pool_size = 0 # [Perf] 识别器池大小，0 表示按 CPU 核数自动决定
+        self._asr_stale_policy = "keep_finals" # keep_finals: 只丢弃过期预览; latest_only: 新语句取消旧语句未开始的任务
+        self._asr_warmup_seconds = [1, 5, 15] # [Perf] 模型就绪前的预热音频长度，空列表关闭预热
+        self._translation_cache_enabled = True # [Perf] 翻译结果两级缓存 (内存 LRU + SQLite)
+        self._translation_cache_memory_entries = 512 # 内存缓存条数
+        self._translation_cache_disk_mb = 16 # 磁盘缓存上限 (MB)，0 表示只用内存缓存
+        self._http_pool_size = 8 # [Perf] 共享 HTTP 连接池大小
+        self._http_connect_timeout_sec = 3.0
+        self._http_read_timeout_sec = 5.0 # 翻译与更新检查的读取超时 (大文件下载单独放宽)
+        self._translator_max_batch_size = 16 # [Perf] 本地翻译批处理：子批次最大片段数
+        self._translator_split_sentences = False # 本地翻译时把长行切成句子一起批量翻译
+        self._translator_incremental = True # [Perf] 多句输入逐句记忆翻译结果，只重新翻译改动过的句子
+        self._translator_streaming = True # [Perf] 本地翻译时先逐 token 贪心解码显示预览，再用完整束搜索结果替换
+        self._translator_profile = "adaptive" # 本地翻译解码档位: fast / balanced / quality / adaptive (预览贪心，最终结果宽束搜索)
+        self._translator_hedging = True # [Perf] 本地模型可用时先发在线请求，超过在线 p95 仍未返回就同时启动本地翻译，取先完成的结果
+        self._translator_workers = 2 # [Perf] 并发执行翻译的工作线程数
+        self._translator_queue_size = 4 # 待处理翻译请求队列上限，满时挤掉最旧的 (已被取代的) 请求
         self.data = {}
+        # 按键订阅的变更通知：key -> [callback(new_value)]，供缓存配置快照的模块按需刷新
+        self._subscribers: Dict[str, List[Callable[[Any], None]]] = {}
+        self._published = {} # 上次通知时各键的值
+        # 延迟写盘：save_config 只标记脏数据，后台线程合并窗口内的多次保存后写一次
+        self._save_cond = threading.Condition()
+        self._save_pending = None   # (版本号, 待写入的数据)
+        self._save_deadline = None
+        self._save_thread = None
+        self._save_version = 0
+        self._write_lock = threading.Lock()
+        self._written_version = 0
+        self._rule_listeners = [] # 学习到新的句号规则时的回调 (kind, word)
+        self.learned_no_period_words = {}
+        self.learned_force_period_words = {}
         
         # ===== 日志和初始化 =====
         self._log_paths()
@@ -242,6 +324,7 @@ class ModelConfig:
             
         self._scan_models()
         self.personality = PersonalityManager(self.PROMPTS_PATH)
+        self._published = self._to_dict()
     
     def _log_paths(self):
         """记录路径调试信息"""
@@ -291,15 +374,59 @@ class ModelConfig:
                     self._window_y = self.data.get('window_y', -1)
                     self._language = self.data.get('language', 'zh') # [New] Load language
                     self._custom_idle_texts = self.data.get('custom_idle_texts', []) # [New] Load custom idle texts
+                    self._audio_ring_buffer = self.data.get('audio_ring_buffer', self._audio_ring_buffer)
+                    self._audio_buffer_seconds = self.data.get('audio_buffer_seconds', self._audio_buffer_seconds)
+                    self._audio_warm_stream = self.data.get('audio_warm_stream', self._audio_warm_stream)
+                    self._audio_preroll_ms = self.data.get('audio_preroll_ms', self._audio_preroll_ms)
+                    self._audio_warm_idle_sec = self.data.get('audio_warm_idle_sec', self._audio_warm_idle_sec)
+                    self._vad_enabled = self.data.get('vad_enabled', self._vad_enabled)
+                    self._vad_min_rms = self.data.get('vad_min_rms', self._vad_min_rms)
+                    self._vad_pad_ms = self.data.get('vad_pad_ms', self._vad_pad_ms)
+                    self._asr_incremental = self.data.get('asr_incremental', self._asr_incremental)
+                    self._asr_segment_pause_ms = self.data.get('asr_segment_pause_ms', self._asr_segment_pause_ms)
+                    self._asr_segment_min_sec = self.data.get('asr_segment_min_sec', self._asr_segment_min_sec)
+                    self._asr_live_partial = self.data.get('asr_live_partial', self._asr_live_partial)
+                    self._asr_partial_interval_ms = self.data.get('asr_partial_interval_ms', self._asr_partial_interval_ms)
+                    self._asr_partial_load_factor = self.data.get('asr_partial_load_factor', self._asr_partial_load_factor)
+                    self._asr_chunk_threshold_sec = self.data.get('asr_chunk_threshold_sec', self._asr_chunk_threshold_sec)
+                    self._asr_chunk_sec = self.data.get('asr_chunk_sec', self._asr_chunk_sec)
+                    self._asr_chunk_overlap_sec = self.data.get('asr_chunk_overlap_sec', self._asr_chunk_overlap_sec)
+                    self._asr_pool_size = self.data.get('asr_pool_size', self._asr_pool_size)
+                    self._asr_stale_policy = self.data.get('asr_stale_policy', self._asr_stale_policy)
+                    self._asr_warmup_seconds = self.data.get('asr_warmup_seconds', self._asr_warmup_seconds)
+                    self._translation_cache_enabled = self.data.get('translation_cache_enabled', self._translation_cache_enabled)
+                    self._translation_cache_memory_entries = self.data.get('translation_cache_memory_entries', self._translation_cache_memory_entries)
+                    self._translation_cache_disk_mb = self.data.get('translation_cache_disk_mb', self._translation_cache_disk_mb)
+                    self._http_pool_size = self.data.get('http_pool_size', self._http_pool_size)
+                    self._http_connect_timeout_sec = self.data.get('http_connect_timeout_sec', self._http_connect_timeout_sec)
+                    self._http_read_timeout_sec = self.data.get('http_read_timeout_sec', self._http_read_timeout_sec)
+                    self._translator_max_batch_size = self.data.get('translator_max_batch_size', self._translator_max_batch_size)
+                    self._translator_split_sentences = self.data.get('translator_split_sentences', self._translator_split_sentences)
+                    self._translator_incremental = self.data.get('translator_incremental', self._translator_incremental)
+                    self._translator_streaming = self.data.get('translator_streaming', self._translator_streaming)
+                    self._translator_profile = self.data.get('translator_profile', self._translator_profile)
+                    self._translator_hedging = self.data.get('translator_hedging', self._translator_hedging)
+                    self._translator_workers = self.data.get('translator_workers', self._translator_workers)
+                    self._translator_queue_size = self.data.get('translator_queue_size', self._translator_queue_size)
         except Exception as e:
             pass
         
-        # [Removed] 学习规则逻辑已废弃
-        self.learned_no_period_words = {} 
-        self.learned_force_period_words = {}
+        self._load_learned_rules()
+
+    def _load_learned_rules(self):
+        """读取学习到的句号规则 (快照 + 日志重放，只在启动时读取一次，之后增量更新)"""
+        self._rules_store = LearnedRulesStore(self.learned_rules_path)
+        self.learned_no_period_words = self._rules_store.no_period
+        self.learned_force_period_words = self._rules_store.force_period
 
     def save_config(self):
-        """保存当前配置到文件"""
+        """保存当前配置到文件 (延迟合并写盘)，并通知值发生变化的键的订阅者"""
+        data = self._to_dict()
+        self._schedule_write(data)
+        self._publish_changes(data)
+
+    def _to_dict(self) -> dict:
+        """当前配置的可序列化快照"""
         data = {
             "app_mode": self._app_mode,
             "window_scale": self._window_scale,
@@ -328,72 +455,183 @@ class ModelConfig:
         if hasattr(self, "_window_x"): data["window_x"] = self._window_x
         if hasattr(self, "_window_y"): data["window_y"] = self._window_y
         data["language"] = self._language # [New] Save language
-        data["custom_idle_texts"] = self._custom_idle_texts # [New] Save custom idle texts
-
+        data["custom_idle_texts"] = list(self._custom_idle_texts) # [New] Save custom idle texts
+        data["audio_ring_buffer"] = self._audio_ring_buffer
+        data["audio_buffer_seconds"] = self._audio_buffer_seconds
+        data["audio_warm_stream"] = self._audio_warm_stream
+        data["audio_preroll_ms"] = self._audio_preroll_ms
+        data["audio_warm_idle_sec"] = self._audio_warm_idle_sec
+        data["vad_enabled"] = self._vad_enabled
+        data["vad_min_rms"] = self._vad_min_rms
+        data["vad_pad_ms"] = self._vad_pad_ms
+        data["asr_incremental"] = self._asr_incremental
+        data["asr_segment_pause_ms"] = self._asr_segment_pause_ms
+        data["asr_segment_min_sec"] = self._asr_segment_min_sec
+        data["asr_live_partial"] = self._asr_live_partial
+        data["asr_partial_interval_ms"] = self._asr_partial_interval_ms
+        data["asr_partial_load_factor"] = self._asr_partial_load_factor
+        data["asr_chunk_threshold_sec"] = self._asr_chunk_threshold_sec
+        data["asr_chunk_sec"] = self._asr_chunk_sec
+        data["asr_chunk_overlap_sec"] = self._asr_chunk_overlap_sec
+        data["asr_pool_size"] = self._asr_pool_size
+        data["asr_stale_policy"] = self._asr_stale_policy
+        data["asr_warmup_seconds"] = list(self._asr_warmup_seconds)
+        data["translation_cache_enabled"] = self._translation_cache_enabled
+        data["translation_cache_memory_entries"] = self._translation_cache_memory_entries
+        data["translation_cache_disk_mb"] = self._translation_cache_disk_mb
+        data["http_pool_size"] = self._http_pool_size
+        data["http_connect_timeout_sec"] = self._http_connect_timeout_sec
+        data["http_read_timeout_sec"] = self._http_read_timeout_sec
+        data["translator_max_batch_size"] = self._translator_max_batch_size
+        data["translator_split_sentences"] = self._translator_split_sentences
+        data["translator_incremental"] = self._translator_incremental
+        data["translator_streaming"] = self._translator_streaming
+        data["translator_profile"] = self._translator_profile
+        data["translator_hedging"] = self._translator_hedging
+        data["translator_workers"] = self._translator_workers
+        data["translator_queue_size"] = self._translator_queue_size
+        return data
+
+    SAVE_DELAY_SEC = 0.5 # 合并窗口：窗口内的多次保存只写一次文件
+
+    def _schedule_write(self, data: dict):
+        """标记脏数据并唤醒写盘线程 (GUI 线程上只做一次字典构建)"""
+        with self._save_cond:
+            self._save_version += 1
+            self._save_pending = (self._save_version, data)
+            if self._save_deadline is None:
+                self._save_deadline = time.monotonic() + self.SAVE_DELAY_SEC
+            if self._save_thread is None or not self._save_thread.is_alive():
+                self._save_thread = threading.Thread(target=self._save_loop, daemon=True)
+                self._save_thread.start()
+            self._save_cond.notify()
+
+    def _save_loop(self):
+        while True:
+            with self._save_cond:
+                while self._save_pending is None:
+                    self._save_cond.wait()
+                while self._save_deadline is not None:
+                    remaining = self._save_deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._save_cond.wait(remaining)
+                pending = self._save_pending
+                if pending is None:
+                    continue # 等待合并窗口期间已被 flush_config 写出
+                self._save_pending = None
+                self._save_deadline = None
+                # 取出数据的同时占住写锁，flush_config 据此等待正在进行的写入
+                self._write_lock.acquire()
+            try:
+                self._write_config(*pending)
+            except Exception as e:
+                print(f"[ModelConfig] Save error: {e}") # 写盘线程不能因单次失败退出，否则之后的保存都不会落盘
+            finally:
+                self._write_lock.release()
+
+    def _write_config(self, version: int, data: dict):
+        """写临时文件后 os.replace，写到一半崩溃也不会留下损坏的 config.json (调用方持有写锁)"""
+        if version <= self._written_version:
+            return # 已有更新的版本落盘
+        tmp_path = self.CONFIG_PATH + ".tmp"
         try:
-            with open(self.CONFIG_PATH, "w", encoding="utf-8") as f:
+            with open(tmp_path, "w", encoding="utf-8") as f:
                 json.dump(data, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_path, self.CONFIG_PATH)
+            self._written_version = version
         except Exception as e:
             try:
                 log_path = os.path.join(self.DATA_DIR, "error.log")
                 with open(log_path, "a", encoding="utf-8") as f:
                     f.write(f"[save_config] {e}\n")
             except: pass
-            
+
+    def flush_config(self):
+        """立即写入尚未落盘的配置，并等待后台线程正在进行的写入完成"""
+        with self._save_cond:
+            pending = self._save_pending
+            self._save_pending = None
+            self._save_deadline = None
+        with self._write_lock:
+            if pending:
+                self._write_config(*pending)
+
+    # ===== 变更订阅 =====
+    def subscribe(self, key: str, callback: Callable[[Any], None], fire_now: bool = False):
+        """
+        订阅单个配置项 (key 与 config.json 中的键名一致)
+        该项的值发生变化时以新值调用 callback(value)，在修改配置的线程上同步执行
+        fire_now: 订阅时立即以当前值调用一次，便于初始化快照
+        """
+        if key not in self._published:
+            raise KeyError(f"Unknown config key: {key}")
+        callbacks = self._subscribers.setdefault(key, [])
+        if callback not in callbacks:
+            callbacks.append(callback)
+        if fire_now:
+            callback(self._published[key])
+
+    def unsubscribe(self, key: str, callback: Callable[[Any], None]):
+        callbacks = self._subscribers.get(key)
+        if callbacks and callback in callbacks:
+            callbacks.remove(callback)
+
+    def _publish_changes(self, data: dict):
+        # 所有 setter 都经由 save_config，在此统一比较新旧值
+        previous, self._published = self._published, data
+        for key, value in data.items():
+            if key in previous and previous[key] == value:
+                continue
+            for callback in list(self._subscribers.get(key, ())):
+                try:
+                    callback(value)
+                except Exception as e:
+                    print(f"[ModelConfig] Subscriber error ({key}): {e}")
+
+    def add_rule_listener(self, callback):
+        """注册学习规则回调 callback(kind, word)，kind 为 "no_period" 或 "force_period" """
+        if callback not in self._rule_listeners:
+            self._rule_listeners.append(callback)
+
+    def remove_rule_listener(self, callback):
+        if callback in self._rule_listeners:
+            self._rule_listeners.remove(callback)
+
+    def _notify_rule_learned(self, kind: str, word: str):
+        for callback in list(self._rule_listeners):
+            try:
+                callback(kind, word)
+            except Exception as e:
+                print(f"[Learning] Rule listener error: {e}")
+
     def learn_no_period_rule(self, word: str):
         """
         学习不加句号的规则
         当检测到用户删除了某个词后面的句号时调用
         """
         if not word: return
-        count = self.learned_no_period_words.get(word, 0) + 1
-        self.learned_no_period_words[word] = count
-        
-        # 立即保存
-        self.save_learned_rules()
+        # 只追加一行日志，快照由后台压缩
+        self._rules_store.record("no_period", word)
+        self._notify_rule_learned("no_period", word)
             
     def learn_force_period_rule(self, word: str):
         """
         学习强制加句号的规则
-        当检测到用户手动补充了句号时调用
+        当检测到用户手动补充了句号时调用 (同时从"不加句号"名单移除)
         """
         if not word: return
-        # 如果之前在"不加句号"的名单里，先移除
-        if word in self.learned_no_period_words:
-            del self.learned_no_period_words[word]
-            
-        count = self.learned_force_period_words.get(word, 0) + 1
-        self.learned_force_period_words[word] = count
-        
-        self.save_learned_rules()
+        self._rules_store.record("force_period", word)
+        self._notify_rule_learned("force_period", word)
 
     def save_learned_rules(self):
-        try:
-            data = {
-                "no_period": self.learned_no_period_words,
-                "force_period": self.learned_force_period_words
-            }
-            with open(self.learned_rules_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-            print(f"[Learning] Rules saved.")
-        except Exception as e:
-            print(f"[Learning] Save error: {e}")
-            
-    def get_learned_markers_regex(self) -> str:
-        """获取所有学习到的（达到阈值的）不加句号的词，组合成正则"""
-        threshold = 1 
-        words = [w for w, c in self.learned_no_period_words.items() if c >= threshold]
-        if not words: return ""
-        escaped_words = [re.escape(w) for w in words]
-        return "|".join(escaped_words)
-
-    def get_learned_force_period_regex(self) -> str:
-        """获取所有学习到的（达到阈值的）强制加句号的词，组合成正则"""
-        threshold = 1
-        words = [w for w, c in self.learned_force_period_words.items() if c >= threshold]
-        if not words: return ""
-        escaped_words = [re.escape(w) for w in words]
-        return "|".join(escaped_words)
+        """立即把日志压缩进快照文件"""
+        self._rules_store.compact()
+
+    def flush(self):
+        """退出前调用：落盘所有尚未写入的数据"""
+        self.flush_config()
+        self._rules_store.close()
 
     @property
     def emoji_mode(self) -> str: 
@@ -669,6 +907,330 @@ class ModelConfig:
             self._custom_idle_texts = value
             self.save_config()
 
+    @property
+    def audio_ring_buffer(self) -> bool:
+        return bool(self._audio_ring_buffer)
+
+    @audio_ring_buffer.setter
+    def audio_ring_buffer(self, value: bool):
+        self._audio_ring_buffer = bool(value)
+        self.save_config()
+
+    @property
+    def audio_buffer_seconds(self) -> float:
+        return max(1.0, float(self._audio_buffer_seconds))
+
+    @audio_buffer_seconds.setter
+    def audio_buffer_seconds(self, value: float):
+        self._audio_buffer_seconds = max(1.0, float(value))
+        self.save_config()
+
+    @property
+    def audio_warm_stream(self) -> bool:
+        return bool(self._audio_warm_stream)
+
+    @audio_warm_stream.setter
+    def audio_warm_stream(self, value: bool):
+        self._audio_warm_stream = bool(value)
+        self.save_config()
+
+    @property
+    def audio_preroll_ms(self) -> int:
+        return max(0, int(self._audio_preroll_ms))
+
+    @audio_preroll_ms.setter
+    def audio_preroll_ms(self, value: int):
+        self._audio_preroll_ms = max(0, int(value))
+        self.save_config()
+
+    @property
+    def audio_warm_idle_sec(self) -> float:
+        return max(1.0, float(self._audio_warm_idle_sec))
+
+    @audio_warm_idle_sec.setter
+    def audio_warm_idle_sec(self, value: float):
+        self._audio_warm_idle_sec = max(1.0, float(value))
+        self.save_config()
+
+    @property
+    def vad_enabled(self) -> bool:
+        return bool(self._vad_enabled)
+
+    @vad_enabled.setter
+    def vad_enabled(self, value: bool):
+        self._vad_enabled = bool(value)
+        self.save_config()
+
+    @property
+    def vad_min_rms(self) -> float:
+        return max(0.0, float(self._vad_min_rms))
+
+    @vad_min_rms.setter
+    def vad_min_rms(self, value: float):
+        self._vad_min_rms = max(0.0, float(value))
+        self.save_config()
+
+    @property
+    def vad_pad_ms(self) -> int:
+        return max(0, int(self._vad_pad_ms))
+
+    @vad_pad_ms.setter
+    def vad_pad_ms(self, value: int):
+        self._vad_pad_ms = max(0, int(value))
+        self.save_config()
+
+    @property
+    def asr_incremental(self) -> bool:
+        return bool(self._asr_incremental)
+
+    @asr_incremental.setter
+    def asr_incremental(self, value: bool):
+        self._asr_incremental = bool(value)
+        self.save_config()
+
+    @property
+    def asr_segment_pause_ms(self) -> int:
+        return max(100, int(self._asr_segment_pause_ms))
+
+    @asr_segment_pause_ms.setter
+    def asr_segment_pause_ms(self, value: int):
+        self._asr_segment_pause_ms = max(100, int(value))
+        self.save_config()
+
+    @property
+    def asr_segment_min_sec(self) -> float:
+        return max(0.5, float(self._asr_segment_min_sec))
+
+    @asr_segment_min_sec.setter
+    def asr_segment_min_sec(self, value: float):
+        self._asr_segment_min_sec = max(0.5, float(value))
+        self.save_config()
+
+    @property
+    def asr_live_partial(self) -> bool:
+        return bool(self._asr_live_partial)
+
+    @asr_live_partial.setter
+    def asr_live_partial(self, value: bool):
+        self._asr_live_partial = bool(value)
+        self.save_config()
+
+    @property
+    def asr_partial_interval_ms(self) -> int:
+        return max(100, int(self._asr_partial_interval_ms))
+
+    @asr_partial_interval_ms.setter
+    def asr_partial_interval_ms(self, value: int):
+        self._asr_partial_interval_ms = max(100, int(value))
+        self.save_config()
+
+    @property
+    def asr_partial_load_factor(self) -> float:
+        return max(1.0, float(self._asr_partial_load_factor))
+
+    @asr_partial_load_factor.setter
+    def asr_partial_load_factor(self, value: float):
+        self._asr_partial_load_factor = max(1.0, float(value))
+        self.save_config()
+
+    @property
+    def asr_chunk_threshold_sec(self) -> float:
+        return max(5.0, float(self._asr_chunk_threshold_sec))
+
+    @asr_chunk_threshold_sec.setter
+    def asr_chunk_threshold_sec(self, value: float):
+        self._asr_chunk_threshold_sec = max(5.0, float(value))
+        self.save_config()
+
+    @property
+    def asr_chunk_sec(self) -> float:
+        return max(3.0, float(self._asr_chunk_sec))
+
+    @asr_chunk_sec.setter
+    def asr_chunk_sec(self, value: float):
+        self._asr_chunk_sec = max(3.0, float(value))
+        self.save_config()
+
+    @property
+    def asr_chunk_overlap_sec(self) -> float:
+        return max(0.0, float(self._asr_chunk_overlap_sec))
+
+    @asr_chunk_overlap_sec.setter
+    def asr_chunk_overlap_sec(self, value: float):
+        self._asr_chunk_overlap_sec = max(0.0, float(value))
+        self.save_config()
+
+    @property
+    def asr_pool_size(self) -> int:
+        return max(0, int(self._asr_pool_size))
+
+    @asr_pool_size.setter
+    def asr_pool_size(self, value: int):
+        self._asr_pool_size = max(0, int(value))
+        self.save_config()
+
+    @property
+    def asr_stale_policy(self) -> str:
+        return self._asr_stale_policy if self._asr_stale_policy in ("keep_finals", "latest_only") else "keep_finals"
+
+    @asr_stale_policy.setter
+    def asr_stale_policy(self, value: str):
+        if value in ("keep_finals", "latest_only"):
+            self._asr_stale_policy = value
+            self.save_config()
+
+    @property
+    def asr_warmup_seconds(self) -> List[float]:
+        try:
+            return [float(x) for x in self._asr_warmup_seconds if float(x) > 0]
+        except (TypeError, ValueError):
+            return []
+
+    @asr_warmup_seconds.setter
+    def asr_warmup_seconds(self, value: List[float]):
+        if isinstance(value, list):
+            self._asr_warmup_seconds = value
+            self.save_config()
+
+    @property
+    def translation_cache_enabled(self) -> bool:
+        return bool(self._translation_cache_enabled)
+
+    @translation_cache_enabled.setter
+    def translation_cache_enabled(self, value: bool):
+        self._translation_cache_enabled = bool(value)
+        self.save_config()
+
+    @property
+    def translation_cache_memory_entries(self) -> int:
+        return max(0, int(self._translation_cache_memory_entries))
+
+    @translation_cache_memory_entries.setter
+    def translation_cache_memory_entries(self, value: int):
+        self._translation_cache_memory_entries = max(0, int(value))
+        self.save_config()
+
+    @property
+    def translation_cache_disk_mb(self) -> float:
+        return max(0.0, float(self._translation_cache_disk_mb))
+
+    @translation_cache_disk_mb.setter
+    def translation_cache_disk_mb(self, value: float):
+        self._translation_cache_disk_mb = max(0.0, float(value))
+        self.save_config()
+
+    @property
+    def http_pool_size(self) -> int:
+        return max(1, int(self._http_pool_size))
+
+    @http_pool_size.setter
+    def http_pool_size(self, value: int):
+        self._http_pool_size = max(1, int(value))
+        self.save_config()
+
+    @property
+    def http_connect_timeout_sec(self) -> float:
+        return max(0.5, float(self._http_connect_timeout_sec))
+
+    @http_connect_timeout_sec.setter
+    def http_connect_timeout_sec(self, value: float):
+        self._http_connect_timeout_sec = max(0.5, float(value))
+        self.save_config()
+
+    @property
+    def http_read_timeout_sec(self) -> float:
+        return max(1.0, float(self._http_read_timeout_sec))
+
+    @http_read_timeout_sec.setter
+    def http_read_timeout_sec(self, value: float):
+        self._http_read_timeout_sec = max(1.0, float(value))
+        self.save_config()
+
+    @property
+    def translator_max_batch_size(self) -> int:
+        return max(1, int(self._translator_max_batch_size))
+
+    @translator_max_batch_size.setter
+    def translator_max_batch_size(self, value: int):
+        self._translator_max_batch_size = max(1, int(value))
+        self.save_config()
+
+    @property
+    def translator_split_sentences(self) -> bool:
+        return bool(self._translator_split_sentences)
+
+    @translator_split_sentences.setter
+    def translator_split_sentences(self, value: bool):
+        self._translator_split_sentences = bool(value)
+        self.save_config()
+
+    @property
+    def translator_incremental(self) -> bool:
+        return bool(self._translator_incremental)
+
+    @translator_incremental.setter
+    def translator_incremental(self, value: bool):
+        self._translator_incremental = bool(value)
+        self.save_config()
+
+    @property
+    def translator_streaming(self) -> bool:
+        return bool(self._translator_streaming)
+
+    @translator_streaming.setter
+    def translator_streaming(self, value: bool):
+        self._translator_streaming = bool(value)
+        self.save_config()
+
+    @property
+    def translator_profile(self) -> str:
+        return self._translator_profile
+
+    @translator_profile.setter
+    def translator_profile(self, value: str):
+        if value in [p.value for p in TranslationProfile]:
+            self._translator_profile = value
+            self.save_config()
+
+    def get_decoding_profile(self, final: bool = True) -> "DecodingProfile":
+        """
+        返回本次解码使用的参数
+        adaptive: 流式预览 (final=False) 用贪心解码，最终结果 (无论长短) 用 quality 的宽束搜索
+        """
+        profile = self._translator_profile
+        if profile == TranslationProfile.ADAPTIVE.value:
+            if not final:
+                return DECODING_PROFILES[TranslationProfile.FAST.value]
+            return DECODING_PROFILES[TranslationProfile.QUALITY.value]
+        return DECODING_PROFILES.get(profile, DECODING_PROFILES[TranslationProfile.BALANCED.value])
+
+    @property
+    def translator_hedging(self) -> bool:
+        return bool(self._translator_hedging)
+
+    @translator_hedging.setter
+    def translator_hedging(self, value: bool):
+        self._translator_hedging = bool(value)
+        self.save_config()
+
+    @property
+    def translator_workers(self) -> int:
+        return max(1, min(4, int(self._translator_workers)))
+
+    @translator_workers.setter
+    def translator_workers(self, value: int):
+        self._translator_workers = max(1, min(4, int(value)))
+        self.save_config()
+
+    @property
+    def translator_queue_size(self) -> int:
+        return max(1, int(self._translator_queue_size))
+
+    @translator_queue_size.setter
+    def translator_queue_size(self, value: int):
+        self._translator_queue_size = max(1, int(value))
+        self.save_config()
+
 
 # ===== 全局单例 =====
 _model_config_instance: Optional[ModelConfig] = None
@@ -4,7 +4,6 @@
 """
 import os
 import json
-import requests
 import threading
 import zipfile
 import tarfile
@@ -13,6 +12,8 @@ from typing import Callable, Optional, Dict, List
 from dataclasses import dataclass
 from enum import Enum
 
+from http_client import get_http_client
+
 
 class DownloadStatus(Enum):
     PENDING = "pending"
@@ -246,10 +247,12 @@ class ModelDownloader:
             try:
                 print(f"[Downloader] 下载Tokenizer: {url}")
                 # 使用简单的requests下载，不需要进度条
-                resp = requests.get(url, timeout=30, stream=True)
+                client = get_http_client()
+                resp = client.get(url, timeout=(client.connect_timeout, 30), stream=True)
                 resp.raise_for_status()
                 
-                with open(tokenizer_path, "wb") as f:
+                # 用完后关闭响应，连接归还连接池
+                with resp, open(tokenizer_path, "wb") as f:
                     for chunk in resp.iter_content(chunk_size=8192):
                         f.write(chunk)
                 
@@ -284,7 +287,9 @@ class ModelDownloader:
         
         try:
             # 发起请求
-            response = requests.get(url, stream=True, timeout=(10, 60), headers=headers, allow_redirects=True)
+            # 大文件下载：连接超时取配置，两次数据块之间允许等待更久
+            client = get_http_client()
+            response = client.get(url, stream=True, timeout=(client.connect_timeout, 60), headers=headers, allow_redirects=True)
             response.raise_for_status()
             
             total_size = int(response.headers.get('content-length', 0))
@@ -296,7 +301,7 @@ class ModelDownloader:
             start_time = time.time()
             last_report_time = 0
             
-            with open(temp_path, 'wb') as f:
+            with response, open(temp_path, 'wb') as f:
                 for chunk in response.iter_content(chunk_size=32768): # 32KB buffer
                     if self._cancel_flag.is_set():
                         return False
@@ -0,0 +1,67 @@
+"""
+长录音分块测试：低能量处的切分点选择，以及相邻分块识别结果的去重拼接
+"""
+import numpy as np
+
+from audio_vad import find_split_points
+from text_postprocess import merge_overlap_text
+
+RATE = 16000
+
+
+def _speech_with_pauses(total_sec, pauses):
+    """全程为响亮信号，pauses 中的每个 (起点秒, 时长秒) 为静音"""
+    t = np.arange(int(total_sec * RATE), dtype=np.float32) / RATE
+    audio = (0.3 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+    for start, length in pauses:
+        audio[int(start * RATE):int((start + length) * RATE)] = 0.0
+    return audio
+
+
+def test_split_points_land_in_pauses():
+    pauses = [(9.0, 0.3), (19.5, 0.3), (31.0, 0.3)]
+    audio = _speech_with_pauses(40, pauses)
+    points = find_split_points(audio, RATE, chunk_sec=10, search_sec=2.0)
+    assert len(points) == 3
+    assert points == sorted(points)
+    for point, (start, length) in zip(points, pauses):
+        assert start * RATE <= point <= (start + length) * RATE, (point, start)
+
+
+def test_split_points_spacing_and_edges():
+    # 没有停顿时也按 chunk_sec 左右均匀切开，切分点严格递增且不含 0 与结尾
+    rng = np.random.default_rng(0)
+    audio = (rng.standard_normal(60 * RATE) * 0.1).astype(np.float32)
+    points = find_split_points(audio, RATE, chunk_sec=15, search_sec=2.0)
+    assert 3 <= len(points) <= 4
+    gaps = np.diff([0] + points)
+    assert all(13 * RATE <= g <= 17 * RATE for g in gaps)
+    assert 0 < points[0] and points[-1] < len(audio)
+
+    # 短于一个分块或为空时不切分
+    assert find_split_points(audio[:5 * RATE], RATE, chunk_sec=15) == []
+    assert find_split_points(np.zeros(0, dtype=np.float32), RATE, chunk_sec=15) == []
+
+
+def test_merge_overlap_text():
+    # 重叠区域重复识别的文字只保留一次，前一块末尾的标点一并去掉
+    assert merge_overlap_text("今天天气很好。", "天气很好我们去公园") == "今天天气很好我们去公园"
+    assert merge_overlap_text("我们明天去", "，明天去北海道") == "我们明天去北海道"
+    # 取最长的重叠
+    assert merge_overlap_text("abab", "ababc") == "ababc"
+    # 少于 min_overlap 的巧合不算重叠
+    assert merge_overlap_text("你好", "好的") == "你好好的"
+    assert merge_overlap_text("", "第一块") == "第一块"
+    assert merge_overlap_text("最后一块", "") == "最后一块"
+    # 逐块累积拼接
+    text = ""
+    for part in ["我想去北海道", "北海道旅游然后", "然后去东京"]:
+        text = merge_overlap_text(text, part)
+    assert text == "我想去北海道旅游然后去东京"
+
+
+if __name__ == "__main__":
+    test_split_points_land_in_pauses()
+    test_split_points_spacing_and_edges()
+    test_merge_overlap_text()
+    print("Test PASSED")
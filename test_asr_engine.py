@@ -36,7 +36,8 @@ def test_asr():
     end_time = time.time()
     
     if success:
-        print(f"✅ 模型加载成功！耗时: {end_time - start_time:.2f}秒")
+        print(f"✅ 模型加载成功！耗时: {end_time - start_time:.2f}秒 "
+              f"(构建 {engine.load_ms:.0f}ms + 预热 {engine.warmup_ms:.0f}ms)")
         
         # 4. 模拟推理 (生成1秒的静音数据)
         print("正在进行推理测试 (1秒静音)...")
@@ -47,6 +48,16 @@ def test_asr():
         print(f"推理结果 (应为空或乱码): '{result}'")
         print("✅ 推理调用未崩溃")
         
+        # 5. 首句延迟 vs 稳态延迟 (预热生效时两者应接近)
+        noise = (np.random.default_rng(1).standard_normal(16000 * 5) * 0.01).astype(np.float32)
+        latencies = []
+        for _ in range(4):
+            t0 = time.time()
+            engine.transcribe(noise)
+            latencies.append((time.time() - t0) * 1000)
+        steady = sum(latencies[1:]) / len(latencies[1:])
+        print(f"5秒音频: 首次 {latencies[0]:.0f}ms, 稳态 {steady:.0f}ms")
+        
         engine.unload()
         print("引擎已卸载")
     else:
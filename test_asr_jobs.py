@@ -0,0 +1,104 @@
+"""
+有序任务队列测试：并发执行但按提交顺序交付、取消未开始的任务、识别器池借还
+"""
+import time
+import threading
+
+from asr_jobs import OrderedJobQueue, RecognizerPool
+
+
+def _wait(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.005)
+    return False
+
+
+def test_results_delivered_in_submit_order():
+    queue = OrderedJobQueue(max_workers=4)
+    delivered = []
+    # 先提交的任务耗时最长，完成顺序与提交顺序相反
+    for i in range(8):
+        delay = (8 - i) * 0.01
+        queue.submit(lambda i=i, d=delay: (time.sleep(d), i)[1], delivered.append)
+    assert _wait(lambda: len(delivered) == 8)
+    assert delivered == list(range(8))
+    queue.shutdown()
+
+
+def test_cancel_pending_jobs():
+    queue = OrderedJobQueue(max_workers=1)
+    gate = threading.Event()
+    delivered = []
+    ran = []
+
+    def job(i):
+        ran.append(i)
+        if i == 0:
+            gate.wait(2)
+        return i
+
+    seqs = [queue.submit(lambda i=i: job(i), delivered.append, kind="partial" if i % 2 else "segment",
+                         utterance=1 if i < 4 else 2) for i in range(6)]
+    assert _wait(lambda: ran == [0])
+
+    # 正在执行的任务不能取消；排队中的可以
+    assert queue.is_pending(seqs[0])
+    assert not queue.cancel(seqs[0])
+    assert queue.cancel(seqs[1])
+    assert not queue.is_pending(seqs[1])
+    assert queue.cancel_where(lambda j: j.kind == "partial") == 2 # 3 和 5
+    assert queue.cancel_where(lambda j: j.utterance == 1) == 1    # 2
+
+    gate.set()
+    assert _wait(lambda: len(delivered) == 2)
+    time.sleep(0.05)
+    # 被取消的任务不执行也不交付，后面的任务照常按序交付
+    assert ran == [0, 4]
+    assert delivered == [0, 4]
+    assert not any(queue.is_pending(s) for s in seqs)
+    queue.shutdown()
+
+
+def test_failed_job_does_not_block_delivery():
+    queue = OrderedJobQueue(max_workers=2)
+    delivered = []
+    queue.submit(lambda: 1 / 0, delivered.append)
+    queue.submit(lambda: "ok", delivered.append)
+    assert _wait(lambda: len(delivered) == 2)
+    assert delivered == [None, "ok"]
+    queue.shutdown()
+
+
+def test_recognizer_pool_lease():
+    pool = RecognizerPool(["r0", "r1"])
+    in_use = set()
+    peak = []
+    lock = threading.Lock()
+
+    def worker():
+        with pool.lease() as rec:
+            with lock:
+                assert rec not in in_use
+                in_use.add(rec)
+                peak.append(len(in_use))
+            time.sleep(0.02)
+            with lock:
+                in_use.discard(rec)
+
+    threads = [threading.Thread(target=worker) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(2)
+    assert max(peak) <= 2 and len(peak) == 6
+
+
+if __name__ == "__main__":
+    test_results_delivered_in_submit_order()
+    test_cancel_pending_jobs()
+    test_failed_job_does_not_block_delivery()
+    test_recognizer_pool_lease()
+    print("Test PASSED")
@@ -0,0 +1,92 @@
+"""
+录音缓冲区测试：int16 归一化写入、扩容、零拷贝交出、预录环形缓冲区回绕
+"""
+import numpy as np
+
+from audio_buffer import AudioCaptureBuffer, PrerollRing
+
+
+def _blocks(n_blocks, size, seed=0):
+    rng = np.random.default_rng(seed)
+    return [rng.integers(-32768, 32767, size, dtype=np.int16) for _ in range(n_blocks)]
+
+
+def test_capture_buffer_write_and_grow():
+    blocks = _blocks(10, 1024)
+    buf = AudioCaptureBuffer(capacity=1500) # 小于总长度，写入过程中多次扩容
+    for block in blocks:
+        buf.write(block)
+    expected = np.concatenate(blocks).astype(np.float32) / 32768.0
+    assert len(buf) == len(expected)
+    assert buf.view().dtype == np.float32
+    assert np.allclose(buf.view(), expected)
+    assert np.allclose(buf.tail(100), expected[-100:])
+    assert np.allclose(buf.tail(10 ** 6), expected)
+
+    buf.write_float(np.ones(5, dtype=np.float32))
+    assert np.all(buf.view()[-5:] == 1.0)
+
+    buf.reset()
+    assert len(buf) == 0 and len(buf.view()) == 0
+
+
+def test_capture_buffer_detach():
+    buf = AudioCaptureBuffer(capacity=4096)
+    block = _blocks(1, 2048)[0]
+    buf.write(block)
+    data = buf.detach()
+    assert len(buf) == 0
+
+    # 交出的视图不被下一次录音覆盖
+    before = data.copy()
+    buf.write(_blocks(1, 2048, seed=1)[0])
+    assert np.array_equal(data, before)
+    assert np.allclose(data, block / 32768.0)
+
+
+def test_preroll_ring_wraparound():
+    blocks = _blocks(7, 300, seed=2)
+    ring = PrerollRing(capacity=1000)
+    for block in blocks:
+        ring.write(block) # 2100 个样本，写指针回绕两次
+    capture = AudioCaptureBuffer(capacity=16)
+    ring.drain_into(capture)
+    expected = np.concatenate(blocks)[-1000:] / 32768.0
+    assert np.allclose(capture.view(), expected) # 按时间顺序，只保留最近 capacity 个样本
+
+    # 排空后为空，再次排空不写入任何数据
+    ring.drain_into(capture)
+    assert len(capture) == 1000
+
+
+def test_preroll_ring_partial_and_oversized():
+    ring = PrerollRing(capacity=1000)
+    block = _blocks(1, 400, seed=3)[0]
+    ring.write(block)
+    capture = AudioCaptureBuffer(capacity=16)
+    ring.drain_into(capture)
+    assert np.allclose(capture.view(), block / 32768.0) # 未写满时不带出零填充
+
+    # 单块超过容量：只保留最后 capacity 个样本
+    big = _blocks(1, 2500, seed=4)[0]
+    ring.write(big)
+    capture = AudioCaptureBuffer(capacity=16)
+    ring.drain_into(capture)
+    assert np.allclose(capture.view(), big[-1000:] / 32768.0)
+
+    # 恰好写到缓冲区末尾 (写指针归零) 的边界
+    ring.write(_blocks(1, 600, seed=5)[0])
+    tail = _blocks(1, 400, seed=6)[0]
+    ring.write(tail)
+    capture = AudioCaptureBuffer(capacity=16)
+    ring.drain_into(capture)
+    assert len(capture) == 1000
+    assert np.allclose(capture.view()[-400:], tail / 32768.0)
+
+
+if __name__ == "__main__":
+    test_capture_buffer_write_and_grow()
+    test_capture_buffer_detach()
+    test_preroll_ring_wraparound()
+    test_preroll_ring_partial_and_oversized()
+    print("Test PASSED")
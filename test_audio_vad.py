@@ -0,0 +1,81 @@
+"""
+VAD 测试：用合成信号 (底噪 + 正弦音) 检查语音区间、语音起点与分块输入的一致性
+"""
+import numpy as np
+
+from audio_vad import EnergyVAD
+
+RATE = 16000
+
+
+def _noise(sec, level=0.001, seed=0):
+    rng = np.random.default_rng(seed)
+    return (rng.standard_normal(int(RATE * sec)) * level).astype(np.float32)
+
+
+def _tone(sec, amp=0.3, freq=220.0):
+    t = np.arange(int(RATE * sec), dtype=np.float32) / RATE
+    return (amp * np.sin(2 * np.pi * freq * t)).astype(np.float32)
+
+
+def _signal():
+    """0.5s 静音 | 0.6s 语音 | 0.8s 静音 | 0.4s 语音 | 0.5s 静音"""
+    parts = [_noise(0.5, seed=1), _tone(0.6), _noise(0.8, seed=2), _tone(0.4), _noise(0.5, seed=3)]
+    return np.concatenate(parts)
+
+
+def test_speech_span_and_onsets():
+    audio = _signal()
+    vad = EnergyVAD(rate=RATE)
+    vad.process(audio)
+    assert vad.has_speech
+
+    frame = vad.frame_len
+    assert abs(vad.first_speech - int(0.5 * RATE)) <= frame
+    assert abs(vad.last_speech - int(2.3 * RATE)) <= frame
+    assert len(vad.onsets) == 2
+    assert abs(vad.onsets[1] - int(1.9 * RATE)) <= frame
+
+    start, end = vad.speech_span(len(audio))
+    assert start == vad.first_speech - vad.pad
+    assert end == vad.last_speech + vad.pad
+    assert vad.onset_after(vad.onsets[0] + 1) == vad.onsets[1]
+    assert vad.onset_after(len(audio)) == -1
+
+
+def test_chunked_input_matches_single_pass():
+    audio = _signal()
+    whole = EnergyVAD(rate=RATE)
+    whole.process(audio)
+
+    # 录音回调的块长与帧长不对齐，剩余样本应留到下一块
+    chunked = EnergyVAD(rate=RATE)
+    for i in range(0, len(audio), 1000):
+        chunked.process(audio[i:i + 1000])
+    assert chunked.processed == len(audio) // chunked.frame_len * chunked.frame_len
+    assert chunked.first_speech == whole.first_speech
+    assert chunked.last_speech == whole.last_speech
+    assert chunked.onsets == whole.onsets
+
+
+def test_silence_and_short_clicks():
+    vad = EnergyVAD(rate=RATE)
+    vad.process(_noise(2.0))
+    assert not vad.has_speech
+    assert vad.speech_span(2 * RATE) is None
+
+    # 短于 min_speech_ms 的咔哒声不算语音
+    vad = EnergyVAD(rate=RATE)
+    vad.process(np.concatenate([_noise(0.5), _tone(0.05), _noise(0.5)]))
+    assert not vad.has_speech
+
+    # 重置后状态清空
+    vad.reset()
+    assert vad.processed == 0 and vad.onsets == [] and vad.first_speech == -1
+
+
+if __name__ == "__main__":
+    test_speech_span_and_onsets()
+    test_chunked_input_matches_single_pass()
+    test_silence_and_short_clicks()
+    print("Test PASSED")
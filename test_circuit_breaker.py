@@ -0,0 +1,142 @@
+"""
+熔断器测试
+在本地启动一个可注入延迟与错误的假翻译服务：
+- 连续失败 / 超慢响应后熔断，熔断期间请求微秒级返回且不再访问服务
+- 服务恢复后由后台半开试探自动关闭熔断器，试探失败则退避时间翻倍
+"""
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from http_client import HttpClient
+from circuit_breaker import CircuitBreaker, CircuitOpenError, CLOSED, OPEN, HALF_OPEN
+
+
+class _FakeServer(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    mode = "ok"      # ok / error / slow
+    delay = 0.0
+    hits = 0
+
+    def do_GET(self):
+        _FakeServer.hits += 1
+        if _FakeServer.mode == "slow":
+            time.sleep(_FakeServer.delay)
+        if _FakeServer.mode == "error":
+            status, body = 503, b"unavailable"
+        else:
+            status, body = 200, b'[[["\\u3053\\u3093\\u306b\\u3061\\u306f", "\\u4f60\\u597d"]]]'
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def fake_server():
+    _FakeServer.mode, _FakeServer.delay, _FakeServer.hits = "ok", 0.0, 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeServer)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/translate_a/single"
+    server.shutdown()
+    server.server_close()
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_breaker_with_fake_server(fake_server):
+    client = HttpClient(pool_size=2, connect_timeout=1, read_timeout=1)
+
+    def request():
+        resp = client.get(fake_server, params={"q": "你好"})
+        resp.raise_for_status()
+        return resp.json()[0][0][0]
+
+    breaker = CircuitBreaker(probe=request, failure_threshold=3, slow_threshold_sec=0.2, open_sec=0.1)
+    assert breaker.call(request) == "こんにちは"
+
+    # 连续 3 次错误后断开，之后的请求不再到达服务端
+    _FakeServer.mode = "error"
+    for _ in range(3):
+        with pytest.raises(Exception):
+            breaker.call(request)
+    assert breaker.state == OPEN
+    hits = _FakeServer.hits
+    start = time.perf_counter()
+    for _ in range(1000):
+        with pytest.raises(CircuitOpenError):
+            breaker.call(request)
+    per_call = (time.perf_counter() - start) / 1000
+    print(f"rejected call: {per_call * 1e6:.1f} us")
+    assert per_call < 0.001
+    assert _FakeServer.hits == hits
+
+    # 服务仍不可用：后台试探失败，退避时间翻倍
+    assert _wait_for(lambda: _FakeServer.hits > hits)
+    assert _wait_for(lambda: breaker.state == OPEN)
+    assert breaker._backoff >= 0.2
+
+    # 服务恢复：后台试探成功后关闭
+    _FakeServer.mode = "ok"
+    assert _wait_for(lambda: breaker.state == CLOSED)
+    assert breaker.call(request) == "こんにちは"
+
+    # 超慢响应同样计为失败
+    _FakeServer.mode, _FakeServer.delay = "slow", 0.3
+    for _ in range(3):
+        breaker.call(request)
+    assert breaker.state != CLOSED
+    breaker.close()
+    client.close()
+
+
+def test_half_open_without_probe():
+    # 没有试探函数时，断开期满后放行一个真实请求作为试探
+    breaker = CircuitBreaker(failure_threshold=1, open_sec=0.05)
+    breaker.record_failure()
+    assert not breaker.allow()
+    time.sleep(0.06)
+    assert breaker.allow() and breaker.state == HALF_OPEN
+    assert not breaker.allow() # 同一时间只放行一个试探
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    time.sleep(0.11)
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+
+
+def test_online_engine_with_fake_server(fake_server):
+    pytest.importorskip("PyQt6")
+    from translator_engine import OnlineTranslatorEngine
+
+    client = HttpClient(pool_size=2, connect_timeout=1, read_timeout=1)
+    engine = OnlineTranslatorEngine(url=fake_server, client=client)
+    assert engine.translate("你好") == "こんにちは"
+
+    _FakeServer.mode = "error"
+    for _ in range(engine.breaker.failure_threshold):
+        assert engine.translate("你好") == "你好"
+    assert not engine.available
+    start = time.perf_counter()
+    assert engine.translate("你好") == "你好"
+    assert time.perf_counter() - start < 0.001
+    engine.unload()
+    client.close()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-q", "-s"])
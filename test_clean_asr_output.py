@@ -0,0 +1,108 @@
+"""
+clean_asr_output 黄金语料回归测试
+clean_asr_output_golden.json 由重构前的实现生成，覆盖标签、句号、插入模式、重复标点、
+空格处理与三种 Emoji 模式；新实现必须逐字节一致
+"""
+import os
+import json
+import time
+
+from text_postprocess import ASRPostProcessor, LearnedPeriodRules
+
+GOLDEN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "clean_asr_output_golden.json")
+
+
+class _StubConfig:
+    """最小配置替身，仅提供 emoji_mode、学习规则与变更订阅"""
+    def __init__(self, no_period=None, force_period=None):
+        self.emoji_mode = "off"
+        self.learned_no_period_words = dict(no_period or {})
+        self.learned_force_period_words = dict(force_period or {})
+        self._listeners = []
+        self._rule_listeners = []
+
+    def subscribe(self, key, callback, fire_now=False):
+        assert key == "emoji_mode"
+        self._listeners.append(callback)
+
+    def add_rule_listener(self, callback):
+        self._rule_listeners.append(callback)
+
+    def learn(self, kind, word):
+        for callback in self._rule_listeners:
+            callback(kind, word)
+
+    def set_emoji_mode(self, value):
+        self.emoji_mode = value
+        for callback in self._listeners:
+            callback(value)
+
+
+def test_clean_asr_output_golden():
+    with open(GOLDEN_PATH, "r", encoding="utf-8") as f:
+        cases = json.load(f)
+
+    cfg = _StubConfig()
+    processor = ASRPostProcessor(cfg)
+    failures = []
+    for text, mode, is_insertion, emoji_mode, expected in cases:
+        if processor.emoji_mode != emoji_mode:
+            cfg.set_emoji_mode(emoji_mode)
+        got = processor.process(text, mode, is_insertion)
+        if got != expected:
+            failures.append((text, mode, is_insertion, emoji_mode, expected, got))
+
+    for f in failures[:20]:
+        print(f"MISMATCH {f[:4]!r}: expected {f[4]!r}, got {f[5]!r}")
+    assert not failures, f"{len(failures)}/{len(cases)} cases differ"
+    print(f"Test PASSED ({len(cases)} cases)")
+
+
+def test_learned_period_rules():
+    cfg = _StubConfig(no_period={"所以": 1}, force_period={"好的": 1})
+    processor = ASRPostProcessor(cfg)
+
+    # 不加句号
+    assert processor.process("我们走吧所以") == "我们走吧所以"
+    assert processor.process("我们走吧所以。") == "我们走吧所以"
+    assert processor.process("今天天气不错") == "今天天气不错。"
+    # 插入模式强制句号
+    assert processor.process("那就这样好的", is_insertion=True) == "那就这样好的。"
+    assert processor.process("那就这样", is_insertion=True) == "那就这样"
+    # 问号不受影响
+    assert processor.process("所以？") == "所以？"
+
+    # 增量学习：后学到的规则覆盖先前的规则
+    cfg.learn(LearnedPeriodRules.NO_PERIOD, "好的")
+    assert processor.process("那就这样好的") == "那就这样好的"
+    cfg.learn(LearnedPeriodRules.FORCE_PERIOD, "所以")
+    assert processor.process("我们走吧所以", is_insertion=True) == "我们走吧所以。"
+    # 最长规则优先
+    cfg.learn(LearnedPeriodRules.NO_PERIOD, "吧所以")
+    assert processor.process("我们走吧所以") == "我们走吧所以"
+    print("Test PASSED (learned rules)")
+
+
+def test_learned_period_rules_scale():
+    """数万条规则时匹配耗时应与规则数量无关"""
+    words = {f"词{i:05d}尾": 1 for i in range(50000)}
+    start = time.perf_counter()
+    processor = ASRPostProcessor(_StubConfig(no_period=words))
+    build_ms = (time.perf_counter() - start) * 1000
+    assert len(processor.learned_rules) == 50000
+
+    text = "这是一段比较长的识别结果，用来测量句末规则匹配的开销词12345尾"
+    n = 20000
+    start = time.perf_counter()
+    for _ in range(n):
+        processor.learned_rules.match(text)
+    match_us = (time.perf_counter() - start) / n * 1e6
+    assert processor.process(text).endswith("尾")
+    print(f"Test PASSED (50000 rules: build {build_ms:.0f} ms, match {match_us:.2f} us)")
+    assert match_us < 50
+
+
+if __name__ == "__main__":
+    test_clean_asr_output_golden()
+    test_learned_period_rules()
+    test_learned_period_rules_scale()
@@ -0,0 +1,95 @@
+"""
+共享 HTTP 客户端测试
+在本地启动一个 HTTP/1.1 服务代替真实服务，统计服务端看到的连接数：
+连续请求应复用同一条长连接，预热后的第一次请求也不再新建连接
+"""
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from http_client import HttpClient
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1" # 支持 keep-alive
+    connections = set()
+
+    def _reply(self, body: bytes):
+        _Handler.connections.add(self.client_address)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        return body
+
+    def do_GET(self):
+        if "slow" in self.path:
+            time.sleep(0.5)
+        self.wfile.write(self._reply(b'[[["\\u3053\\u3093\\u306b\\u3061\\u306f", "\\u4f60\\u597d"]]]'))
+
+    def do_HEAD(self):
+        self._reply(b"")
+
+    def log_message(self, *args):
+        pass
+
+
+def _start_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def test_connection_reuse():
+    server, base = _start_server()
+    try:
+        _Handler.connections.clear()
+        client = HttpClient(pool_size=2, connect_timeout=2, read_timeout=2)
+        for _ in range(10):
+            resp = client.get(f"{base}/translate_a/single", params={"q": "你好"})
+            assert resp.status_code == 200
+            assert resp.json()[0][0][0] == "こんにちは"
+        assert len(_Handler.connections) == 1, _Handler.connections
+        client.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_prewarm():
+    server, base = _start_server()
+    try:
+        _Handler.connections.clear()
+        client = HttpClient(pool_size=2, connect_timeout=2, read_timeout=2)
+        client.prewarm(f"{base}/translate_a/single", background=False)
+        assert len(_Handler.connections) == 1
+        client.get(f"{base}/translate_a/single").close()
+        assert len(_Handler.connections) == 1 # 复用预热时建立的连接
+        client.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_default_timeout():
+    # 调用方不传 timeout 时使用客户端配置的读取超时
+    server, base = _start_server()
+    try:
+        client = HttpClient(pool_size=2, connect_timeout=1, read_timeout=0.1)
+        with pytest.raises(requests.exceptions.ReadTimeout):
+            client.get(f"{base}/slow")
+        assert client.get(f"{base}/slow", timeout=2).status_code == 200
+        client.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    test_connection_reuse()
+    test_prewarm()
+    test_default_timeout()
+    print("Test PASSED")
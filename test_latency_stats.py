@@ -0,0 +1,45 @@
+"""
+延迟直方图测试：分位数误差、衰减、按引擎区分
+"""
+import random
+
+from latency_stats import LatencyHistogram, LatencyTracker
+
+
+def test_latency_histogram():
+    hist = LatencyHistogram()
+    assert hist.percentile(95) is None
+
+    # 均匀分布 0.1s ~ 1.0s：p50 ≈ 0.55s，p95 ≈ 0.955s，桶上界误差不超过 20%
+    rng = random.Random(0)
+    samples = [rng.uniform(0.1, 1.0) for _ in range(400)]
+    for s in samples:
+        hist.record(s)
+    samples.sort()
+    for p in (50, 95):
+        exact = samples[int(len(samples) * p / 100) - 1]
+        estimate = hist.percentile(p)
+        assert exact <= estimate <= exact * 1.2 + 0.001, (p, exact, estimate)
+
+    # 计数达到上限后减半，新样本很快主导分位数
+    for _ in range(2000):
+        hist.record(3.0)
+    assert hist.count < LatencyHistogram.DECAY_EVERY
+    assert hist.percentile(50) >= 3.0
+
+    # 极端值落在首尾桶，不会越界
+    hist.record(0.0)
+    hist.record(1e9)
+
+    tracker = LatencyTracker()
+    tracker.record("online", 0.2)
+    tracker.record("nllb_600m_ct2", 0.05)
+    assert tracker.percentile("online", 95) >= 0.2
+    assert tracker.percentile("online", 95, min_samples=5) is None
+    assert tracker.percentile("nllb_600m_ct2", 95) < 0.1
+    assert set(tracker.summary()) == {"online", "nllb_600m_ct2"}
+    print("Test PASSED")
+
+
+if __name__ == "__main__":
+    test_latency_histogram()
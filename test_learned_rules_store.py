@@ -0,0 +1,49 @@
+"""
+学习规则日志 + 快照持久化测试
+覆盖：追加、崩溃后重放、压缩后不重复计数、遗留 .compacting 日志恢复
+"""
+import os
+import json
+import tempfile
+
+from learned_rules_store import LearnedRulesStore, NO_PERIOD, FORCE_PERIOD
+
+
+def test_learned_rules_store():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "learned_rules.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({NO_PERIOD: {"所以": 1}, FORCE_PERIOD: {}}, f, ensure_ascii=False)
+
+        store = LearnedRulesStore(path)
+        store.record(NO_PERIOD, "测试")
+        store.record(NO_PERIOD, "测试")
+        store.record(FORCE_PERIOD, "所以")
+        # 只追加日志，快照未改写
+        with open(path, "r", encoding="utf-8") as f:
+            assert json.load(f)[NO_PERIOD] == {"所以": 1}
+
+        # 模拟崩溃：不调用 close，直接重新加载
+        reloaded = LearnedRulesStore(path)
+        assert reloaded.no_period == {"测试": 2}
+        assert reloaded.force_period == {"所以": 1}
+
+        # 压缩后再次加载不重复计数
+        reloaded.close()
+        assert not os.path.exists(reloaded.journal_path)
+        again = LearnedRulesStore(path)
+        assert again.no_period == {"测试": 2}
+
+        # 快照已替换但 .compacting 未删除时，序号保证不会重复重放
+        again.record(NO_PERIOD, "测试")
+        again.close()
+        with open(path, "r", encoding="utf-8") as f:
+            seq = json.load(f)["seq"]
+        with open(again.journal_path + ".compacting", "w", encoding="utf-8") as f:
+            f.write(json.dumps({"s": seq, "k": NO_PERIOD, "w": "测试"}, ensure_ascii=False) + "\n")
+        assert LearnedRulesStore(path).no_period == {"测试": 3}
+    print("Test PASSED")
+
+
+if __name__ == "__main__":
+    test_learned_rules_store()
@@ -0,0 +1,59 @@
+"""
+配置延迟写盘测试：合并窗口内 flush_config 抢先写出后，写盘线程不能退出，之后的保存照常落盘
+"""
+import os
+import json
+import time
+
+import pytest
+
+import model_config
+
+
+@pytest.fixture
+def config(monkeypatch, tmp_path):
+    # 数据目录指向临时目录；预先放一个 config.json，跳过首次运行的开机自启动设置 (依赖 winreg)
+    for name in ("get_exe_dir", "get_data_dir", "get_internal_dir"):
+        monkeypatch.setattr(model_config, name, lambda: str(tmp_path))
+    (tmp_path / "config.json").write_text("{}", encoding="utf-8")
+    cfg = model_config.ModelConfig()
+    cfg.SAVE_DELAY_SEC = 0.2
+    return cfg
+
+
+def _on_disk(cfg):
+    with open(cfg.CONFIG_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_flush_inside_window_keeps_writer_alive(config):
+    config.window_scale = 1.1
+    time.sleep(config.SAVE_DELAY_SEC / 4)
+    config.flush_config() # 写盘线程此时正在等合并窗口结束
+    assert _on_disk(config)["window_scale"] == 1.1
+    time.sleep(config.SAVE_DELAY_SEC * 2)
+    assert config._save_thread.is_alive()
+
+    # 之后的保存不调用 flush 也会在合并窗口后落盘
+    config.window_scale = 1.3
+    deadline = time.monotonic() + 2
+    while _on_disk(config)["window_scale"] != 1.3 and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert _on_disk(config)["window_scale"] == 1.3
+
+    config.window_scale = 1.5
+    config.flush_config()
+    assert _on_disk(config)["window_scale"] == 1.5
+    assert not os.path.exists(config.CONFIG_PATH + ".tmp")
+
+
+def test_saves_coalesced(config):
+    for scale in (1.0, 1.2, 1.4):
+        config.window_scale = scale
+    time.sleep(config.SAVE_DELAY_SEC * 3)
+    assert _on_disk(config)["window_scale"] == 1.4
+    assert config._written_version == config._save_version
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-q"])
@@ -0,0 +1,93 @@
+"""
+翻译缓存测试：键规范化、内存/磁盘两级命中、按大小淘汰、重启后持久化、只落盘确认过的结果
+"""
+import os
+import time
+import tempfile
+
+from translation_cache import TranslationCache, normalize_source
+
+
+def test_translation_cache():
+    assert normalize_source("  你好   世界 \n 第二行  ") == "你好 世界\n第二行"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "translation_cache.db")
+        cache = TranslationCache(path, memory_entries=2)
+        assert cache.get("你好", "online", "jpn_Jpan") is None
+        cache.put("你好", "online", "jpn_Jpan", "こんにちは")
+
+        # 规范化后相同的原文命中同一条；引擎或目标语言不同则不命中
+        assert cache.get(" 你好 ", "online", "jpn_Jpan") == "こんにちは"
+        assert cache.get("你好", "nllb", "jpn_Jpan") is None
+        assert cache.get("你好", "online", "eng_Latn") is None
+
+        # 内存只保留 2 条，被挤出的条目从 SQLite 取回
+        cache.put("谢谢", "online", "jpn_Jpan", "ありがとう")
+        cache.put("再见", "online", "jpn_Jpan", "さようなら")
+        assert cache.get("你好", "online", "jpn_Jpan") == "こんにちは"
+        stats = cache.stats()
+        assert stats["memory_hits"] == 1 and stats["disk_hits"] == 1 and stats["misses"] == 3
+        cache.close()
+
+        # 重启后仍然命中
+        cache = TranslationCache(path)
+        assert cache.get("谢谢", "online", "jpn_Jpan") == "ありがとう"
+        cache.close()
+
+        # 磁盘按字节数淘汰最久未用的条目
+        small = TranslationCache(os.path.join(tmp, "small.db"), memory_entries=0, disk_max_bytes=200)
+        for i in range(20):
+            small.put(f"句子{i:02d}", "online", "jpn_Jpan", f"文{i:02d}" * 3)
+        assert small.stats()["disk_bytes"] <= 200
+        assert small.get("句子19", "online", "jpn_Jpan") == "文19" * 3
+        assert small.get("句子00", "online", "jpn_Jpan") is None
+        small.close()
+
+        # 内存命中应在微秒级
+        cache = TranslationCache(None)
+        cache.put("今天天气不错", "online", "jpn_Jpan", "今日はいい天気です")
+        n = 20000
+        start = time.perf_counter()
+        for _ in range(n):
+            cache.get("今天天气不错", "online", "jpn_Jpan")
+        per_call = (time.perf_counter() - start) / n * 1e6
+        print(f"memory hit: {per_call:.2f} us")
+        assert per_call < 100
+    print("Test PASSED")
+
+
+def test_persist_only_committed():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "translation_cache.db")
+        cache = TranslationCache(path)
+        # 输入中途的半句只进内存
+        cache.put("今天天", "online", "jpn_Jpan", "今日は", persist=False)
+        cache.put("今天天气", "online", "jpn_Jpan", "今日の天気", persist=False)
+        assert cache.get("今天天气", "online", "jpn_Jpan") == "今日の天気"
+        assert cache.stats()["disk_bytes"] == 0
+
+        # 用户发送后才写入磁盘；内存里没有的原文不写
+        assert cache.persist(" 今天天气 ", "online", "jpn_Jpan")
+        assert not cache.persist("没翻译过", "online", "jpn_Jpan")
+        cache.close()
+
+        cache = TranslationCache(path)
+        assert cache.get("今天天气", "online", "jpn_Jpan") == "今日の天気"
+        assert cache.get("今天天", "online", "jpn_Jpan") is None
+
+        # 磁盘命中的 last_used 先攒着，关闭时一起写回
+        before = cache._db.execute("SELECT last_used FROM translations").fetchone()[0]
+        time.sleep(0.01)
+        cache._memory.clear()
+        assert cache.get("今天天气", "online", "jpn_Jpan") == "今日の天気"
+        assert cache._db.execute("SELECT last_used FROM translations").fetchone()[0] == before
+        cache.close()
+        cache = TranslationCache(path)
+        assert cache._db.execute("SELECT last_used FROM translations").fetchone()[0] > before
+        cache.close()
+
+
+if __name__ == "__main__":
+    test_translation_cache()
+    test_persist_only_committed()
@@ -0,0 +1,460 @@
+"""
+翻译引擎调度测试 (不加载模型、不访问网络)
+用假的在线/本地引擎替换真实引擎，检查：
+- TranslationWorker 的代号 (generation) 分配、在途请求合并、过期请求丢弃
+- 句子切分，以及 CT2 批量翻译按长度排序后还原原顺序
+- 对冲：卡住的在线请求不会拖住并发请求的本地翻译；只有成功的在线请求计入延迟统计
+- 切换引擎：旧引擎只等自己的在途翻译结束就卸载，不受新引擎上的翻译影响
+- 逐句记忆：只翻译改动过的句子，并按行与句子顺序拼回；流式预览只解码记忆中没有的句子
+"""
+import time
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("PyQt6")
+from PyQt6.QtCore import QCoreApplication
+
+import model_config
+from model_config import DECODING_PROFILES, TranslationProfile
+
+
+class _StubConfig(SimpleNamespace):
+    """只提供翻译引擎用到的配置项，避免创建真实 ModelConfig (会读写 config.json)"""
+
+    def get_decoding_profile(self, final=True):
+        return DECODING_PROFILES[TranslationProfile.QUALITY.value if final else TranslationProfile.FAST.value]
+
+    def get_translator_model_path(self, engine_type=None):
+        return None
+
+
+@pytest.fixture
+def config(monkeypatch, tmp_path):
+    cfg = _StubConfig(
+        DATA_DIR=str(tmp_path),
+        translation_cache_enabled=False,
+        translation_cache_path=str(tmp_path / "translation_cache.db"),
+        translation_cache_memory_entries=64,
+        translation_cache_disk_mb=1,
+        translator_incremental=True,
+        translator_streaming=True,
+        translator_hedging=False,
+        translator_split_sentences=False,
+        translator_max_batch_size=16,
+        translator_workers=2,
+        translator_queue_size=4,
+        translator_profile="adaptive",
+        http_pool_size=2,
+        http_connect_timeout_sec=0.5,
+        http_read_timeout_sec=0.5,
+    )
+    monkeypatch.setattr(model_config, "_model_config_instance", cfg)
+    # 测试不访问网络：跳过构造时对翻译服务的连接预热
+    from translator_engine import OnlineTranslatorEngine
+    monkeypatch.setattr(OnlineTranslatorEngine, "prewarm", lambda self: None)
+    return cfg
+
+
+_qt_app = None
+
+def _app():
+    global _qt_app
+    if QCoreApplication.instance() is None:
+        _qt_app = QCoreApplication([]) # 保持引用，否则会被立即回收
+    return QCoreApplication.instance()
+
+
+def _wait_for(predicate, timeout=3.0):
+    """等待期间处理 Qt 事件，让工作线程发出的信号送达"""
+    app = _app()
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        app.processEvents()
+        if predicate():
+            return True
+        time.sleep(0.005)
+    app.processEvents()
+    return predicate()
+
+
+class FakeOnline:
+    """假在线引擎：记录收到的文本；gate 未放行时阻塞，用来制造在途请求"""
+
+    def __init__(self, delay=0.0):
+        self.calls = []
+        self.delay = delay
+        self.gate = threading.Event()
+        self.gate.set()
+        self.available = True
+
+    def translate(self, text):
+        self.calls.append(text)
+        self.gate.wait(5)
+        if self.delay:
+            time.sleep(self.delay)
+        return f"<{text}>"
+
+    def translate_segments(self, segments):
+        self.calls.append(list(segments))
+        return [f"<{s}>" for s in segments]
+
+    def unload(self):
+        pass
+
+
+def _make_engine(online=None):
+    from translator_engine import TranslatorEngine
+    engine = TranslatorEngine()
+    engine._online_engine = online or FakeOnline()
+    return engine
+
+
+def test_worker_generations(config):
+    from translator_engine import TranslationWorker
+    _app()
+    config.translator_workers = 1
+    online = FakeOnline()
+    engine = _make_engine(online)
+    worker = TranslationWorker(engine)
+    results = []
+    worker.result_ready.connect(lambda gen, text: results.append((gen, text)))
+
+    # 第一个请求卡在引擎里
+    online.gate.clear()
+    gen1, coalesced = worker.claim_generation("第一句")
+    assert gen1 == 1 and not coalesced
+    worker.on_translate_requested(gen1, "第一句")
+    assert _wait_for(lambda: online.calls == ["第一句"])
+
+    # 与在途请求相同的文本直接合并，不再排队
+    gen, coalesced = worker.claim_generation("第一句")
+    assert gen == gen1 and coalesced
+
+    # 排队期间被取代的请求不会送进引擎
+    gen2, _ = worker.claim_generation("第二句")
+    worker.on_translate_requested(gen2, "第二句")
+    gen3, _ = worker.claim_generation("第三句")
+    worker.on_translate_requested(gen3, "第三句")
+    assert worker.latest_generation == gen3 and worker.is_current(gen3) and not worker.is_current(gen1)
+
+    online.gate.set()
+    assert _wait_for(lambda: results)
+    assert _wait_for(lambda: online.calls == ["第一句", "第三句"])
+    time.sleep(0.05)
+    _app().processEvents()
+    # 过期的第一句结果不发出，只发出最新请求的结果
+    assert results == [(gen3, "<第三句>")]
+    worker.stop()
+    engine.cleanup()
+
+
+def test_worker_queue_backpressure(config):
+    from translator_engine import TranslationWorker
+    _app()
+    config.translator_workers = 1
+    config.translator_queue_size = 2
+    online = FakeOnline()
+    engine = _make_engine(online)
+    worker = TranslationWorker(engine)
+    results = []
+    worker.result_ready.connect(lambda gen, text: results.append((gen, text)))
+
+    online.gate.clear()
+    gen, _ = worker.claim_generation("卡住")
+    worker.on_translate_requested(gen, "卡住")
+    assert _wait_for(lambda: online.calls == ["卡住"])
+    for i in range(10):
+        gen, _ = worker.claim_generation(f"输入{i}")
+        worker.on_translate_requested(gen, f"输入{i}")
+    assert len(worker._queue) <= 2 # 队列有界，满时挤掉最旧的
+
+    online.gate.set()
+    assert _wait_for(lambda: results == [(gen, "<输入9>")])
+    assert online.calls == ["卡住", "输入9"]
+    worker.stop()
+    engine.cleanup()
+
+
+class FakeSentencePiece:
+    """逐字切分的假分词器"""
+
+    def encode(self, texts, out_type=str):
+        if isinstance(texts, str):
+            return list(texts)
+        return [list(t) for t in texts]
+
+    def decode(self, tokens):
+        return "".join(tokens)
+
+
+class FakeCT2Translator:
+    """假 ctranslate2.Translator：译文 = 原文 token 加方括号，记录每次批量调用的输入"""
+
+    def __init__(self):
+        self.batches = []
+        self.streamed = []
+
+    def translate_batch(self, batch, target_prefix=None, **kwargs):
+        self.batches.append((batch, kwargs))
+        results = []
+        for source in batch:
+            tokens = [t for t in source if t not in ("</s>",) and not t.startswith("__")]
+            results.append(SimpleNamespace(hypotheses=[target_prefix[0] + [f"[{t}]" for t in tokens]]))
+        return results
+
+    def generate_tokens(self, source, target_prefix=None, **kwargs):
+        self.streamed.append("".join(t for t in source if t != "</s>" and not t.startswith("__")))
+        for t in source:
+            if t != "</s>" and not t.startswith("__"):
+                yield SimpleNamespace(token=f"[{t}]")
+
+
+def _make_ct2():
+    from translator_engine import CT2TranslatorEngine
+    ct2 = CT2TranslatorEngine()
+    ct2.translator = FakeCT2Translator()
+    ct2.sp = FakeSentencePiece()
+    ct2.is_loaded = True
+    return ct2
+
+
+def test_split_sentences():
+    from translator_engine import split_sentences
+    cases = {
+        "今天天气很好。我们去公园吧！": ["今天天气很好。", "我们去公园吧！"],
+        "真的吗？？好的": ["真的吗？？", "好的"],
+        "他说「走吧。」然后走了。": ["他说「走吧。」", "然后走了。"],
+        "没有标点": ["没有标点"],
+        "": [""],
+    }
+    for text, expected in cases.items():
+        parts = split_sentences(text)
+        assert parts == expected, (text, parts)
+        assert "".join(parts) == text # 拼接后与原文一致
+
+
+def test_translate_segments_restores_order(config):
+    ct2 = _make_ct2()
+    segments = ["很长很长的一句话", "短", "中等长度"]
+    assert ct2.translate_segments(segments) == ["".join(f"[{c}]" for c in s) for s in segments]
+
+    # 只调用一次 translate_batch，批内按 token 数升序
+    (batch, kwargs), = ct2.translator.batches
+    lengths = [len(src) for src in batch]
+    assert lengths == sorted(lengths)
+    assert kwargs["max_batch_size"] == config.translator_max_batch_size
+    quality = DECODING_PROFILES[TranslationProfile.QUALITY.value]
+    assert (kwargs["beam_size"], kwargs["length_penalty"]) == (quality.beam_size, quality.length_penalty)
+    assert ct2.translate_segments([]) == []
+
+
+def test_ct2_translate_keeps_empty_lines(config):
+    ct2 = _make_ct2()
+    assert ct2.translate("你好\n\n再见") == "[你][好]\n\n[再][见]"
+    assert len(ct2.translator.batches) == 1 # 多行合并为一个批次
+
+
+def test_adaptive_profile_depends_only_on_final():
+    from model_config import ModelConfig
+    adaptive = SimpleNamespace(_translator_profile=TranslationProfile.ADAPTIVE.value)
+    assert ModelConfig.get_decoding_profile(adaptive, final=False) == DECODING_PROFILES[TranslationProfile.FAST.value]
+    assert ModelConfig.get_decoding_profile(adaptive, final=True) == DECODING_PROFILES[TranslationProfile.QUALITY.value]
+    # 各档位的长度惩罚不同：束越宽，越偏向完整的长译文
+    penalties = [DECODING_PROFILES[p.value].length_penalty for p in
+                 (TranslationProfile.FAST, TranslationProfile.BALANCED, TranslationProfile.QUALITY)]
+    assert penalties == sorted(penalties) and len(set(penalties)) == 3
+
+
+class SlowLocal:
+    """假本地引擎：每次翻译固定耗时"""
+
+    def __init__(self, delay):
+        self.delay = delay
+
+    def translate(self, text):
+        time.sleep(self.delay)
+        return f"[{text}]"
+
+    def unload(self):
+        pass
+
+
+def test_hedge_with_stalled_online_requests(config):
+    config.translator_hedging = True
+    online = FakeOnline()
+    online.gate.clear() # 在线请求全部卡住 (最长 5 秒)
+    engine = _make_engine(online)
+    engine._engine, engine.mode, engine.local_is_ready, engine._current_engine_type = SlowLocal(0.2), "local", True, "fake"
+    assert engine.hedge_budget() == engine.HEDGE_DEFAULT_SEC
+
+    results = {}
+    def request(text):
+        start = time.monotonic()
+        results[text] = (engine.translate(text), time.monotonic() - start)
+
+    threads = [threading.Thread(target=request, args=(text,)) for text in ("甲", "乙", "丙")]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(6)
+    online.gate.set()
+
+    # 每个请求都在 预算 0.8s + 本地 0.2s 左右返回本地结果，不排在被放弃的在线请求后面
+    for text in ("甲", "乙", "丙"):
+        result, elapsed = results[text]
+        assert result == f"[{text}]"
+        assert elapsed < 1.5, (text, elapsed)
+    engine.cleanup()
+
+
+def test_latency_recorded_only_on_success(config):
+    class FlakyOnline(FakeOnline):
+        mode = "ok"
+
+        def translate(self, text):
+            if self.mode == "raise":
+                raise ConnectionError("boom")
+            if self.mode == "fail": # 熔断中或请求失败：原样返回原文
+                return text
+            return super().translate(text)
+
+    online = FlakyOnline()
+    engine = _make_engine(online)
+    online_count = lambda: engine.latency.histogram("online").count
+
+    assert engine.translate("成功") == "<成功>"
+    assert online_count() == 1
+    online.mode = "fail"
+    assert engine.translate("失败") == "失败"
+    assert online_count() == 1
+    online.mode = "raise"
+    with pytest.raises(ConnectionError):
+        engine.translate("异常")
+    assert online_count() == 1
+    engine.cleanup()
+
+
+class GatedLocal:
+    """假本地引擎：gate 未放行时阻塞，记录是否已卸载"""
+
+    def __init__(self, tag):
+        self.tag = tag
+        self.gate = threading.Event()
+        self.unloaded = False
+
+    def translate(self, text):
+        self.gate.wait(5)
+        return f"{self.tag}:{text}"
+
+    def unload(self):
+        self.unloaded = True
+
+
+def test_retire_waits_only_for_old_engine_users(config):
+    engine = _make_engine(FakeOnline())
+    old, new = GatedLocal("old"), GatedLocal("new")
+    engine._swap_engine(old, "local", "old")
+    results = {}
+    run = lambda text: threading.Thread(target=lambda: results.__setitem__(text, engine.translate(text)))
+
+    t_old = run("甲")
+    t_old.start()
+    assert _wait_for(lambda: old in engine._users)
+    assert engine._swap_engine(new, "local", "new") is old
+    t_new = run("乙") # 换上新引擎后的请求一直卡在新引擎里
+    t_new.start()
+    assert _wait_for(lambda: new in engine._users)
+
+    retire = threading.Thread(target=engine._retire, args=(old,))
+    retire.start()
+    time.sleep(0.1)
+    assert not old.unloaded # 旧引擎上还有在途翻译
+
+    old.gate.set()
+    retire.join(2)
+    assert old.unloaded and not retire.is_alive()
+    assert t_new.is_alive() and not new.unloaded # 新引擎上的翻译不影响旧引擎卸载
+
+    new.gate.set()
+    t_old.join(2)
+    t_new.join(2)
+    assert results == {"甲": "old:甲", "乙": "new:乙"}
+    assert engine._users == {}
+    engine.cleanup()
+
+
+def test_incremental_translation(config):
+    online = FakeOnline()
+    engine = _make_engine(online)
+
+    text = "今天天气很好。我们去公园吧！"
+    assert engine.translate(text) == "<今天天气很好。><我们去公园吧！>"
+    assert online.calls == [["今天天气很好。", "我们去公园吧！"]]
+
+    # 只改了第二句：第一句来自记忆，只有第二句送去翻译
+    online.calls.clear()
+    assert engine.translate("今天天气很好。我们去海边吧！") == "<今天天气很好。><我们去海边吧！>"
+    assert online.calls == [["我们去海边吧！"]]
+
+    # 多行：空行原样保留，重复的句子只翻译一次，全部命中时不调用引擎
+    online.calls.clear()
+    multi = "今天天气很好。新的一句。\n\n新的一句。我们去公园吧！"
+    assert engine.translate(multi) == "<今天天气很好。><新的一句。>\n\n<新的一句。><我们去公园吧！>"
+    assert online.calls == [["新的一句。"]]
+    online.calls.clear()
+    assert engine.translate("我们去公园吧！今天天气很好。") == "<我们去公园吧！><今天天气很好。>"
+    assert online.calls == []
+    engine.cleanup()
+
+
+def test_incremental_does_not_memoize_failures(config):
+    class FailingOnline(FakeOnline):
+        def translate_segments(self, segments):
+            self.calls.append(list(segments))
+            return list(segments) # 在线失败时原样返回原文
+
+    online = FailingOnline()
+    engine = _make_engine(online)
+    text = "第一句。第二句。"
+    assert engine.translate(text) == text
+    assert engine.translate(text) == text
+    assert len(online.calls) == 2 # 失败结果没有被记住，下次重新请求
+    engine.cleanup()
+
+
+def test_streaming_preview_decodes_only_missing_sentences(config):
+    engine = _make_engine(FakeOnline())
+    ct2 = _make_ct2()
+    engine._engine, engine.mode, engine.local_is_ready, engine._current_engine_type = ct2, "local", True, "fake"
+    partials = []
+    on_partial = lambda text: partials.append(text) or True
+
+    assert engine.translate("你好。再见。", on_partial) == "[你][好][。][再][见][。]"
+    assert ct2.translator.streamed == ["你好。", "再见。"]
+    assert partials[-1] == "[你][好][。][再][见][。]"
+
+    # 只改了末句：只对末句做贪心解码，第一句的预览直接取自记忆
+    ct2.translator.streamed.clear()
+    partials.clear()
+    assert engine.translate("你好。走吧。", on_partial) == "[你][好][。][走][吧][。]"
+    assert ct2.translator.streamed == ["走吧。"]
+    assert all(p.startswith("[你][好][。]") for p in partials)
+
+    # 所有句子都在记忆中：不做预览
+    ct2.translator.streamed.clear()
+    partials.clear()
+    assert engine.translate("走吧。你好。", on_partial) == "[走][吧][。][你][好][。]"
+    assert ct2.translator.streamed == [] and partials == []
+
+    # 预览中途被取代：不做最终翻译
+    batches = len(ct2.translator.batches)
+    assert engine.translate("新的。句子。", lambda text: False) == "新的。句子。"
+    assert ct2.translator.streamed == ["新的。"]
+    assert len(ct2.translator.batches) == batches
+    engine.cleanup()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-q"])
@@ -0,0 +1,42 @@
+"""
+自定义词表纠错测试：替换策略与词典文件修改后的自动重新编译
+"""
+import os
+import json
+import time
+import tempfile
+
+from vocab_corrector import AhoCorasick, VocabCorrector
+
+
+def test_aho_corasick_replace():
+    ac = AhoCorasick({"比鞋道": "北海道", "鞋道": "X", "he": "she", "hers": "HERS"})
+    assert ac.replace("我想去比鞋道玩") == "我想去北海道玩"   # 最左优先
+    assert ac.replace("鞋道") == "X"
+    assert ac.replace("ushers") == "usHERS"                   # 同起点取最长
+    assert ac.replace("hehe") == "sheshe"
+    assert ac.replace("无关文本") == "无关文本"
+    assert AhoCorasick({}).replace("abc") == "abc"
+
+
+def test_vocab_reload_on_change():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "custom_vocab.json")
+        corrector = VocabCorrector(path) # 文件不存在时不做替换
+        corrector.CHECK_INTERVAL = 0
+        assert corrector.correct("比鞋道") == "比鞋道"
+
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"比鞋道": "北海道"}, f, ensure_ascii=False)
+
+        deadline = time.time() + 5
+        while corrector.correct("比鞋道") != "北海道" and time.time() < deadline:
+            time.sleep(0.05)
+        assert corrector.correct("去比鞋道") == "去北海道"
+        assert len(corrector) == 1
+    print("Test PASSED")
+
+
+if __name__ == "__main__":
+    test_aho_corasick_replace()
+    test_vocab_reload_on_change()
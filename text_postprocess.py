@@ -0,0 +1,353 @@
+"""
+ASR 文本后处理模块
+将 clean_asr_output 重构为预编译的规则流水线：
+- 所有正则在模块加载时编译一次，并用廉价的子串判断跳过不可能命中的步骤
+- Emoji 配置在构造时快照，订阅 emoji_mode 的变更通知刷新，不再每次调用都读取配置
+- 触发词 / 情感词用字典树匹配，不再线性扫描整张词表
+- 学习到的句号规则 (learned_rules.json) 存入反向字典树，句末匹配只与最长规则词长度有关
+输出与旧实现逐字节一致 (见 test_clean_asr_output.py 中的黄金语料)
+"""
+
+import re
+from typing import Dict, List, Optional
+
+from model_config import ASROutputMode, EmojiMode
+
+
+# ===== 预编译规则 =====
+# 内容效验：必须包含至少一个有效字符 (中文、日文、韩文、字母、数字)
+_RE_HAS_CONTENT = re.compile(r'[\u4e00-\u9fa5\u3040-\u30ff\u31f0-\u31ff\uac00-\ud7af\w]')
+# 模型内置标签 <|xxx|> 和 [xxx] (两步顺序不可合并，合并后交错标签的结果会不同)
+_RE_TAG = re.compile(r'<\|.*?\|>')
+_RE_BRACKET = re.compile(r'\[.*?\]')
+# 留逗去句：后面还有文字的句号替换为逗号
+_RE_INNER_PERIOD = re.compile(r'。(?!$)')
+# 插入模式短语保护：以语气词/标点/字母数字结尾的短语保留标点
+_RE_SENTENCE_PARTICLES = re.compile(r'.*[了吗吧呢啊呀哇嘛哒喔喽哩]$|.*[。，！？]$|.*[0-9a-zA-Z]$')
+# 连续重复标点
+_RE_DUP_PUNCT = re.compile(r'([。，！？.?!])\1+')
+# 语言敏感型空格处理
+_RE_CJK = re.compile(r'[\u4e00-\u9fa5\u3040-\u30ff\u31f0-\u31ff]')
+_RE_SPACES = re.compile(r'\s+')
+
+_END_PUNCT = ('。', '！', '？', '.', '!', '?')
+
+# 语音触发模式：句末关键词 -> Emoji (字典顺序即优先级)
+EMOJI_TRIGGERS: Dict[str, str] = {
+    "笑哭": "😂", "哈哈": "😄", "开心": "😊",
+    "点赞": "👍", "星星": "🌟", "爱心": "❤️",
+    "疑问": "❓", "生气": "😠", "流泪": "😭",
+    "鼓掌": "👏", "庆祝": "🎉", "合十": "🙏",
+    "加油": "💪", "滑稽": "🤪", "思考": "🤔"
+}
+
+# 自动模式：情感关键词映射 (字典顺序即优先级，都不命中时使用笑哭)
+SENTIMENT_MAP: Dict[str, List[str]] = {
+    "😄": ["哈哈", "嘿嘿", "开心", "高兴", "快乐", "好笑"],
+    "😊": ["你好", "谢谢", "收到", "好的", "没问题", "喜欢"],
+    "👍": ["不错", "厉害", "牛", "赞", "支持", "顺利"],
+    "😭": ["难过", "伤心", "呜呜", "惨", "痛苦"],
+    "😠": ["讨厌", "烦", "滚", "气死"],
+    "🙏": ["拜托", "麻烦", "感谢", "辛苦"],
+    "🤔": ["觉得", "想", "可能", "是否", "为什么"],
+    "😂": [] # Default fallback
+}
+DEFAULT_EMOJI = "😂"
+
+
+# ===== 字典树 =====
+class KeywordTrie:
+    """
+    正向字典树，用于子串匹配
+    每个关键词携带一个优先级 (越小越优先)，find_best 返回文本中出现的最高优先级
+    """
+    _END = ""
+
+    def __init__(self):
+        self.root = {}
+        self.max_len = 0
+
+    def add(self, word: str, rank: int):
+        if not word: return
+        node = self.root
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[self._END] = min(rank, node.get(self._END, rank))
+        self.max_len = max(self.max_len, len(word))
+
+    def find_best(self, text: str) -> Optional[int]:
+        best = None
+        root = self.root
+        for i, first in enumerate(text):
+            if first not in root:
+                continue
+            node = root
+            for ch in text[i:i + self.max_len]:
+                node = node.get(ch)
+                if node is None:
+                    break
+                rank = node.get(self._END)
+                if rank is not None and (best is None or rank < best):
+                    best = rank
+                    if best == 0:
+                        return best
+        return best
+
+
+class SuffixTrie:
+    """
+    反向字典树，用于 "文本是否以某个词结尾" 的判断
+    从文本末尾逐字回溯，复杂度 O(最长词长度)，与词表大小无关
+    """
+    _END = ""
+
+    def __init__(self):
+        self.root = {}
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def add(self, word: str, value=True):
+        if not word: return
+        node = self.root
+        for ch in reversed(word):
+            node = node.setdefault(ch, {})
+        if self._END not in node:
+            self.size += 1
+        node[self._END] = value
+
+    def match_suffixes(self, text: str) -> list:
+        """返回所有作为 text 后缀的词 (由短到长) 及其值: [(word_len, value), ...]"""
+        found = []
+        node = self.root
+        n = len(text)
+        for i in range(n - 1, -1, -1):
+            node = node.get(text[i])
+            if node is None:
+                break
+            if self._END in node:
+                found.append((n - i, node[self._END]))
+        return found
+
+    def longest_suffix(self, text: str):
+        """返回最长的匹配后缀 (word_len, value)，没有则返回 None"""
+        found = self.match_suffixes(text)
+        return found[-1] if found else None
+
+
+class LearnedPeriodRules:
+    """
+    学习到的句号规则匹配器
+    no_period: 用户删掉了这些词后面的句号 -> 不再补句号
+    force_period: 用户手动在这些词后面补了句号 -> 插入模式也保留句号
+    两类规则共用一棵反向字典树，值为规则类型；同一个词以最后学到的为准
+    """
+    NO_PERIOD = "no_period"
+    FORCE_PERIOD = "force_period"
+
+    def __init__(self):
+        self._trie = SuffixTrie()
+
+    def __len__(self):
+        return len(self._trie)
+
+    def load(self, no_period: dict, force_period: dict):
+        """全量构建 (启动时一次)。学习 no_period 不会清除 force_period 记录，两边都有时以 no_period 为准"""
+        trie = SuffixTrie()
+        for word in force_period:
+            trie.add(word, self.FORCE_PERIOD)
+        for word in no_period:
+            trie.add(word, self.NO_PERIOD)
+        self._trie = trie
+
+    def learn(self, kind: str, word: str):
+        """增量更新单条规则"""
+        if kind in (self.NO_PERIOD, self.FORCE_PERIOD):
+            self._trie.add(word, kind)
+
+    def match(self, text: str) -> Optional[str]:
+        """text 以规则词结尾时返回规则类型 (多个命中取最长的词)，否则返回 None"""
+        hit = self._trie.longest_suffix(text)
+        return hit[1] if hit else None
+
+
+# ===== 后处理器 =====
+class ASRPostProcessor:
+    """预编译的 ASR 输出清理流水线"""
+
+    def __init__(self, config=None):
+        self._config = None
+        self.emoji_mode = EmojiMode.OFF.value
+        self._emoji_error = None
+
+        # 触发词：反向字典树，值为 (优先级, 关键词长度, emoji)
+        self._trigger_trie = SuffixTrie()
+        for rank, (word, emoji) in enumerate(EMOJI_TRIGGERS.items()):
+            self._trigger_trie.add(word, (rank, len(word), emoji))
+
+        # 情感词：正向字典树，值为 emoji 的优先级
+        self._sentiment_emojis = list(SENTIMENT_MAP.keys())
+        self._sentiment_trie = KeywordTrie()
+        for rank, keywords in enumerate(SENTIMENT_MAP.values()):
+            for kw in keywords:
+                self._sentiment_trie.add(kw, rank)
+
+        self.learned_rules = LearnedPeriodRules()
+
+        if config is not None:
+            self._bind(config)
+        self.refresh()
+
+    def _bind(self, config):
+        self._config = config
+        if hasattr(config, "subscribe"):
+            config.subscribe("emoji_mode", self._on_emoji_mode)
+        self.learned_rules.load(getattr(config, "learned_no_period_words", {}),
+                                getattr(config, "learned_force_period_words", {}))
+        if hasattr(config, "add_rule_listener"):
+            config.add_rule_listener(self.learned_rules.learn)
+
+    def _on_emoji_mode(self, value):
+        self.emoji_mode = value
+        self._emoji_error = None
+
+    def refresh(self):
+        """从配置重新读取快照 (之后由 emoji_mode 的变更订阅增量更新)"""
+        try:
+            if self._config is None:
+                from model_config import get_model_config
+                self._bind(get_model_config())
+            self.emoji_mode = self._config.emoji_mode
+            self._emoji_error = None
+        except Exception as e:
+            self.emoji_mode = None
+            self._emoji_error = e
+
+    def process(self, text: str, mode: str = "raw", is_insertion: bool = False) -> str:
+        """
+        清理ASR输出文本
+        mode: "raw" 仅基础清理标签; "cleaned" 额外执行正则净化
+        is_insertion: 如果为 True，则剥离末尾句号；如果为 False，则保留。
+        """
+        if not text:
+            return ""
+
+        # 1. 预处理：去除首尾空白
+        text = text.strip()
+        if not text:
+            return ""
+
+        # 2. 内容效验：防止 Sherpa-ONNX 幻觉输出纯标点 (如 "。" 或 "..." 或 "?")
+        if not _RE_HAS_CONTENT.search(text):
+            return ""
+
+        # 3. 基础清理：移除所有模型内置标签
+        if '<|' in text:
+            text = _RE_TAG.sub('', text)
+        if '[' in text:
+            text = _RE_BRACKET.sub('', text)
+
+        # 4. 多句逻辑 "留逗去句" 与末尾句号处理
+        if text:
+            if '。' in text:
+                text = _RE_INNER_PERIOD.sub('，', text)
+            if is_insertion:
+                # 插入模式：彻底剥离末尾句号 (包括全角和半角)
+                text = text.rstrip('。！？.?!')
+            elif not text.endswith(_END_PUNCT):
+                # 非插入模式：识别结果本来没有句号时强制补全
+                text += "。"
+
+        # 5. 短文本片段深度保护 (插入模式且短语时，更倾向于去掉所有结尾标点)
+        if is_insertion:
+            core_text = text.rstrip('。！？')
+            if core_text and len(core_text) <= 5 and not _RE_SENTENCE_PARTICLES.match(core_text):
+                text = core_text
+
+        # 6. 学习到的句号规则 (仅看句号，问号/感叹号不动)
+        if text and len(self.learned_rules):
+            core_text = text.rstrip('。')
+            rule = self.learned_rules.match(core_text)
+            if rule == LearnedPeriodRules.NO_PERIOD:
+                text = core_text
+            elif rule == LearnedPeriodRules.FORCE_PERIOD and not core_text.endswith(_END_PUNCT):
+                text = core_text + "。"
+
+        # 7. 强制移除连续重复标点
+        text = _RE_DUP_PUNCT.sub(r'\1', text)
+
+        # 8. "正则表达 (Cleaned)" 模式：移除句首句尾的空白字符
+        if mode == ASROutputMode.CLEANED.value:
+            text = text.strip()
+
+        # 9. Emoji 模式
+        text = self._apply_emoji(text)
+
+        # 10. 语言敏感型空格处理：含中日文时移除所有空白，纯西文仅压缩为单空格
+        if _RE_CJK.search(text):
+            text = _RE_SPACES.sub('', text)
+        else:
+            text = _RE_SPACES.sub(' ', text)
+
+        return text.strip()
+
+    def _apply_emoji(self, text: str) -> str:
+        emoji_mode = self.emoji_mode
+        if emoji_mode is None:
+            print(f"[ASRManager] Emoji error: {self._emoji_error}")
+            return text
+
+        if emoji_mode == EmojiMode.TRIGGER.value:
+            # 语音触发模式：检测句末关键词并替换 (忽略最后的标点)
+            content = text
+            if content and content[-1] in "。，！？":
+                content = content[:-1]
+            matches = self._trigger_trie.match_suffixes(content)
+            if matches:
+                _, (_, word_len, emoji) = min(matches, key=lambda m: m[1][0])
+                prefix = content[:-word_len]
+                # 移除关键词前面的标点 (如 "有道理，" -> "有道理")
+                if prefix.endswith(("，", "。")):
+                    prefix = prefix[:-1]
+                # 触发模式下，Emoji 视作句末，不再追加原有的句尾标点
+                text = prefix + emoji
+
+        elif emoji_mode == EmojiMode.AUTO.value:
+            # 自动模式：根据语气词添加，默认笑哭
+            rank = self._sentiment_trie.find_best(text)
+            found_emoji = self._sentiment_emojis[rank] if rank is not None else DEFAULT_EMOJI
+            # 如果原文以句号或逗号结尾，先移除，再加 Emoji
+            if text.endswith(("。", "，")):
+                text = text[:-1]
+            text += found_emoji
+
+        return text
+
+
+# ===== 分块拼接 =====
+_STITCH_PUNCT = "。，、！？.,!? "
+
+def merge_overlap_text(prev: str, nxt: str, max_overlap: int = 16, min_overlap: int = 2) -> str:
+    """
+    拼接相邻分块的识别结果，去掉重叠区域重复识别出的文字
+    在 prev 末尾 (忽略标点) 与 nxt 开头之间寻找最长的相同片段
+    """
+    if not prev: return nxt
+    if not nxt: return prev
+    core = prev.rstrip(_STITCH_PUNCT)
+    head = nxt.lstrip(_STITCH_PUNCT)
+    for k in range(min(max_overlap, len(core), len(head)), min_overlap - 1, -1):
+        if core.endswith(head[:k]):
+            return core + head[k:]
+    return prev + nxt
+
+
+# ===== 全局单例 =====
+_processor_instance: Optional[ASRPostProcessor] = None
+
+def get_post_processor() -> ASRPostProcessor:
+    global _processor_instance
+    if _processor_instance is None:
+        _processor_instance = ASRPostProcessor()
+    return _processor_instance
@@ -0,0 +1,205 @@
+"""
+翻译缓存模块
+两级缓存：内存 LRU + DATA_DIR 下的 SQLite 持久化存储
+键 = 规范化后的原文 + 引擎 ID + 目标语言；内存按条数淘汰，磁盘按总字节数淘汰最久未用的条目
+输入过程中的半句只进内存 (put(persist=False))，用户真正发送/粘贴的结果才用 persist() 写入磁盘；
+磁盘命中的 last_used 更新先攒在内存里，与下一次写入一起提交
+"""
+
+import re
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+_RE_INLINE_SPACES = re.compile(r'[ \t　]+')
+
+
+def normalize_source(text: str) -> str:
+    """规范化原文：逐行去除首尾空白并压缩行内连续空白，保留换行 (逐行翻译依赖它)"""
+    if not text:
+        return ""
+    lines = [_RE_INLINE_SPACES.sub(' ', line).strip() for line in text.strip().split('\n')]
+    return '\n'.join(lines)
+
+
+class TranslationCache:
+    TOUCH_BATCH = 64 # 攒够这么多条 last_used 更新后即使没有写入也提交一次
+
+    def __init__(self, db_path: Optional[str], memory_entries: int = 512, disk_max_bytes: int = 16 * 1024 * 1024):
+        self.db_path = db_path
+        self.memory_entries = max(0, int(memory_entries))
+        self.disk_max_bytes = max(0, int(disk_max_bytes))
+
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[tuple, str]" = OrderedDict()
+        self._db = None
+        self._disk_bytes = 0
+        self._touched = {} # 磁盘命中但尚未写回 last_used 的键 -> 命中时间
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if db_path and self.disk_max_bytes:
+            self._open_db()
+
+    # ===== SQLite =====
+    def _open_db(self):
+        try:
+            self._db = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS translations (
+                    engine TEXT NOT NULL,
+                    target TEXT NOT NULL,
+                    source TEXT NOT NULL,
+                    result TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    last_used REAL NOT NULL,
+                    PRIMARY KEY (engine, target, source)
+                )
+            """)
+            self._db.execute("CREATE INDEX IF NOT EXISTS idx_translations_last_used ON translations(last_used)")
+            self._db.commit()
+            row = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM translations").fetchone()
+            self._disk_bytes = int(row[0])
+        except Exception as e:
+            print(f"[TranslationCache] SQLite unavailable, memory only: {e}")
+            self._db = None
+
+    def _evict_disk(self):
+        """超出容量时按最久未使用淘汰，一次降到容量的 90% 以免频繁触发"""
+        target = int(self.disk_max_bytes * 0.9)
+        rows = self._db.execute("SELECT engine, target, source, size FROM translations ORDER BY last_used")
+        removed = []
+        for engine, tgt, source, size in rows:
+            if self._disk_bytes <= target:
+                break
+            removed.append((engine, tgt, source))
+            self._disk_bytes -= size
+        self._db.executemany("DELETE FROM translations WHERE engine=? AND target=? AND source=?", removed)
+
+    # ===== 读写 =====
+    def _remember(self, key: tuple, result: str):
+        if not self.memory_entries:
+            return
+        self._memory[key] = result
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, text: str, engine: str, target: str) -> Optional[str]:
+        key = (engine, target, normalize_source(text))
+        with self._lock:
+            result = self._memory.get(key)
+            if result is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return result
+
+            if self._db is not None:
+                try:
+                    row = self._db.execute(
+                        "SELECT result FROM translations WHERE engine=? AND target=? AND source=?", key
+                    ).fetchone()
+                    if row:
+                        self._touched[key] = time.time()
+                        if len(self._touched) >= self.TOUCH_BATCH:
+                            self._flush_touched()
+                            self._db.commit()
+                        self._remember(key, row[0])
+                        self.disk_hits += 1
+                        return row[0]
+                except Exception as e:
+                    print(f"[TranslationCache] Read error: {e}")
+
+            self.misses += 1
+            return None
+
+    def _flush_touched(self):
+        """批量写回磁盘命中的 last_used (调用方持有锁并负责 commit)"""
+        if self._touched:
+            self._db.executemany(
+                "UPDATE translations SET last_used=? WHERE engine=? AND target=? AND source=?",
+                [(used,) + key for key, used in self._touched.items()])
+            self._touched.clear()
+
+    def _write_disk(self, key: tuple, result: str):
+        if self._db is None:
+            return
+        try:
+            size = len(key[2].encode('utf-8')) + len(result.encode('utf-8'))
+            row = self._db.execute(
+                "SELECT size FROM translations WHERE engine=? AND target=? AND source=?", key
+            ).fetchone()
+            if row:
+                self._disk_bytes -= row[0]
+            self._flush_touched()
+            self._db.execute(
+                "INSERT OR REPLACE INTO translations (engine, target, source, result, size, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?)", key + (result, size, time.time()))
+            self._disk_bytes += size
+            if self._disk_bytes > self.disk_max_bytes:
+                self._evict_disk()
+            self._db.commit()
+        except Exception as e:
+            print(f"[TranslationCache] Write error: {e}")
+
+    def put(self, text: str, engine: str, target: str, result: str, persist: bool = True):
+        """persist=False 时只进内存，之后可用 persist() 写入磁盘"""
+        source = normalize_source(text)
+        if not source or not result:
+            return
+        key = (engine, target, source)
+        with self._lock:
+            self._remember(key, result)
+            if persist:
+                self._write_disk(key, result)
+
+    def persist(self, text: str, engine: str, target: str) -> bool:
+        """把内存中已有的译文写入磁盘 (用户确认使用了这条翻译)；内存中没有时返回 False"""
+        key = (engine, target, normalize_source(text))
+        with self._lock:
+            result = self._memory.get(key)
+            if result is None:
+                return False
+            self._write_disk(key, result)
+            return True
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._touched.clear()
+            if self._db is not None:
+                try:
+                    self._db.execute("DELETE FROM translations")
+                    self._db.commit()
+                    self._disk_bytes = 0
+                except Exception as e:
+                    print(f"[TranslationCache] Clear error: {e}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "disk_bytes": self._disk_bytes,
+            }
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                try:
+                    self._flush_touched()
+                    self._db.commit()
+                    self._db.close()
+                except Exception:
+                    pass
+                self._db = None
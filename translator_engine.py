@@ -4,13 +4,16 @@
 """
 
 import os
+import re
 import gc
 import sys
-import requests
 import time
 import traceback
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Callable, List, Optional
 from PyQt6.QtCore import QObject, pyqtSignal, pyqtSlot
 
 from model_config import (
@@ -18,6 +21,10 @@ from model_config import (
     TranslatorEngineType,
     ModelInfo
 )
+from translation_cache import TranslationCache
+from latency_stats import LatencyTracker
+from circuit_breaker import CircuitBreaker, CircuitOpenError, CLOSED
+from http_client import get_http_client
 
 
 # ===== 常量 =====
@@ -25,12 +32,25 @@ SOURCE_LANG = "zho_Hans"
 TARGET_LANG = "jpn_Jpan"
 GOOGLE_URL = "https://translate.googleapis.com/translate_a/single"
 
+# 一句 = 若干非句末字符 + 连续句末标点 + 其后的右引号；末尾没有标点的剩余部分单独成句
+_RE_SENTENCE = re.compile(r'[^。！？!?；;]*[。！？!?；;]+[」』”]*|[^。！？!?；;]+$')
+
+
+def split_sentences(text: str) -> List[str]:
+    """按句末标点切分，标点保留在句尾；拼接结果与原文完全一致"""
+    return _RE_SENTENCE.findall(text) or [text]
+
+
+_log_file = None
 
 def log_translator(msg):
     """统一日志函数"""
+    global _log_file
     try:
-        cfg = get_model_config()
-        log_file = os.path.join(cfg.DATA_DIR, "translator_debug.log")
+        if _log_file is None:
+            # 数据目录在运行期间不变，只解析一次
+            _log_file = os.path.join(get_model_config().DATA_DIR, "translator_debug.log")
+        log_file = _log_file
         timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
         with open(log_file, "a", encoding="utf-8") as f:
             f.write(f"[{timestamp}] {msg}\n")
@@ -61,6 +81,11 @@ class CT2TranslatorEngine(BaseTranslatorEngine):
         self.is_loaded = False
         self.src_prefix = f"__{SOURCE_LANG}__"
         self.tgt_prefix_token = f"__{TARGET_LANG}__"
+        cfg = get_model_config()
+        self.max_batch_size = cfg.translator_max_batch_size # 单个子批次的最大片段数
+        self.split_sentences = cfg.translator_split_sentences # 长行按句切分后一起批量翻译
+
+    STREAM_INTERVAL = 0.03 # 流式预览的最小刷新间隔 (秒)，避免每个 token 都刷新界面
 
     def _find_lang_tokens(self, model_dir):
         """探测词典中真实的语言标识符格式"""
@@ -120,10 +145,16 @@ class CT2TranslatorEngine(BaseTranslatorEngine):
                             except: pass
             
             # 强制使用 CPU 模式，避免 CUDA 检测导致的挂起问题
+            # 线程数在创建 Translator 时固定，取当前档位最终解码所用的参数
+            # inter_threads 不少于翻译工作线程数，多个工作线程的请求可以并行解码
+            cfg = get_model_config()
+            threads = cfg.get_decoding_profile(final=True)
             self.translator = ctranslate2.Translator(
                 actual_model_dir, 
                 device="cpu", 
-                compute_type="int8"
+                compute_type="int8",
+                intra_threads=threads.intra_threads,
+                inter_threads=max(threads.inter_threads, cfg.translator_workers)
             )
             self._find_lang_tokens(actual_model_dir)
             
@@ -149,40 +180,102 @@ class CT2TranslatorEngine(BaseTranslatorEngine):
             traceback.print_exc()
             return False
     
+    def _strip_lang_token(self, output_tokens):
+        # 精准移除标识符
+        if output_tokens:
+            first_token = output_tokens[0].lower()
+            if "jpn" in first_token or "zho" in first_token or first_token.startswith("__"):
+                output_tokens = output_tokens[1:]
+        return output_tokens
+
+    @staticmethod
+    def _max_length(profile, source_tokens: int) -> int:
+        return min(256, int(source_tokens * profile.max_length_ratio) + profile.max_length_extra)
+
+    def translate_segments(self, segments: List[str]) -> List[str]:
+        """
+        一次 translate_batch 调用翻译多个片段
+        先按 token 长度排序，使同一子批次内长度相近、填充最少，再按原顺序还原
+        解码参数取自配置的翻译档位，按最长片段的 token 数决定
+        """
+        if not segments:
+            return []
+        token_lists = self.sp.encode(segments, out_type=str)
+        order = sorted(range(len(segments)), key=lambda i: len(token_lists[i]))
+        batch = [[self.src_prefix] + token_lists[i] + ["</s>"] for i in order]
+        longest = len(token_lists[order[-1]])
+        profile = get_model_config().get_decoding_profile(final=True)
+
+        output = self.translator.translate_batch(
+            batch,
+            target_prefix=[[self.tgt_prefix_token]] * len(batch),
+            beam_size=profile.beam_size,
+            length_penalty=profile.length_penalty,
+            max_batch_size=self.max_batch_size,
+            max_decoding_length=self._max_length(profile, longest),
+            replace_unknowns=True
+        )
+
+        results = [""] * len(segments)
+        for i, res in zip(order, output):
+            results[i] = self.sp.decode(self._strip_lang_token(res.hypotheses[0]))
+        return results
+
+    def translate_stream(self, text: str, on_partial: Callable[[str], bool]) -> Optional[str]:
+        """
+        贪心解码 (generate_tokens) 逐 token 生成预览，每隔 STREAM_INTERVAL 秒把已生成的译文交给 on_partial
+        on_partial 返回 False 表示请求已被取代，立即停止解码并返回 None；正常结束时返回完整的预览译文
+        """
+        if not self.is_loaded or self.translator is None or self.sp is None:
+            return None
+        lines = text.split('\n')
+        done = []
+        last_emit = 0.0
+        profile = get_model_config().get_decoding_profile(final=False)
+        for line in lines:
+            if not line.strip():
+                done.append("")
+                continue
+            pieces = self.sp.encode(line, out_type=str)
+            source = [self.src_prefix] + pieces + ["</s>"]
+            tokens = []
+            step_results = self.translator.generate_tokens(
+                source,
+                target_prefix=[self.tgt_prefix_token],
+                max_decoding_length=self._max_length(profile, len(pieces))
+            )
+            for step in step_results:
+                tokens.append(step.token)
+                now = time.monotonic()
+                if now - last_emit < self.STREAM_INTERVAL:
+                    continue
+                last_emit = now
+                partial = '\n'.join(done + [self.sp.decode(self._strip_lang_token(tokens))])
+                if not on_partial(partial):
+                    step_results.close() # 关闭生成器即停止解码
+                    return None
+            done.append(self.sp.decode(self._strip_lang_token(tokens)))
+        preview = '\n'.join(done)
+        return preview if on_partial(preview) else None
+
     def translate(self, text: str) -> str:
         if not self.is_loaded or self.translator is None or self.sp is None:
             return text
         
         try:
             lines = text.split('\n')
-            results = []
-            for line in lines:
+            # 收集所有非空行 (可选再切成句子)，空行位置原样保留
+            segments, owners = [], []
+            for i, line in enumerate(lines):
                 if not line.strip():
-                    results.append("")
                     continue
-                
-                tokens = self.sp.encode(line, out_type=str)
-                source_tokens = [self.src_prefix] + tokens + ["</s>"]
-                
-                output = self.translator.translate_batch(
-                    [source_tokens],
-                    target_prefix=[[self.tgt_prefix_token]],
-                    beam_size=4,
-                    max_decoding_length=256,
-                    replace_unknowns=True
-                )
-                
-                output_tokens = output[0].hypotheses[0]
-                
-                # 精准移除标识符
-                if output_tokens:
-                    first_token = output_tokens[0].lower()
-                    if "jpn" in first_token or "zho" in first_token or first_token.startswith("__"):
-                        output_tokens = output_tokens[1:]
-                
-                result_line = self.sp.decode(output_tokens)
-                results.append(result_line)
-            
+                pieces = split_sentences(line) if self.split_sentences else [line]
+                segments.extend(pieces)
+                owners.extend([i] * len(pieces))
+
+            results = [""] * len(lines)
+            for owner, translated in zip(owners, self.translate_segments(segments)):
+                results[owner] += translated
             return '\n'.join(results)
         except Exception as e:
             log_translator(f"翻译错误: {e}")
@@ -199,38 +292,109 @@ class CT2TranslatorEngine(BaseTranslatorEngine):
 
 
 class OnlineTranslatorEngine(BaseTranslatorEngine):
-    def __init__(self):
+    """
+    Google 在线翻译
+    请求经过熔断器：连续失败或超慢响应后断开，断开期间 translate 立即返回原文，不再等待网络超时；
+    后台定期发送试探请求，成功后恢复
+    """
+    PROBE_TEXT = "你好"
+
+    def __init__(self, url: str = GOOGLE_URL, client=None):
         super().__init__()
         self.is_loaded = True
+        self.url = url
+        self._client = client # 为 None 时使用全局共享客户端
+        self.breaker = CircuitBreaker(probe=self._probe, name="Online")
+
+    @property
+    def client(self):
+        return self._client or get_http_client()
+
+    @property
+    def available(self) -> bool:
+        """熔断器未断开，请求会真正发往网络"""
+        return self.breaker.state == CLOSED
         
     def load(self, model_path: str = None) -> bool: 
         return True
+
+    def prewarm(self):
+        """提前建立到翻译服务的长连接"""
+        self.client.prewarm(self.url)
+
+    def _request(self, text: str) -> str:
+        params = {"client": "gtx", "sl": "zh-CN", "tl": "ja", "dt": "t", "q": text}
+        response = self.client.get(self.url, params=params) # 超时取配置 http_connect/read_timeout_sec
+        response.raise_for_status()
+        data = response.json()
+        if data and data[0]: 
+            return "".join([part[0] for part in data[0] if part[0]])
+        return text
+
+    def _probe(self):
+        if self._request(self.PROBE_TEXT) == self.PROBE_TEXT:
+            raise ValueError("probe returned untranslated text")
         
     def translate(self, text: str) -> str:
         try:
-            params = {"client": "gtx", "sl": "zh-CN", "tl": "ja", "dt": "t", "q": text}
-            response = requests.get(GOOGLE_URL, params=params, timeout=5)
-            response.raise_for_status()
-            data = response.json()
-            if data and data[0]: 
-                return "".join([part[0] for part in data[0] if part[0]])
-            return text
+            return self.breaker.call(self._request, text)
+        except CircuitOpenError:
+            return text # 熔断中：不访问网络，也不写日志，保证微秒级返回
         except Exception as e:
             log_translator(f"Google 翻译失败: {e}")
             return text
 
+    def unload(self):
+        self.breaker.close()
+        super().unload()
+
+    def translate_segments(self, segments: List[str]) -> List[str]:
+        """多个片段按行拼接后一次请求翻译；返回行数对不上时逐段重试"""
+        if not segments:
+            return []
+        if len(segments) > 1:
+            joined = self.translate('\n'.join(segments))
+            parts = joined.split('\n')
+            if len(parts) == len(segments):
+                return parts
+        return [self.translate(seg) for seg in segments]
+
 
 class TranslatorEngine(QObject):
     status_changed = pyqtSignal(str)
+
+    # 对冲请求的等待预算 = 在线引擎 p95 延迟，限制在以下范围内；样本不足时使用默认值
+    HEDGE_MIN_SAMPLES = 10
+    HEDGE_DEFAULT_SEC = 0.8
+    HEDGE_MIN_SEC = 0.15
+    HEDGE_MAX_SEC = 2.0
+    RETIRE_TIMEOUT_SEC = 10.0
     
     def __init__(self):
         super().__init__()
         self.config = get_model_config()
+        self.latency = LatencyTracker()
+        # 只运行对冲中的在线请求；本地翻译在调用线程上执行，不占用这里的线程
+        self._hedge_pool = ThreadPoolExecutor(max_workers=max(2, self.config.translator_workers * 2), thread_name_prefix="hedge")
+        self._loader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="engine-loader")
+        self._engine_lock = threading.Lock()
+        self._users_cond = threading.Condition()
+        self._users = {} # 本地引擎 -> 正在使用它的翻译数，卸载旧引擎前等它的计数归零
         self._engine = None
         self._current_engine_type = None
         self._online_engine = OnlineTranslatorEngine()
+        self._online_engine.prewarm()
         self.mode = "online"
         self.local_is_ready = False
+        # 逐句结果的内存记忆，输入时只重新翻译改动过的句子 (不落盘，避免输入中途的半句写入磁盘缓存)
+        self.sentence_memo = TranslationCache(None, memory_entries=512) if self.config.translator_incremental else None
+        self.cache = None
+        if self.config.translation_cache_enabled:
+            self.cache = TranslationCache(
+                self.config.translation_cache_path,
+                memory_entries=self.config.translation_cache_memory_entries,
+                disk_max_bytes=int(self.config.translation_cache_disk_mb * 1024 * 1024)
+            )
     
     @property
     def current_engine_id(self) -> str:
@@ -240,9 +404,34 @@ class TranslatorEngine(QObject):
     
     def switch_engine(self, engine_type: str):
         """
-        切换翻译引擎
-        重要：此方法必须始终发出 status_changed 信号，否则 UI 会卡住
+        切换翻译引擎：把加载任务交给专用加载线程后立即返回，翻译请求不会被多秒的模型加载阻塞
+        加载期间旧引擎 (或在线翻译) 继续处理请求；新引擎加载成功后才原子地替换，
+        旧引擎等在途翻译结束后再卸载。多次切换按提交顺序依次执行
+        重要：每次切换最终都会发出 status_changed 信号，否则 UI 会卡住
         """
+        self._loader.submit(self._switch_engine, engine_type)
+
+    def _swap_engine(self, engine, mode: str, engine_type: str):
+        """就绪门控：只有加载完成的引擎才会被换上，返回被换下的旧引擎"""
+        with self._engine_lock:
+            old = self._engine
+            self._engine = engine
+            self.mode = mode
+            self._current_engine_type = engine_type
+            self.local_is_ready = engine is not None
+        return old
+
+    def _retire(self, engine):
+        """等待仍在使用旧引擎的翻译结束后再卸载 (只等旧引擎自己的使用者，不受新引擎上的翻译影响)"""
+        if engine is None:
+            return
+        with self._users_cond:
+            if not self._users_cond.wait_for(lambda: engine not in self._users, timeout=self.RETIRE_TIMEOUT_SEC):
+                log_translator("等待在途翻译超时，强制卸载旧引擎")
+        log_translator("卸载旧引擎...")
+        engine.unload()
+
+    def _switch_engine(self, engine_type: str):
         log_translator(f"switch_engine 被调用: {engine_type}")
         
         # 如果已经是目标引擎且已就绪，直接返回成功
@@ -259,78 +448,360 @@ class TranslatorEngine(QObject):
         # 发送切换中状态
         self.status_changed.emit("正在切换模型，请稍等")
         
-        # 卸载旧引擎
-        if self._engine: 
-            log_translator("卸载旧引擎...")
-            self._engine.unload()
-            self._engine = None
-        
         # 切换到在线引擎
         if engine_type == "online":
-            self.mode = "online"
-            self._current_engine_type = "online"
-            self.local_is_ready = False
+            self._retire(self._swap_engine(None, "online", "online"))
             log_translator("已切换到 Google 在线翻译")
             self.status_changed.emit("idle")
             return
         
-        # 切换到本地引擎
+        # 切换到本地引擎 (加载期间旧引擎继续服务)
         try:
             model_path = self.config.get_translator_model_path(engine_type)
             log_translator(f"本地模型路径: {model_path}")
             
             if not model_path:
                 log_translator("模型路径为空，切换失败")
-                self.mode = "online"
-                self.local_is_ready = False
                 self.status_changed.emit("本地模型未找到，已回退到在线翻译")
                 return
             
-            self._engine = CT2TranslatorEngine()
-            if self._engine.load(model_path):
-                self.local_is_ready = True
-                self.mode = "local"
-                self._current_engine_type = engine_type
+            engine = CT2TranslatorEngine()
+            if engine.load(model_path):
+                self._retire(self._swap_engine(engine, "local", engine_type))
                 log_translator("本地引擎加载成功")
                 self.status_changed.emit("翻译模型准备就绪")
             else:
                 log_translator("本地引擎加载失败")
-                self._engine = None
-                self.mode = "online"
-                self.local_is_ready = False
                 self.status_changed.emit("本地引擎启动失败，已回退到在线翻译")
                 
         except Exception as e:
             log_translator(f"switch_engine 异常: {e}")
             traceback.print_exc()
-            self.mode = "online"
-            self.local_is_ready = False
             self.status_changed.emit(f"切换失败: {str(e)}")
 
-    def translate(self, text: str) -> str:
+    def translate(self, text: str, on_partial: Optional[Callable[[str], bool]] = None) -> str:
+        """
+        可由多个工作线程并发调用
+        on_partial: 可选的流式预览回调 (仅本地引擎)。先用贪心解码逐步推送预览，
+        再走正常的束搜索得到最终译文；回调返回 False 表示请求已被取代，此时跳过最终翻译并原样返回原文
+        """
         if not text: 
             return ""
-        if self.mode == "local" and self.local_is_ready and self._engine:
-            return self._engine.translate(text)
-        return self._online_engine.translate(text)
+        with self._engine_lock:
+            # 同一请求内始终使用同一个引擎快照，切换中途替换引擎不影响本次翻译
+            # 取快照与登记使用者在同一把锁内完成，换下的引擎不会再有新的使用者
+            local = self._engine if self.mode == "local" and self.local_is_ready else None
+            local_id = self._current_engine_type
+            engine_id = self.current_engine_id
+            if local:
+                with self._users_cond:
+                    self._users[local] = self._users.get(local, 0) + 1
+        try:
+            return self._translate(text, on_partial, local, local_id, engine_id)
+        finally:
+            if local:
+                with self._users_cond:
+                    self._users[local] -= 1
+                    if not self._users[local]:
+                        del self._users[local]
+                    self._users_cond.notify_all()
+
+    def _translate(self, text: str, on_partial: Optional[Callable[[str], bool]], local, local_id, engine_id) -> str:
+        if self.cache:
+            cached = self.cache.get(text, engine_id, TARGET_LANG)
+            if cached is not None:
+                return cached
+
+        incremental = self.sentence_memo is not None and len(split_sentences(text.strip())) > 1
+        if on_partial and self.config.translator_streaming and local:
+            try:
+                if incremental:
+                    streamed = self._stream_missing(text, engine_id, local, on_partial)
+                else:
+                    streamed = local.translate_stream(text, on_partial) is not None
+                if not streamed:
+                    return text
+            except Exception as e:
+                log_translator(f"流式预览失败: {e}")
+
+        if incremental:
+            result = self._translate_incremental(text, engine_id, local, local_id)
+        else:
+            result = self._run(
+                lambda: self._online_engine.translate(text),
+                (lambda: local.translate(text)) if local else None,
+                text, local_id
+            )
+
+        # 引擎失败时原样返回原文，这种结果不缓存；输入中途的结果只进内存，确认使用后才由 commit_translation 落盘
+        if self.cache and result and result != text:
+            self.cache.put(text, engine_id, TARGET_LANG, result, persist=False)
+        return result
+
+    def commit_translation(self, text: str):
+        """用户发送或自动粘贴了 text 的译文：把它写入磁盘缓存"""
+        if self.cache and text:
+            self.cache.persist(text, self.current_engine_id, TARGET_LANG)
+
+    def _timed(self, engine_id: str, call, source):
+        """
+        调用引擎，只有真正得到译文时才记录延迟：
+        熔断中的立即返回、请求失败 (原样返回 source 或抛出异常) 都不计入，否则会扭曲对冲预算
+        """
+        start = time.perf_counter()
+        result = call()
+        if result != source:
+            self.latency.record(engine_id, time.perf_counter() - start)
+        return result
+
+    def hedge_budget(self) -> float:
+        """在线引擎的 p95 延迟 (秒)，作为启动本地翻译前的等待时间"""
+        p95 = self.latency.percentile("online", 95, min_samples=self.HEDGE_MIN_SAMPLES)
+        if p95 is None:
+            return self.HEDGE_DEFAULT_SEC
+        return min(max(p95, self.HEDGE_MIN_SEC), self.HEDGE_MAX_SEC)
+
+    def _run(self, online_call, local_call, source, local_id):
+        """
+        调用引擎并记录延迟。local_call 为 None 表示本地引擎未就绪；
+        source 是引擎失败时会原样返回的内容，用来判断在线请求是否失败
+        启用对冲且本地模型就绪时：先发在线请求，超过预算仍未返回 (或在线失败) 就启动本地翻译，取先完成的有效结果
+        """
+        if local_call is None:
+            return self._timed("online", online_call, source)
+        if self._online_engine.available and self.config.translator_hedging:
+            return self._run_hedged(online_call, local_call, source, local_id)
+        # 未启用对冲或在线熔断中：直接走本地
+        return self._timed(local_id, local_call, source)
+
+    def _run_hedged(self, online_call, local_call, source, local_id):
+        """
+        只有在线请求提交到对冲线程池，本地翻译始终在调用线程上执行：
+        卡住的在线请求即使占满线程池，也不会让后续请求的本地翻译排在它们后面
+        """
+        online = self._hedge_pool.submit(self._timed, "online", online_call, source)
+        done, _ = wait([online], timeout=self.hedge_budget())
+        if done:
+            try:
+                result = online.result()
+                if result != source:
+                    return result
+            except Exception as e:
+                log_translator(f"对冲: 在线请求失败 {e}")
+            return self._timed(local_id, local_call, source)
+
+        log_translator("对冲: 在线请求超出预算，启动本地翻译")
+        online.cancel() # 还在排队 (线程池被卡住的请求占满) 时直接放弃
+        try:
+            local_result = self._timed(local_id, local_call, source)
+        except Exception as e:
+            log_translator(f"对冲: 本地引擎异常 {e}")
+            local_result = None
+        # 本地翻译期间在线请求已经返回有效结果时优先用在线结果
+        if online.done() and not online.cancelled():
+            try:
+                result = online.result()
+                if result != source:
+                    return result
+            except Exception as e:
+                log_translator(f"对冲: 在线请求失败 {e}")
+        if local_result is not None:
+            return local_result
+        if online.cancelled():
+            return source
+        try:
+            return online.result() # 本地失败：只能继续等在线结果
+        except Exception as e:
+            log_translator(f"对冲: 在线请求失败 {e}")
+            return source
+
+    def _lookup_sentences(self, text: str, engine_id: str):
+        """
+        按行切句并查询逐句记忆
+        返回 (每行的句子列表, {句子: 译文或 None}, 记忆中没有的句子)
+        """
+        line_pieces = [split_sentences(line) if line.strip() else [] for line in text.split('\n')]
+        known = {}
+        missing = []
+        for pieces in line_pieces:
+            for piece in pieces:
+                key = piece.strip()
+                if not key or key in known:
+                    continue
+                hit = self.sentence_memo.get(key, engine_id, TARGET_LANG)
+                known[key] = hit
+                if hit is None:
+                    missing.append(key)
+        return line_pieces, known, missing
+
+    @staticmethod
+    def _join_sentences(line_pieces, known) -> str:
+        return '\n'.join("".join(known.get(piece.strip()) or piece for piece in pieces) for pieces in line_pieces)
+
+    def _stream_missing(self, text: str, engine_id: str, local, on_partial) -> bool:
+        """
+        逐句模式下的流式预览：记忆中已有的句子直接使用记忆的译文，只对缺失的句子做贪心解码，
+        编辑末句时不会把整段文本重新解码一遍；没有缺失的句子时不做预览 (最终翻译只查记忆，几乎立即完成)
+        返回 False 表示请求已被取代
+        """
+        line_pieces, known, missing = self._lookup_sentences(text, engine_id)
+        preview = {key: value for key, value in known.items() if value is not None}
+        for key in missing:
+            preview[key] = ""
+        for key in missing:
+            def emit(partial, key=key):
+                preview[key] = partial
+                return on_partial(self._join_sentences(line_pieces, preview))
+            result = local.translate_stream(key, emit)
+            if result is None:
+                return False
+            preview[key] = result # 贪心预览的结果不写入记忆，记忆只保存最终译文
+        return True
+
+    def _translate_incremental(self, text: str, engine_id: str, local, local_id) -> str:
+        """
+        逐句翻译并记忆结果：只有记忆中没有的句子 (即改动过的句子) 才送去翻译，
+        所有缺失的句子合并为一次批量调用，最后按原来的行与句子顺序拼回
+        """
+        memo = self.sentence_memo
+        line_pieces, known, missing = self._lookup_sentences(text, engine_id)
+
+        if missing:
+            try:
+                translated = self._run(
+                    lambda: self._online_engine.translate_segments(missing),
+                    (lambda: local.translate_segments(missing)) if local else None,
+                    missing, local_id
+                )
+            except Exception as e:
+                log_translator(f"逐句翻译失败: {e}")
+                translated = missing
+            for key, result in zip(missing, translated):
+                known[key] = result
+                # 引擎失败时原样返回，这种结果不记忆
+                if result and result != key:
+                    memo.put(key, engine_id, TARGET_LANG, result)
+
+        return self._join_sentences(line_pieces, known)
 
     def cleanup(self):
         if self._engine: 
             self._engine.unload()
+        if self.cache:
+            log_translator(f"翻译缓存统计: {self.cache.stats()}")
+            self.cache.close()
+        log_translator(f"翻译延迟统计: {self.latency.summary()}")
+        self._online_engine.unload()
+        self._hedge_pool.shutdown(wait=False)
+        self._loader.shutdown(wait=False)
 
 
 class TranslationWorker(QObject):
-    result_ready = pyqtSignal(str)
+    """
+    翻译工作者
+    槽函数运行在独立的 QThread 中，只负责把请求放入有界队列；
+    真正的翻译由若干工作线程并发执行，新请求不必等待被取代的旧请求翻译完成
+    每个请求带一个递增的代号 (generation)，只有最新代号的请求有意义：
+    - 排队期间被新请求取代的请求在开始前直接丢弃；队列满时挤掉最旧的请求 (它必然已被取代)
+    - 与正在翻译的文本相同的新请求不再排队，直接沿用在途请求的结果
+    - 过期的结果不再发出，流式预览也会在过期后立即停止
+    """
+    result_ready = pyqtSignal(int, str) # (generation, 译文)
+    partial_ready = pyqtSignal(int, str) # (generation, 流式预览译文)
     status_changed = pyqtSignal(str)
     
     def __init__(self, engine: TranslatorEngine):
         super().__init__()
         self.engine = engine
         self.engine.status_changed.connect(self.status_changed.emit)
+        cfg = get_model_config()
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+        self._counter = 0
+        self._latest = 0
+        self._inflight = {} # generation -> text
+        self._queue = deque()
+        self._queue_size = cfg.translator_queue_size
+        self._stopped = False
+        self._threads = [
+            threading.Thread(target=self._work_loop, name=f"translate-{i}", daemon=True)
+            for i in range(cfg.translator_workers)
+        ]
+        for t in self._threads:
+            t.start()
+
+    @property
+    def latest_generation(self) -> int:
+        return self._latest
+
+    def claim_generation(self, text: str):
+        """
+        由主线程调用，为新请求分配代号
+        返回 (generation, coalesced)；coalesced 为 True 时表示已合并到在途请求，无需再提交
+        """
+        with self._lock:
+            for generation, inflight_text in self._inflight.items():
+                if inflight_text == text:
+                    self._latest = generation
+                    return self._latest, True
+            self._counter += 1
+            self._latest = self._counter
+            return self._latest, False
+
+    def is_current(self, generation: int) -> bool:
+        return generation == self._latest
+        
+    @pyqtSlot(int, str)
+    def on_translate_requested(self, generation: int, text: str): 
+        with self._cond:
+            if generation != self._latest or self._stopped:
+                return # 提交前已被更新的请求取代
+            if len(self._queue) >= self._queue_size:
+                self._queue.popleft() # 背压：最旧的请求一定已被刚提交的这个取代
+            self._queue.append((generation, text))
+            self._cond.notify()
+
+    def _work_loop(self):
+        while True:
+            with self._cond:
+                while not self._queue and not self._stopped:
+                    self._cond.wait()
+                if self._stopped:
+                    return
+                generation, text = self._queue.popleft()
+                if generation != self._latest:
+                    continue # 排队期间已被更新的请求取代
+                self._inflight[generation] = text
+            self._process(generation, text)
+
+    def _process(self, generation: int, text: str):
+        def on_partial(partial: str) -> bool:
+            if not self.is_current(generation):
+                return False
+            self.partial_ready.emit(generation, partial)
+            return True
+
+        try:
+            result = self.engine.translate(text, on_partial)
+        except Exception as e:
+            log_translator(f"翻译线程异常: {e}")
+            result = text
+        finally:
+            with self._lock:
+                self._inflight.pop(generation, None)
+        if self.is_current(generation):
+            self.result_ready.emit(generation, result)
+
+    def stop(self):
+        """退出时调用：丢弃排队中的请求并结束工作线程"""
+        with self._cond:
+            self._stopped = True
+            self._queue.clear()
+            self._cond.notify_all()
         
     @pyqtSlot(str)
-    def on_translate_requested(self, text: str): 
-        self.result_ready.emit(self.engine.translate(text))
+    def on_commit_requested(self, text: str):
+        self.engine.commit_translation(text)
         
     @pyqtSlot(str)
     def on_engine_change_requested(self, engine_id: str): 
@@ -4,9 +4,7 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import Qt, pyqtSignal, QSize, QEvent, QPoint, QTimer, QRect, QRectF, QPropertyAnimation, QEasingCurve, pyqtProperty
 from PyQt6.QtGui import QColor, QFont, QPainter, QLinearGradient, QBrush, QFontDatabase, QFontMetrics, QPalette, QPainterPath, QIcon, QKeyEvent, QKeySequence, QScreen, QPen, QTextCursor, QAction
-import os, json, sys, time, random
-
-CONFIG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.json")
+import os, sys, time, random
 
 LOGO_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "logo.png")
 
@@ -1407,6 +1405,14 @@ class TranslatorWindow(QWidget):
         if self.waveform.isVisible():
             self.waveform.set_level(level)
 
+    def on_translation_partial(self, t):
+        """流式预览：只更新日文显示，不启动自动清空计时，等待 on_translation_ready 的最终结果替换"""
+        if self.jp_slot.isVisible():
+            self.jp_slot.setVisible(False); self.jp_display.setVisible(True)
+        self.jp_display.setPlainText(t)
+        self.jp_display._on_content_changed()
+        self._handle_resizing()
+
     def on_translation_ready(self, t): 
         # 强制关闭两个老虎机动画
         if self.jp_slot.isVisible():
@@ -1446,8 +1452,8 @@ class TranslatorWindow(QWidget):
             if self.m_cfg.is_placeholder_text(self.jp_display.toPlainText()) or self.jp_display.toPlainText() == t("asr_placeholder_idle"):
                 self.jp_display.clear()
 
-    def update_segment(self, text):
-        """Standard entry point for ASR results"""
+    def update_segment(self, text, is_partial=False):
+        """Standard entry point for ASR results (is_partial: 录音中的实时预览，不触发翻译)"""
         if text == "识别中...": return # 忽略此中间状态文本
         
         if self.zh_slot.isVisible():
@@ -1455,6 +1461,8 @@ class TranslatorWindow(QWidget):
         if self.jp_slot.isVisible():
             self.jp_slot.setVisible(False); self.jp_display.setVisible(True)
         self.set_zh_text(text)
+        if is_partial:
+            self.auto_clear_zh_timer.stop() # 说话期间不自动清空
     def focus_input(self):
         self.zh_input.setFocus(); c = self.zh_input.textCursor(); c.movePosition(c.MoveOperation.End); self.zh_input.setTextCursor(c)
     def _on_prompt_anim_finished(self, lang):
@@ -1471,14 +1479,8 @@ class TranslatorWindow(QWidget):
         self.jp_display._on_content_changed()
         self.zh_input._on_content_changed()
     def _load_config(self):
-        if os.path.exists(CONFIG_FILE):
-            try:
-                with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.window_scale = data.get("scale", 1.0)
-                    self.font_size_factor = data.get("font_scale", 1.0)
-            except Exception:
-                pass
+        # 直接取 ModelConfig 中的值，不再重复读取 config.json (旧的 "scale" 键早已不再写入)
+        self.window_scale = self.m_cfg.window_scale
 
 def create_context_menu(parent_widget=None, config=None, signals_proxy=None):
     """
@@ -2,11 +2,11 @@
 自动更新管理器
 负责检查远程版本并提示用户更新
 """
-import requests
 import json
 from packaging import version
 from PyQt6.QtWidgets import QMessageBox
 from locales import t # [New]
+from http_client import get_http_client
 
 class UpdateManager:
     CURRENT_VERSION = "1.0.0"
@@ -21,7 +21,7 @@ class UpdateManager:
         :param silent: 是否静默检查（如果无更新是否提示）
         """
         try:
-            response = requests.get(cls.VERSION_URL, timeout=5)
+            response = get_http_client().get(cls.VERSION_URL)
             if response.status_code == 200:
                 data = response.json()
                 latest_version = data.get("latest_version")
@@ -0,0 +1,172 @@
+"""
+自定义词表纠错模块
+用户词典 custom_vocab.json ({"错误写法": "正确写法", ...}) 编译为 Aho-Corasick 自动机，
+对识别结果做一次线性扫描即可完成全部替换，耗时与词条数量无关
+词典文件修改后在后台线程重新编译，编译完成前继续使用旧自动机
+"""
+
+import os
+import json
+import time
+import threading
+from collections import deque
+from typing import Dict, Optional
+
+
+class AhoCorasick:
+    """
+    多模式串替换自动机
+    匹配采用"最左优先、同起点取最长"的不重叠策略
+    """
+
+    def __init__(self, mapping: Dict[str, str]):
+        self.mapping = dict(mapping)
+        self._goto = [{}]     # 状态 -> {字符: 下一状态}
+        self._fail = [0]
+        self._len = [0]       # 状态本身是模式终点时的模式长度，否则为 0
+        self._repl = [None]   # 状态本身是模式终点时的替换文本
+        self._dict = [0]      # 失败链上最近的模式终点 (输出链)，0 表示无
+
+        for word, right in self.mapping.items():
+            if word:
+                self._insert(word, right)
+        self._build_fail()
+
+    def __len__(self):
+        return len(self.mapping)
+
+    def _insert(self, word: str, right: str):
+        state = 0
+        for ch in word:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._len.append(0)
+                self._repl.append(None)
+                self._dict.append(0)
+            state = nxt
+        self._len[state] = len(word)
+        self._repl[state] = right
+
+    def _build_fail(self):
+        goto, fail, term, dict_link = self._goto, self._fail, self._len, self._dict
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                f = goto[f].get(ch, 0)
+                fail[nxt] = f
+                dict_link[nxt] = f if term[f] else dict_link[f]
+
+    def replace(self, text: str) -> str:
+        if not text or not self.mapping:
+            return text
+        goto, fail, term, dict_link = self._goto, self._fail, self._len, self._dict
+        matches = [] # (起点, 长度, 替换文本)
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            hit = state if term[state] else dict_link[state]
+            while hit:
+                length = term[hit]
+                matches.append((i - length + 1, length, self._repl[hit]))
+                hit = dict_link[hit]
+        if not matches:
+            return text
+
+        matches.sort(key=lambda m: (m[0], -m[1]))
+        parts = []
+        pos = 0
+        for start, length, right in matches:
+            if start < pos:
+                continue
+            parts.append(text[pos:start])
+            parts.append(right)
+            pos = start + length
+        parts.append(text[pos:])
+        return "".join(parts)
+
+
+class VocabCorrector:
+    """词典文件 + 自动机，按修改时间自动重新编译"""
+    CHECK_INTERVAL = 2.0 # 检查文件修改时间的最小间隔 (秒)
+
+    def __init__(self, path: str):
+        self.path = path
+        self._automaton = AhoCorasick({})
+        self._mtime = None
+        self._next_check = 0.0
+        self._rebuilding = False
+        self._lock = threading.Lock()
+        self._reload(self._stat())
+
+    def _stat(self) -> Optional[float]:
+        try:
+            return os.path.getmtime(self.path)
+        except OSError:
+            return None
+
+    def _reload(self, mtime):
+        mapping = {}
+        if mtime is not None:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                mapping = {str(k): str(v) for k, v in data.items() if k and k != v}
+            except Exception as e:
+                print(f"[Vocab] Load error: {e}")
+                mapping = self._automaton.mapping
+        if mapping != self._automaton.mapping:
+            start = time.perf_counter()
+            self._automaton = AhoCorasick(mapping)
+            print(f"[Vocab] {len(mapping)} entries compiled in {(time.perf_counter() - start) * 1000:.1f} ms")
+        self._mtime = mtime
+
+    def _rebuild_async(self, mtime):
+        def run():
+            try:
+                self._reload(mtime)
+            finally:
+                self._rebuilding = False
+        threading.Thread(target=run, daemon=True).start()
+
+    def _maybe_reload(self):
+        now = time.monotonic()
+        if now < self._next_check:
+            return
+        with self._lock:
+            if now < self._next_check or self._rebuilding:
+                return
+            self._next_check = now + self.CHECK_INTERVAL
+            mtime = self._stat()
+            if mtime == self._mtime:
+                return
+            self._rebuilding = True
+        self._rebuild_async(mtime)
+
+    def __len__(self):
+        return len(self._automaton)
+
+    def correct(self, text: str) -> str:
+        self._maybe_reload()
+        return self._automaton.replace(text)
+
+
+# ===== 全局单例 =====
+_corrector_instance: Optional[VocabCorrector] = None
+
+def get_vocab_corrector() -> VocabCorrector:
+    global _corrector_instance
+    if _corrector_instance is None:
+        from model_config import get_model_config
+        _corrector_instance = VocabCorrector(get_model_config().custom_vocab_path)
+    return _corrector_instance